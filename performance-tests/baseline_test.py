@@ -0,0 +1,81 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark loading, and looking up issues in, a baseline of a million known
+issues against one held as readable JSON records.
+"""
+import json
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import pytest
+
+from stylist.baseline import Baseline
+from stylist.issue import Issue
+
+_COUNT = 10 ** 6
+
+
+def _records() -> List[List[str]]:
+    return [[f'source/dir_{index % 1000}/file_{index % 7919}.f90',
+             'TrailingWhitespace',
+             f'integer :: variable_{index} = {index}']
+            for index in range(_COUNT)]
+
+
+def _load_json(filename: Path) -> Set[Tuple[str, ...]]:
+    return {tuple(record) for record in json.loads(filename.read_text())}
+
+
+@pytest.fixture(scope='module')
+def known(tmp_path_factory) -> Tuple[Path, Path]:
+    directory = tmp_path_factory.mktemp('baseline')
+    records = _records()
+    readable = directory / 'baseline.json'
+    readable.write_text(json.dumps(records))
+    hashed = directory / 'baseline'
+    baseline = Baseline(directory)
+    baseline.add(Issue('Found trailing white space',
+                       line=1,
+                       filename=directory / record[0],
+                       rule=record[1],
+                       content=record[2])
+                 for record in records)
+    baseline.save(hashed)
+    return readable, hashed
+
+
+@pytest.mark.benchmark(group='baseline-load')
+def test_load_json(benchmark, known):
+    """
+    Loads a million readable records.
+    """
+    assert len(benchmark(_load_json, known[0])) == _COUNT
+
+
+@pytest.mark.benchmark(group='baseline-load')
+def test_load_hashed(benchmark, known):
+    """
+    Loads a million packed fingerprints.
+    """
+    assert len(benchmark(Baseline.load, known[1])) == _COUNT
+
+
+@pytest.mark.benchmark(group='baseline-filter')
+def test_filter(benchmark, known, tmp_path):
+    """
+    Leaves known issues out of a file's worth of issues.
+    """
+    filename = tmp_path / 'teapot.f90'
+    issues = [Issue('Found trailing white space',
+                    line=index + 1,
+                    filename=filename,
+                    rule='TrailingWhitespace',
+                    content=f'integer :: variable_{index} = {index}')
+              for index in range(1000)]
+    baseline = Baseline.load(known[1])
+    baseline.add(issues[::2])
+    assert benchmark(baseline.filter, issues) == issues[1::2]
@@ -0,0 +1,92 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark the Fortran character set rule against the character by character
+scanner it replaced.
+"""
+from typing import List, Tuple
+
+import pytest
+
+from stylist.fortran import FortranCharacterset
+from stylist.issue import Issue
+from stylist.source import FortranSource, SourceStringReader
+
+
+def _state_machine(text: str) -> List[Issue]:
+    """
+    Scans the text one character at a time, as was once done.
+    """
+    issues: List[Issue] = []
+    index = 0
+    line = 1
+    state = 'code'
+    while index < len(text):
+        character = text[index]
+        if state == 'code':
+            if character == '\n':
+                line += 1
+            elif character == '!':
+                state = 'comment'
+            elif character == "'":
+                state = 'apostraphystring'
+            elif character == '"':
+                state = 'quotestring'
+            elif character in FortranCharacterset._FORTRAN_CHARACTERSET:
+                pass
+            else:
+                description = "Found character {char} " \
+                              + "not in Fortran character set"
+                description = description.format(char=repr(character))
+                issues.append(Issue(description, line=line))
+        elif state == 'comment':
+            if character == '\n':
+                line += 1
+                state = 'code'
+        elif state == 'apostraphystring':
+            if character == "'":
+                state = 'code'
+        elif state == 'quotestring':
+            if character == '"':
+                state = 'code'
+        index += 1
+    return issues
+
+
+def _bulk_scan(text: str) -> List[Issue]:
+    source = FortranSource(SourceStringReader(text))
+    return FortranCharacterset().examine(source)
+
+
+def _text(perf_source_file) -> str:
+    # Sprinkle some characters from outside the set through the source so
+    # issues are reported as well as looked for.
+    #
+    return perf_source_file.read_text().replace(' = ', ' =\t')
+
+
+def _describe(issues: List[Issue]) -> List[Tuple[int, str]]:
+    return [(issue.line, issue.description) for issue in issues]
+
+
+@pytest.mark.benchmark(group='fortran-characterset')
+def test_state_machine(benchmark, perf_source_file):
+    """
+    Checks the character set one character at a time.
+    """
+    text = _text(perf_source_file)
+    assert _describe(benchmark(_state_machine, text)) \
+        == _describe(_bulk_scan(text))
+
+
+@pytest.mark.benchmark(group='fortran-characterset')
+def test_bulk_scan(benchmark, perf_source_file):
+    """
+    Checks the character set a span at a time.
+    """
+    text = _text(perf_source_file)
+    assert _describe(benchmark(_bulk_scan, text)) \
+        == _describe(_state_machine(text))
@@ -54,7 +54,7 @@ def pytest_generate_tests(metafunc):
             or 'fortran_style' in metafunc.fixturenames:
         rules: List[FortranRule] = []
         for _, cls in inspect.getmembers(stylist.fortran, inspect.isclass):
-            if issubclass(cls, FortranRule) and cls != FortranRule:
+            if issubclass(cls, FortranRule) and not inspect.isabstract(cls):
                 kwargs = _RULE_CONSTRUCTION.get(cls)
                 if kwargs is None:
                     kwargs = {}
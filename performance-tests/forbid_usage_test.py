@@ -0,0 +1,76 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark forbidding many modules with one rule against one rule per module.
+"""
+import re
+from typing import Dict, List, Sequence
+
+import pytest
+
+from stylist.fortran import ForbidUsage
+from stylist.source import FortranSource, SourceStringReader
+from stylist.style import Style
+
+_USE_PATTERN = re.compile(r'^\s*use\s*(?:,[^:]*::)?\s*(\w+)',
+                          re.IGNORECASE | re.MULTILINE)
+
+
+def _forbidden(text: str) -> Dict[str, Sequence[str]]:
+    """
+    Forbids thirty modules, as many as possible used by the source.
+    """
+    modules: List[str] = []
+    for match in _USE_PATTERN.finditer(text):
+        if match.group(1) not in modules:
+            modules.append(match.group(1))
+    modules.extend(f'unused_{index}_mod' for index in range(30))
+    return {module: [f'{module}_wrapper', r'.*_test_mod']
+            for module in modules[:30]}
+
+
+def _check(style: Style, source: FortranSource) -> List[str]:
+    return [str(issue) for issue in style.check(source)]
+
+
+def _source(text: str) -> FortranSource:
+    """
+    Parses the source up front so only the rules are timed.
+    """
+    source = FortranSource(SourceStringReader(text))
+    source.get_node_index()
+    return source
+
+
+def _styles(text: str) -> Dict[str, Style]:
+    forbidden = _forbidden(text)
+    return {'single': Style(*[ForbidUsage(module, exceptions)
+                              for module, exceptions in forbidden.items()]),
+            'mapped': Style(ForbidUsage(forbidden))}
+
+
+@pytest.mark.benchmark(group='fortran-forbid-usage')
+def test_rule_per_module(benchmark, perf_source_file):
+    """
+    Forbids each module with a rule of its own.
+    """
+    text = perf_source_file.read_text()
+    styles = _styles(text)
+    source = _source(text)
+    assert sorted(benchmark(_check, styles['single'], source)) \
+        == sorted(_check(styles['mapped'], source))
+
+
+@pytest.mark.benchmark(group='fortran-forbid-usage')
+def test_mapped_modules(benchmark, perf_source_file):
+    """
+    Forbids every module with a single rule.
+    """
+    text = perf_source_file.read_text()
+    styles = _styles(text)
+    source = _source(text)
+    assert sorted(benchmark(_check, styles['mapped'], source)) \
+        == sorted(_check(styles['single'], source))
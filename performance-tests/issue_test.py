@@ -0,0 +1,111 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark the memory taken by, and sorting of, a million issues against the
+issue representation they replaced.
+"""
+from pathlib import Path
+from random import Random
+import tracemalloc
+from typing import Any, Callable, List, Optional
+
+import pytest
+
+from stylist.issue import Issue
+
+_COUNT = 10 ** 6
+
+
+class _PairwiseIssue:
+    """
+    Issue as it was before its sort key was worked out in advance.
+    """
+    def __init__(self,
+                 description: str,
+                 line: Optional[int] = None,
+                 filename: Optional[Path] = None) -> None:
+        self._filename = filename
+        self._line = line
+        self._description = description
+
+    def __lt__(self, other: Any):
+        self_key = (self._filename or Path('/'),
+                    self._line or 0,
+                    self._description)
+        other_key = (other._filename or Path('/'),
+                     other._line or 0,
+                     other._description)
+        return self_key < other_key
+
+
+def _make(issue_class: Callable[..., Any]) -> List[Any]:
+    """
+    Creates issues spread over a thousand files in no particular order.
+    Descriptions are built afresh, as rules do.
+    """
+    generator = Random(42)
+    filenames = [Path(f'source/dir_{index % 10}/file_{index}.f90')
+                 for index in range(1000)]
+    issues: List[Any] = []
+    for _ in range(_COUNT):
+        name = f'thing_{generator.randrange(20)}'
+        issues.append(issue_class(f'Literal value assigned to "{name}"',
+                                  generator.randrange(1, 5000),
+                                  filenames[generator.randrange(1000)]))
+    return issues
+
+
+def _allocated(issue_class: Callable[..., Any]) -> int:
+    tracemalloc.start()
+    issues = _make(issue_class)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del issues
+    return size
+
+
+@pytest.fixture(scope='module')
+def pairwise_issues() -> List[_PairwiseIssue]:
+    return _make(_PairwiseIssue)
+
+
+@pytest.fixture(scope='module')
+def keyed_issues() -> List[Issue]:
+    return _make(Issue)
+
+
+def test_memory(benchmark) -> None:
+    """
+    Compares the memory held by a million issues of each kind.
+    """
+    keyed = benchmark.pedantic(_allocated, args=(Issue,), rounds=1)
+    pairwise = _allocated(_PairwiseIssue)
+    benchmark.extra_info['keyed_bytes'] = keyed
+    benchmark.extra_info['pairwise_bytes'] = pairwise
+    assert keyed < pairwise
+
+
+@pytest.mark.benchmark(group='issue-sort')
+def test_pairwise_sort(benchmark, pairwise_issues, keyed_issues) -> None:
+    """
+    Sorts a million issues by comparing them pairwise.
+    """
+    result = benchmark.pedantic(sorted, args=(pairwise_issues,), rounds=1)
+    expected = sorted(keyed_issues, key=Issue.sort_key)
+    assert [(issue._filename, issue._line) for issue in result[::1000]] \
+        == [(issue.filename, issue.line) for issue in expected[::1000]]
+
+
+@pytest.mark.benchmark(group='issue-sort')
+def test_keyed_sort(benchmark, keyed_issues) -> None:
+    """
+    Sorts a million issues by their precomputed keys.
+    """
+    result = benchmark.pedantic(sorted,
+                                args=(keyed_issues,),
+                                kwargs={'key': Issue.sort_key},
+                                rounds=3)
+    assert result == sorted(keyed_issues)
@@ -0,0 +1,72 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark the matching of parse tree nodes against sought classes.
+"""
+from typing import List, Type
+
+import fparser.two.Fortran2003 as Fortran2003  # type: ignore
+import pytest
+
+from stylist.source import FortranSource, SourceStringReader
+
+_SOUGHT = [Fortran2003.Program_Unit,
+           Fortran2003.Use_Stmt,
+           Fortran2003.Type_Declaration_Stmt,
+           Fortran2003.Executable_Construct]
+
+
+def _name_closure_match(candidate: Fortran2003.Base,
+                        sought_class: Type[Fortran2003.Base]) -> bool:
+    """
+    Matching as it was done before the table of matches was introduced.
+    """
+    if candidate.__class__.__name__ == sought_class.__name__:
+        return True
+
+    considering = [sought_class]
+    for consideration in considering:
+        if candidate.__class__.__name__ == consideration.__name__:
+            return True
+        considering.extend([eval('Fortran2003.' + name)
+                            for name in consideration.subclass_names])
+
+    return False
+
+
+def _nodes(perf_source_file) -> List[Fortran2003.Base]:
+    source = FortranSource(SourceStringReader(perf_source_file.read_text()))
+    return list(source.walk())
+
+
+def _count_matches(match, nodes: List[Fortran2003.Base]) -> int:
+    tally = 0
+    for sought in _SOUGHT:
+        for node in nodes:
+            if match(node, sought):
+                tally += 1
+    return tally
+
+
+@pytest.mark.benchmark(group='fortran-node-match')
+def test_name_closure_match(benchmark, perf_source_file):
+    """
+    Matches every node by resolving class names as it goes.
+    """
+    nodes = _nodes(perf_source_file)
+    expected = _count_matches(FortranSource._ast_match, nodes)
+    assert benchmark(_count_matches, _name_closure_match, nodes) == expected
+
+
+@pytest.mark.benchmark(group='fortran-node-match')
+def test_table_match(benchmark, perf_source_file):
+    """
+    Matches every node by looking it up in the table of matches.
+    """
+    nodes = _nodes(perf_source_file)
+    expected = _count_matches(_name_closure_match, nodes)
+    assert benchmark(_count_matches, FortranSource._ast_match, nodes) \
+        == expected
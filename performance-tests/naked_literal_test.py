@@ -0,0 +1,93 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark finding the context of naked literals against climbing the tree
+from each literal.
+"""
+from typing import List, Optional, Tuple
+
+import fparser.two.Fortran2003 as Fortran2003  # type: ignore
+from fparser.two.utils import get_child as fp_get_child  # type: ignore
+import pytest
+
+from stylist.fortran import NakedLiteral, _line
+from stylist.issue import Issue
+from stylist.source import FortranSource, SourceStringReader
+
+
+def _climbing(source: FortranSource) -> List[Issue]:
+    """
+    Climbs from each literal to its context, as was once done.
+    """
+    issues: List[Issue] = []
+    for node in source.walk():
+        if not isinstance(node, (Fortran2003.Int_Literal_Constant,
+                                 Fortran2003.Real_Literal_Constant)):
+            continue
+        if node.items[1] is not None:
+            continue
+        name: Optional[str] = None
+        parent = node.parent
+        while parent is not None:
+            if isinstance(parent, Fortran2003.Part_Ref):
+                name = str(fp_get_child(parent, Fortran2003.Name))
+                message = f'Literal value index used with "{name}"' \
+                          ' without kind'
+                break
+            elif isinstance(parent, (Fortran2003.Assignment_Stmt,
+                                     Fortran2003.Entity_Decl,
+                                     Fortran2003.Component_Decl)):
+                array_slice = fp_get_child(parent, Fortran2003.Part_Ref)
+                if array_slice is None:
+                    name = str(fp_get_child(parent, Fortran2003.Name))
+                else:
+                    name = str(fp_get_child(array_slice, Fortran2003.Name))
+                message = f'Literal value assigned to "{name}"' \
+                          ' without kind'
+                break
+            else:
+                parent = parent.parent
+        if name is None:
+            message = 'Literal value without "kind"'
+        issues.append(Issue(message, line=_line(node)))
+    return issues
+
+
+def _merged(source: FortranSource) -> List[Issue]:
+    return NakedLiteral().examine(source)
+
+
+def _describe(issues: List[Issue]) -> List[Tuple[int, str]]:
+    return [(issue.line, issue.description) for issue in issues]
+
+
+def _source(perf_source_file) -> FortranSource:
+    """
+    Parses and indexes the source up front so only the rule is timed.
+    """
+    source = FortranSource(SourceStringReader(perf_source_file.read_text()))
+    source.get_node_index()
+    return source
+
+
+@pytest.mark.benchmark(group='fortran-naked-literal')
+def test_climbing(benchmark, perf_source_file):
+    """
+    Finds the context of each literal by climbing its ancestors.
+    """
+    source = _source(perf_source_file)
+    assert _describe(benchmark(_climbing, source)) \
+        == _describe(_merged(source))
+
+
+@pytest.mark.benchmark(group='fortran-naked-literal')
+def test_merged(benchmark, perf_source_file):
+    """
+    Finds the context of each literal in a single merged pass.
+    """
+    source = _source(perf_source_file)
+    assert _describe(benchmark(_merged, source)) \
+        == _describe(_climbing(source))
@@ -0,0 +1,69 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark the cost of obtaining a parser and of parsing small files.
+"""
+import fparser.common.readfortran as readfortran  # type: ignore
+from fparser.two.parser import ParserFactory  # type: ignore
+import pytest
+
+from stylist.source import (FortranParserRegistry,
+                            FortranSource,
+                            SourceStringReader)
+
+_SMALL_SOURCE = """module small_mod
+  implicit none
+  private
+  integer, parameter :: answer = 42
+contains
+  function get_answer() result(value)
+    implicit none
+    integer :: value
+    value = answer
+  end function get_answer
+end module small_mod
+"""
+
+
+@pytest.mark.benchmark(group='fortran-parser-startup')
+def test_create_parser(benchmark):
+    """
+    Builds a parser from scratch as was once done for every file.
+    """
+    benchmark(ParserFactory().create, std='f2008')
+
+
+@pytest.mark.benchmark(group='fortran-parser-startup')
+def test_registry_parser(benchmark):
+    """
+    Fetches the shared parser.
+    """
+    benchmark(FortranParserRegistry.get_parser, 'f2008')
+
+
+def _parse_with_new_parser(text: str):
+    reader = readfortran.FortranStringReader(text, ignore_comments=False)
+    return ParserFactory().create(std='f2008')(reader)
+
+
+def _parse_with_shared_parser(text: str):
+    return FortranSource(SourceStringReader(text)).get_tree()
+
+
+@pytest.mark.benchmark(group='fortran-parser-per-file')
+def test_small_file_new_parser(benchmark):
+    """
+    Parses a small file building a new parser to do so.
+    """
+    assert benchmark(_parse_with_new_parser, _SMALL_SOURCE) is not None
+
+
+@pytest.mark.benchmark(group='fortran-parser-per-file')
+def test_small_file_shared_parser(benchmark):
+    """
+    Parses a small file using the shared parser.
+    """
+    assert benchmark(_parse_with_shared_parser, _SMALL_SOURCE) is not None
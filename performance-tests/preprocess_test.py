@@ -0,0 +1,39 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark all rules on preprocessed real-world code.
+"""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from stylist.source import (FortranPreProcessor,
+                            FortranSource,
+                            PFUnitProcessor,
+                            SourceFileReader)
+from stylist.style import Style
+
+
+def _check(perf_source_file: Path, fortran_style: Style) -> FortranSource:
+    reader = PFUnitProcessor(FortranPreProcessor(
+        SourceFileReader(perf_source_file)
+    ))
+    fortran_source = FortranSource(reader)
+    fortran_style.check(fortran_source)
+    return fortran_source
+
+
+@pytest.mark.benchmark(group='fortran-style-preprocessed')
+def test_preprocessed_style(perf_source_file: Path,
+                            fortran_style: Style,
+                            benchmark):
+    benchmark.extra_info['fortran-source'] = perf_source_file.name
+    benchmark.extra_info['timestamp'] = datetime.now().timestamp()
+    fortran_source = benchmark(_check, perf_source_file, fortran_style)
+    tallies = fortran_source.get_stage_tallies()
+    benchmark.extra_info['stage-tallies'] = dict(tallies)
+    assert tallies == [('Fortran preprocessor', 1), ('pFUnit preprocessor', 1)]
@@ -0,0 +1,68 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Benchmark summarising a million issues against reporting each of them.
+"""
+from io import StringIO
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from stylist.issue import Issue
+from stylist.report import TextReporter
+from stylist.summary import IssueSummary
+
+_FILES = 10 ** 4
+_ISSUES_PER_FILE = 100
+_RULES = ['TrailingWhitespace', 'LimitLineLength', 'MissingIntent']
+
+
+@pytest.fixture(scope='module')
+def batches() -> List[List[Issue]]:
+    result: List[List[Issue]] = []
+    for index in range(_FILES):
+        filename = Path(f'source/dir_{index % 100}/file_{index}.f90')
+        result.append([Issue(f'Line exceeds {line} characters',
+                             line=line,
+                             filename=filename,
+                             rule=_RULES[line % len(_RULES)])
+                       for line in range(1, _ISSUES_PER_FILE + 1)])
+    return result
+
+
+def _report(batches: List[List[Issue]]) -> int:
+    stream = StringIO()
+    reporter = TextReporter(stream)
+    reporter.start()
+    for issues in batches:
+        reporter.report(issues)
+    reporter.finish()
+    return stream.getvalue().count('\n')
+
+
+def _summarise(batches: List[List[Issue]]) -> int:
+    summary = IssueSummary()
+    for issues in batches:
+        summary.add(issues[0].filename or Path(), IssueSummary.count(issues))
+    summary.write(StringIO())
+    return summary.total
+
+
+@pytest.mark.benchmark(group='summary')
+def test_report(benchmark, batches):
+    """
+    Writes out every issue.
+    """
+    assert benchmark(_report, batches) == _FILES * _ISSUES_PER_FILE
+
+
+@pytest.mark.benchmark(group='summary')
+def test_summarise(benchmark, batches):
+    """
+    Counts the issues by rule, file and directory.
+    """
+    assert benchmark(_summarise, batches) == _FILES * _ISSUES_PER_FILE
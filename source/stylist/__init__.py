@@ -7,9 +7,15 @@
 """
 Extensible code style checker currently supporting Fortran, PSyclone DSL, etc
 """
+import logging
 
 __version__ = '0.5.dev1'
 
+# Diagnostics are logged beneath "stylist" and are discarded unless the
+# application using the package configures logging to show them.
+#
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 
 class StylistException(Exception):
     """
@@ -8,21 +8,26 @@
 Tool for checking code style.
 """
 import argparse
+from contextlib import ExitStack
 import logging
-from os import linesep
+from os import cpu_count, linesep
 from pathlib import Path
 import sys
 from textwrap import indent
-from typing import List, Sequence, Union
+from typing import Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
 from stylist import StylistException
+from stylist.baseline import Baseline
 from stylist.configuration import (Configuration,
                                    ConfigTools,
                                    load_configuration)
-from stylist.engine import CheckEngine
+from stylist.discovery import SourceDiscovery
+from stylist.engine import CheckEngine, ParallelCheckEngine
 from stylist.issue import Issue
+from stylist.report import ReporterFactory
 from stylist.source import SourceFactory
 from stylist.style import Style
+from stylist.summary import IssueSummary
 
 
 # Paths to site-wide and per-user style files
@@ -30,6 +35,25 @@ site_file = Path("/etc/stylist.py")
 user_file = Path.home() / ".stylist.py"
 
 
+def __jobs(text: str) -> int:
+    """
+    Interprets the number of jobs requested on the command line.
+
+    :param text: Either a positive integer or "auto" to use one job per
+                 processor.
+    """
+    if text == 'auto':
+        return cpu_count() or 1
+    try:
+        jobs = int(text)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        message = f"Expected a positive integer or 'auto', not '{text}'"
+        raise argparse.ArgumentTypeError(message)
+    return jobs
+
+
 def __parse_cli() -> argparse.Namespace:
     """
     Parse the command line for stylist arguments.
@@ -79,6 +103,64 @@ IDs used in specifying extension pipelines:
                             default=[],
                             action='append',
                             help=message)
+    message = "Number of processes used to check source files, or 'auto' " \
+              "to use one per processor."
+    cli_parser.add_argument('-jobs',
+                            type=__jobs,
+                            default=1,
+                            metavar='N',
+                            help=message)
+    message = "Directory in which to keep results between runs. Files " \
+              "which have not changed since they were last checked are " \
+              "not examined again."
+    cli_parser.add_argument('-cache-dir',
+                            dest='cache_dir',
+                            type=Path,
+                            metavar='DIRECTORY',
+                            help=message)
+    message = "When searching directories only check files whose own " \
+              "name, or whose path relative to the directory searched, " \
+              "matches this wildcard. May be specified repeatedly."
+    cli_parser.add_argument('-include',
+                            default=[],
+                            action='append',
+                            metavar='PATTERN',
+                            help=message)
+    message = "Ignore files and directories which match this wildcard. " \
+              "May be specified repeatedly."
+    cli_parser.add_argument('-exclude',
+                            default=[],
+                            action='append',
+                            metavar='PATTERN',
+                            help=message)
+    message = "File of known issues which are not reported."
+    cli_parser.add_argument('-baseline',
+                            type=Path,
+                            metavar='FILENAME',
+                            help=message)
+    message = "Record every issue found in the baseline file rather than " \
+              "reporting them."
+    cli_parser.add_argument('-write-baseline',
+                            dest='write_baseline',
+                            action='store_true',
+                            help=message)
+    message = "Format in which issues are reported."
+    cli_parser.add_argument('-format',
+                            dest='report_format',
+                            choices=ReporterFactory.get_formats(),
+                            default='text',
+                            help=message)
+    message = "File to which issues are written. By default text goes to " \
+              "standard error and other formats to standard output."
+    cli_parser.add_argument('-output',
+                            type=Path,
+                            metavar='FILENAME',
+                            help=message)
+    message = "Report only the number of issues found by each rule, in " \
+              "each directory and in each file, rather than every issue."
+    cli_parser.add_argument('-summary',
+                            action='store_true',
+                            help=message)
     cli_parser.add_argument('source', metavar='FILE', nargs='+',
                             type=Path,
                             help='Filename of source file or directory')
@@ -88,28 +170,92 @@ IDs used in specifying extension pipelines:
     return arguments
 
 
-def __process(candidates: List[Path], styles: Sequence[Style]) -> List[Issue]:
+def __engine(styles: Sequence[Style],
+             jobs: int = 1,
+             cache_dir: Optional[Path] = None,
+             baseline: Optional[Baseline] = None,
+             capture_content: bool = False) -> CheckEngine:
+    """
+    Creates the engine which examines files.
+
+    :param styles: Styles to check against.
+    :param jobs: Number of processes to spread the work across.
+    :param cache_dir: Directory holding results between runs.
+    :param baseline: Known issues to leave out.
+    :param capture_content: Give each issue the content of its line.
+    """
+    if jobs > 1:
+        return ParallelCheckEngine(styles, jobs, cache_dir, baseline,
+                                   capture_content)
+    else:
+        return CheckEngine(styles, cache_dir, baseline, capture_content)
+
+
+def __process(candidates: List[Path],
+              styles: Sequence[Style],
+              jobs: int = 1,
+              cache_dir: Optional[Path] = None,
+              include: Sequence[str] = (),
+              exclude: Sequence[str] = (),
+              baseline: Optional[Baseline] = None,
+              capture_content: bool = False) \
+        -> Iterator[Sequence[Issue]]:
     """
     Examines files for style compliance.
 
-    Any directories specified will be descended looking for files to examine.
+    Issues are handed back a file at a time, as each file is finished.
+
+    :param candidates: Files and directories to examine.
+    :param styles: Styles to check against.
+    :param jobs: Number of processes to spread the work across.
+    :param cache_dir: Directory holding results between runs.
+    :param include: Wildcards which files found in directories must match,
+                    either the file's own name or its path relative to the
+                    directory searched.
+    :param exclude: Wildcards for files and directories to ignore.
+    :param baseline: Known issues to leave out.
+    :param capture_content: Give each issue the content of its line.
+    """
+    engine = __engine(styles, jobs, cache_dir, baseline, capture_content)
+    discovery = SourceDiscovery(SourceFactory.get_extensions(),
+                                include, exclude, jobs)
+    return engine.check_each(discovery.discover(candidates))
+
+
+def __summarise(candidates: List[Path],
+                styles: Sequence[Style],
+                jobs: int = 1,
+                cache_dir: Optional[Path] = None,
+                include: Sequence[str] = (),
+                exclude: Sequence[str] = (),
+                baseline: Optional[Baseline] = None) -> IssueSummary:
+    """
+    Examines files for style compliance, counting the issues found rather
+    than handing them back.
+
+    Arguments are as for ``__process``.
     """
-    engine = CheckEngine(styles)
+    engine = __engine(styles, jobs, cache_dir, baseline)
+    discovery = SourceDiscovery(SourceFactory.get_extensions(),
+                                include, exclude, jobs)
+    return engine.summarise(discovery.discover(candidates))
+
 
-    hot_extensions = SourceFactory.get_extensions()
+def __streams(report_format: str,
+              output: Optional[Path]) -> Tuple[TextIO, TextIO]:
+    """
+    Chooses where issues and commentary are written.
 
-    issues: List[Issue] = []
-    while candidates:
-        file_object = candidates.pop(0)
-        if file_object.is_dir():
-            for leaf_filename in file_object.iterdir():
-                if leaf_filename.suffix[1:] in hot_extensions \
-                   or leaf_filename.is_dir():
-                    candidates.append(leaf_filename)
-        else:  # Is a file
-            issues.extend(engine.check(file_object))
+    Reports in a machine readable format are kept apart from warnings and
+    tracebacks on standard error, so commentary is moved there instead.
 
-    return issues
+    :param report_format: Format in which issues are reported.
+    :param output: File to which issues are written, if any.
+    :return: Stream for issues, if not written to file, and for commentary.
+    """
+    if report_format == 'text' or output is not None:
+        return sys.stderr, sys.stdout
+    return sys.stdout, sys.stderr
 
 
 def __configure(project_file: Path) -> Union[Configuration, None]:
@@ -143,10 +289,40 @@ def perform(configuration: Configuration,
             source: List[Path],
             style: List[str],
             map_extension: List[str],
-            verbose: bool):
+            verbose: bool,
+            jobs: int = 1,
+            cache_dir: Optional[Path] = None,
+            include: Sequence[str] = (),
+            exclude: Sequence[str] = (),
+            report_format: str = 'text',
+            baseline: Optional[Path] = None,
+            write_baseline: bool = False,
+            summary: bool = False,
+            output: Optional[Path] = None) -> int:
     """
     Do the style checking.
+
+    Issues are written out as each file is finished rather than all at the
+    end, so a large run shows progress and does not hold every issue.
+
+    Issues held in the baseline file, if one is given, are not reported.
+    When writing a baseline every issue found is recorded in it instead.
+
+    A summary reports only how many issues were found by each rule, in each
+    directory and in each file.
+
+    Issues are written to the output file if one is given. Otherwise text
+    goes to standard error and other formats to standard output.
+
+    :return: Number of issues found.
     """
+    if write_baseline and baseline is None:
+        message = "A baseline file is needed to write a baseline."
+        raise StylistException(message)
+    if summary and report_format != 'text':
+        message = "A summary is only available as text."
+        raise StylistException(message)
+
     if len(configuration.styles) == 0:
         message = "No styles are defined by the configuration."
         raise StylistException(message)
@@ -171,6 +347,8 @@ def perform(configuration: Configuration,
             message = "No style specified and more than one defined."
             raise StylistException(message)
 
+    report_stream, chatter = __streams(report_format, output)
+
     # Pipelines loaded from configuration file
     #
     for extension, pipe in configuration.file_pipes.items():
@@ -182,30 +360,61 @@ def perform(configuration: Configuration,
         extension, pipe = ConfigTools.parse_pipe_description(mapping)
         SourceFactory.add_extension(extension, pipe)
 
-    issues = __process(source, styles)
-
-    for issue in issues:
-        print(str(issue), file=sys.stderr)
-    if (len(issues) > 0) or verbose:
-        tally = len(issues)
+    if write_baseline and baseline is not None:
+        # Issues are fingerprinted from the content of their line.
+        #
+        known = Baseline(baseline.parent)
+        for issues in __process(source, styles, jobs, cache_dir,
+                                include, exclude, capture_content=True):
+            known.add(issues)
+        known.save(baseline)
+        plural = 's' if len(known) != 1 else ''
+        print(f"Wrote {len(known)} issue{plural} to baseline {baseline}",
+              file=chatter)
+        return 0
+
+    known_issues: Optional[Baseline] = None
+    if baseline is not None:
+        known_issues = Baseline.load(baseline)
+
+    with ExitStack() as stack:
+        if output is not None:
+            report_stream = stack.enter_context(output.open('wt',
+                                                            encoding='utf-8'))
+        reporter = ReporterFactory.create(report_format, report_stream)
+        if summary:
+            totals = __summarise(source, styles, jobs, cache_dir,
+                                 include, exclude, known_issues)
+            totals.write(report_stream)
+            tally = totals.total
+        else:
+            reporter.start()
+            tally = 0
+            for issues in __process(source, styles, jobs, cache_dir,
+                                    include, exclude, known_issues):
+                reporter.report(issues)
+                tally += len(issues)
+            reporter.finish()
+    if (tally > 0) or verbose:
         if tally > 1:
             plural = 's'
         else:
             plural = ''
-        print(f"Found {tally} issue{plural}")
+        print(f"Found {tally} issue{plural}", file=chatter)
 
-    return issues
+    return tally
 
 
 def main() -> None:
     """
     Command-line tool entry point.
     """
-    logger = logging.getLogger('stylist')
-    logger.addHandler(logging.StreamHandler(sys.stdout))
-
     arguments = __parse_cli()
 
+    logger = logging.getLogger('stylist')
+    _, chatter = __streams(arguments.report_format, arguments.output)
+    logger.addHandler(logging.StreamHandler(chatter))
+
     if arguments.verbose:
         logger.setLevel(logging.INFO)
     else:
@@ -217,13 +426,22 @@ def main() -> None:
         # FIXME: proper exit handling
         raise Exception("no valid style files found")
 
-    issues = perform(configuration,
-                     arguments.source,
-                     arguments.style,
-                     arguments.map_extension,
-                     arguments.verbose)
-
-    if issues:
+    tally = perform(configuration,
+                    arguments.source,
+                    arguments.style,
+                    arguments.map_extension,
+                    arguments.verbose,
+                    arguments.jobs,
+                    arguments.cache_dir,
+                    arguments.include,
+                    arguments.exclude,
+                    arguments.report_format,
+                    arguments.baseline,
+                    arguments.write_baseline,
+                    arguments.summary,
+                    arguments.output)
+
+    if tally:
         sys.exit(1)
     else:
         sys.exit(0)
@@ -0,0 +1,144 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Issues already accepted, which are not reported again.
+"""
+from array import array
+from collections import Counter
+from hashlib import blake2b
+import os
+from pathlib import Path
+import sys
+from typing import Counter as CounterType, Dict, Iterable, List, Optional, \
+    Sequence
+
+from stylist import StylistException
+from stylist.issue import Issue
+
+
+class Baseline:
+    """
+    Holds a fingerprint for each of a set of known issues.
+
+    A fingerprint is a 64-bit hash of the file, the rule, the description and
+    the content of the line the issue was found on with its white space
+    normalised. The line number plays no part so issues stay known when the
+    lines around them change. Files are identified by their path relative to
+    the baseline's root directory, however they were named when checked.
+
+    Identical issues may be known more than once. Only as many of them as are
+    known are left out, so a new issue which happens to look like a known one
+    is still reported.
+
+    Baselines are stored as a short header followed by the fingerprints as
+    packed 64-bit integers, repeated for as many times as each is known.
+    """
+    _HEADER = b'stylist baseline 2\n'
+
+    def __init__(self, root: Path, fingerprints: Iterable[int] = ()) -> None:
+        """
+        :param root: Directory against which file paths are taken.
+        :param fingerprints: Fingerprints of the known issues.
+        """
+        self._root = os.path.abspath(root)
+        self._counts: CounterType[int] = Counter(fingerprints)
+        self._paths: Dict[Optional[Path], str] = {}
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self._counts
+
+    def _path(self, filename: Optional[Path]) -> str:
+        """
+        Gets the path of a file relative to the root, written the same way
+        however the file was named.
+        """
+        if filename not in self._paths:
+            if filename is None:
+                path = ''
+            else:
+                try:
+                    path = os.path.relpath(os.path.abspath(filename),
+                                           self._root)
+                except ValueError:  # On another drive
+                    path = os.path.abspath(filename)
+                path = Path(path).as_posix()
+            self._paths[filename] = path
+        return self._paths[filename]
+
+    def fingerprint(self, issue: Issue) -> int:
+        """
+        Works out the fingerprint of an issue.
+
+        :param issue: Issue of interest, with the content of its line.
+        """
+        content = ' '.join((issue.content or '').split())
+        text = '\0'.join((self._path(issue.filename),
+                          issue.rule or '',
+                          issue.description,
+                          content))
+        digest = blake2b(text.encode('utf-8', errors='replace'),
+                         digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def add(self, issues: Iterable[Issue]) -> None:
+        """
+        Makes issues known.
+        """
+        self._counts.update(self.fingerprint(issue) for issue in issues)
+
+    def filter(self, issues: Sequence[Issue]) -> List[Issue]:
+        """
+        Gets those issues of a single file which are not already known.
+
+        All the issues of the file must be given at once so identical issues
+        may be told apart by how many of them there are.
+        """
+        if not issues or not self._counts:
+            return list(issues)
+        seen: CounterType[int] = Counter()
+        result: List[Issue] = []
+        for issue in issues:
+            fingerprint = self.fingerprint(issue)
+            seen[fingerprint] += 1
+            if seen[fingerprint] > self._counts[fingerprint]:
+                result.append(issue)
+        return result
+
+    @classmethod
+    def load(cls, filename: Path) -> 'Baseline':
+        """
+        Reads a baseline from file.
+
+        Paths are taken relative to the directory holding the file.
+        """
+        try:
+            content = filename.read_bytes()
+        except OSError as ex:
+            message = f"Unable to read baseline {filename}: {ex}"
+            raise StylistException(message)
+        if not content.startswith(cls._HEADER) \
+                or (len(content) - len(cls._HEADER)) % 8 != 0:
+            message = f"File {filename} is not a stylist baseline"
+            raise StylistException(message)
+        packed = array('Q')
+        packed.frombytes(content[len(cls._HEADER):])
+        if sys.byteorder != 'little':
+            packed.byteswap()
+        return cls(filename.parent, packed)
+
+    def save(self, filename: Path) -> None:
+        """
+        Writes the baseline to file.
+        """
+        packed = array('Q', sorted(self._counts.elements()))
+        if sys.byteorder != 'little':
+            packed.byteswap()
+        with filename.open('wb') as handle:
+            handle.write(self._HEADER)
+            handle.write(packed.tobytes())
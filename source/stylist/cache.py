@@ -0,0 +1,165 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Persistent store of issues found in previously checked source files.
+"""
+from hashlib import sha256
+import json
+import logging
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, List, Optional, Pattern, Sequence
+
+import fparser  # type: ignore
+
+import stylist
+from stylist.issue import Issue
+from stylist.source import FilePipe
+from stylist.style import Style
+
+
+def _describe(thing: Any) -> str:
+    """
+    Produces a stable textual description of an object and its state.
+
+    This is used to distinguish between rules of the same class constructed
+    with different arguments. Unlike ``repr()`` it does not depend on where
+    in memory an object happens to live.
+
+    :param thing: Object to describe.
+    """
+    if thing is None or isinstance(thing, (bool, int, float, str, bytes)):
+        return repr(thing)
+    if isinstance(thing, type):
+        return f"{thing.__module__}.{thing.__qualname__}"
+    if isinstance(thing, Pattern):
+        return f"re.compile({thing.pattern!r}, {int(thing.flags)})"
+    if isinstance(thing, (list, tuple)):
+        return '[' + ', '.join(_describe(item) for item in thing) + ']'
+    if isinstance(thing, (set, frozenset)):
+        return '{' + ', '.join(sorted(_describe(item) for item in thing)) + '}'
+    if isinstance(thing, dict):
+        return '{' + ', '.join(sorted(f"{_describe(key)}: {_describe(value)}"
+                                      for key, value in thing.items())) + '}'
+    state = getattr(thing, '__dict__', None)
+    if state is None:
+        return _describe(type(thing))
+    return _describe(type(thing)) + _describe(state)
+
+
+def _fingerprint_styles(styles: Sequence[Style]) -> str:
+    """
+    Describes the rules, with their arguments, which make up some styles.
+
+    :param styles: Styles to describe.
+    """
+    return '\n'.join(_describe(style.list_rules()) for style in styles)
+
+
+def _fingerprint_pipe(pipe: FilePipe) -> str:
+    """
+    Describes the chain of classes used to process a source file.
+
+    :param pipe: Processing chain to describe.
+    """
+    return _describe([pipe.parser, *pipe.preprocessors])
+
+
+class ResultCache:
+    """
+    Stores the issues found in a source file so that they need not be found
+    again.
+
+    Entries are keyed on the content of the file, the way it is processed,
+    the rules it is checked against and the version of the tool. Any change
+    to these leads to a different key so entries never need to be
+    invalidated. Stale entries may simply be deleted.
+    """
+    def __init__(self, directory: Path, styles: Sequence[Style]) -> None:
+        """
+        :param directory: Where the cache lives. Created if necessary.
+        :param styles: Styles which files are checked against.
+        """
+        self._directory = directory
+        self._styles_fingerprint = _fingerprint_styles(styles)
+
+    @property
+    def directory(self) -> Path:
+        """
+        Location of the cache.
+        """
+        return self._directory
+
+    def key(self, content: bytes, pipe: FilePipe) -> str:
+        """
+        Generates the key under which results for a source file are held.
+
+        :param content: Raw content of the source file.
+        :param pipe: Chain of classes used to process the source file.
+        """
+        # The parser's version is included as an upgrade may change which
+        # sources parse and so which issues are found.
+        #
+        digest = sha256(content)
+        for part in (_fingerprint_pipe(pipe),
+                     self._styles_fingerprint,
+                     stylist.__version__,
+                     fparser.__version__):
+            digest.update(b'\0')
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self._directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[List[Issue]]:
+        """
+        Retrieves the issues stored under a key.
+
+        :param key: Key generated by ``key()``.
+        :return: Issues without filenames or None if there is no entry.
+        """
+        try:
+            with self._entry(key).open('rt', encoding='utf-8') as handle:
+                entry = json.load(handle)
+            # Entries from before the rule was recorded hold only line and
+            # description.
+            #
+            issues: List[Issue] = []
+            for line, description, *rule in entry['issues']:
+                issues.append(Issue(description,
+                                    line=line,
+                                    rule=rule[0] if rule else None))
+            return issues
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            message = f"Ignoring unreadable cache entry {key}: {ex}"
+            logging.getLogger(__name__).warning(message)
+            return None
+
+    def put(self, key: str, issues: Sequence[Issue]) -> None:
+        """
+        Stores issues under a key.
+
+        The entry is written in full before it is put in place so concurrent
+        readers and writers never see a partial entry.
+
+        :param key: Key generated by ``key()``.
+        :param issues: Issues found in the source file.
+        """
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        content = {'issues': [[issue.line, issue.description, issue.rule]
+                              for issue in issues]}
+        with NamedTemporaryFile('wt',
+                                encoding='utf-8',
+                                dir=entry.parent,
+                                prefix=f'.{key}.',
+                                delete=False) as handle:
+            json.dump(content, handle)
+        os.replace(handle.name, entry)
@@ -0,0 +1,142 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Finds the source files to be checked.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
+import os
+from pathlib import Path
+import re
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+
+def _compile_globs(globs: Iterable[str]) -> Optional[Pattern]:
+    """
+    Combines a number of shell style wildcard patterns into a single
+    regular expression.
+
+    :param globs: Wildcard patterns.
+    :return: Compiled expression or None if there were no patterns.
+    """
+    expressions = [translate(glob) for glob in globs]
+    if not expressions:
+        return None
+    return re.compile('|'.join(f'(?:{expression})'
+                               for expression in expressions))
+
+
+class SourceDiscovery:
+    """
+    Descends directories looking for files to examine.
+
+    Files are recognised by their extension. Include and exclude patterns
+    are shell style wildcards matched against either the name of a file or
+    directory or its path relative to the directory being searched. An
+    excluded directory is not descended into.
+
+    Directories are searched breadth first with the entries of each directory
+    taken in name order, so the same tree is always reported in the same
+    order. The directories at each depth may be searched concurrently.
+    """
+    def __init__(self,
+                 extensions: Iterable[str],
+                 include: Iterable[str] = (),
+                 exclude: Iterable[str] = (),
+                 jobs: int = 1) -> None:
+        """
+        :param extensions: File extensions, without the dot, to look for.
+        :param include: Only files matching one of these are examined.
+                        If there are none all files are examined.
+        :param exclude: Files and directories matching any of these are
+                        ignored.
+        :param jobs: Number of directories which may be searched at once.
+        """
+        self._extensions = frozenset(extensions)
+        self._include = _compile_globs(include)
+        self._exclude = _compile_globs(exclude)
+        self._jobs = jobs
+
+    @staticmethod
+    def _matches(pattern: Pattern, name: str, relative: str) -> bool:
+        return pattern.match(name) is not None \
+            or pattern.match(relative) is not None
+
+    def _scan(self, directory: Tuple[str, str]) \
+            -> Tuple[List[Path], List[Tuple[str, str]]]:
+        """
+        Lists the files of interest and the directories to descend in a
+        single directory.
+
+        :param directory: Path of the directory and its path relative to
+                          the point at which the search started.
+        :return: Files found and subdirectories, again with their relative
+                 paths.
+        """
+        path, relative = directory
+        with os.scandir(path) as scanner:
+            entries = sorted(scanner, key=lambda entry: entry.name)
+
+        files: List[Path] = []
+        subdirectories: List[Tuple[str, str]] = []
+        for entry in entries:
+            entry_relative = os.path.join(relative, entry.name)
+            if self._exclude is not None \
+                    and self._matches(self._exclude,
+                                      entry.name,
+                                      entry_relative):
+                continue
+            # The entry holds the type gleaned while reading the directory so
+            # this does not normally touch the filesystem.
+            #
+            if entry.is_dir():
+                subdirectories.append((entry.path, entry_relative))
+                continue
+            extension = os.path.splitext(entry.name)[1][1:]
+            if extension not in self._extensions:
+                continue
+            if self._include is not None \
+                    and not self._matches(self._include,
+                                          entry.name,
+                                          entry_relative):
+                continue
+            files.append(Path(entry.path))
+        return files, subdirectories
+
+    def discover(self, candidates: Iterable[Path]) -> Iterator[Path]:
+        """
+        Finds the files to examine.
+
+        Files named explicitly are always examined. Any directories named
+        are descended looking for files.
+
+        :param candidates: Files and directories to search.
+        """
+        level: List[Tuple[str, str]] = []
+        for candidate in candidates:
+            if candidate.is_dir():
+                level.append((str(candidate), ''))
+            else:
+                yield candidate
+
+        executor: Optional[ThreadPoolExecutor] = None
+        if self._jobs > 1:
+            executor = ThreadPoolExecutor(max_workers=self._jobs)
+        try:
+            while level:
+                scans: Iterable[Tuple[List[Path], List[Tuple[str, str]]]]
+                if executor is not None and len(level) > 1:
+                    scans = executor.map(self._scan, level)
+                else:
+                    scans = map(self._scan, level)
+                next_level: List[Tuple[str, str]] = []
+                for files, subdirectories in scans:
+                    yield from files
+                    next_level.extend(subdirectories)
+                level = next_level
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -7,39 +7,391 @@
 """
 Core of the style checking tool.
 """
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, islice
 import logging
+import multiprocessing
 from pathlib import Path
-from typing import Sequence
+from typing import (Callable,
+                    Counter,
+                    Deque,
+                    Dict,
+                    Iterable,
+                    Iterator,
+                    List,
+                    Optional,
+                    Sequence,
+                    Tuple,
+                    TypeVar)
 
+from stylist import StylistException
+from stylist.baseline import Baseline
+from stylist.cache import ResultCache
 from stylist.issue import Issue
-from stylist.source import SourceFactory
+from stylist.source import FilePipe, FortranSource, SourceFactory
 from stylist.style import Style
+from stylist.summary import IssueSummary
+
+_Result = TypeVar('_Result')
 
 
 class CheckEngine:
     """
     Manages the checking of source files against style lists.
     """
-    def __init__(self, styles: Sequence[Style]) -> None:
+    def __init__(self,
+                 styles: Sequence[Style],
+                 cache_dir: Optional[Path] = None,
+                 baseline: Optional[Baseline] = None,
+                 capture_content: bool = False) -> None:
         """
         :param styles: Styles to use when checking source.
+        :param cache_dir: Directory holding results from previous runs. If
+                          unspecified every file is checked afresh.
+        :param baseline: Known issues which are not to be reported.
+        :param capture_content: Give each issue the content of its line. This
+                                is always done when there is a baseline.
         """
         self._styles = styles
+        self._cache_dir = cache_dir
+        self._cache: Optional[ResultCache] = None
+        if cache_dir is not None:
+            self._cache = ResultCache(cache_dir, styles)
+        self._baseline = baseline
+        self._capture_content = capture_content or baseline is not None
+        self._parses_avoided = 0
+        self._suppressed = 0
+
+    @property
+    def parses_avoided(self) -> int:
+        """
+        Number of Fortran source files checked without having to be parsed.
+        """
+        return self._parses_avoided
+
+    @property
+    def suppressed(self) -> int:
+        """
+        Number of issues not reported as they are in the baseline.
+        """
+        return self._suppressed
 
     def check(self, source_filename: Path) -> Sequence[Issue]:
         """
         Passes the eyes of all registered style lists over the source file.
 
+        If a result cache is in use and the file has been seen before with
+        the same styles the previous issues are returned without examining
+        the source again.
+
+        Issues found in the baseline, if there is one, are left out. To
+        recognise them each issue is given the content of its line.
+
         :param source_filename: File to be checked.
         """
-        issues = []
-        with open(source_filename, 'rt') as source_file:
-            message = f"Examining: {str(source_filename)}"
+        text = source_filename.read_text()
+        issues = self._check(source_filename, text)
+        if self._capture_content:
+            lines = text.splitlines()
+            for issue in issues:
+                if issue.line and issue.line <= len(lines):
+                    issue.set_content(lines[issue.line - 1])
+        if self._baseline is None:
+            return issues
+        remaining = self._baseline.filter(issues)
+        self._suppressed += len(issues) - len(remaining)
+        return remaining
+
+    def _check(self, source_filename: Path, text: str) -> Sequence[Issue]:
+        if self._cache is None:
+            return self._examine(source_filename, text)
+
+        pipe = SourceFactory.get_pipe(source_filename.suffix[1:])
+        key = self._cache.key(text.encode('utf-8'), pipe)
+        issues = self._cache.get(key)
+        if issues is None:
+            issues = list(self._examine(source_filename, text))
+            self._cache.put(key, issues)
+        else:
+            message = f"Cached result: {str(source_filename)}"
             logging.getLogger(__name__).info(message)
-            source = SourceFactory.read_file(source_file)
-            for astyle in self._styles:
-                for new_issue in astyle.check(source):
-                    new_issue.set_filename(source_filename)
-                    issues.append(new_issue)
-        issues.sort()
+            for issue in issues:
+                issue.set_filename(source_filename)
+        return issues
+
+    def _examine(self, source_filename: Path, text: str) -> Sequence[Issue]:
+        """
+        Checks the source file against all registered styles.
+        """
+        issues = []
+        message = f"Examining: {str(source_filename)}"
+        logging.getLogger(__name__).info(message)
+        source = SourceFactory.read_text(source_filename, text)
+        for astyle in self._styles:
+            for new_issue in astyle.check(source):
+                new_issue.set_filename(source_filename)
+                issues.append(new_issue)
+        if isinstance(source, FortranSource) \
+                and not source.is_parse_attempted():
+            self._parses_avoided += 1
+        issues.sort(key=Issue.sort_key)
         return issues
+
+    def check_each(self, source_filenames: Iterable[Path]) \
+            -> Iterator[Sequence[Issue]]:
+        """
+        Checks each of a number of source files in turn, handing back the
+        issues of each file as soon as it is done.
+
+        Issues are sorted within each file and the files are reported in the
+        order they were presented. Nothing is held once it has been handed
+        back so any number of files may be checked.
+
+        :param source_filenames: Files to be checked.
+        :return: Issues found in each file.
+        """
+        for source_filename in source_filenames:
+            yield self.check(source_filename)
+        self._report()
+
+    def check_all(self, source_filenames: Iterable[Path]) -> List[Issue]:
+        """
+        Checks each of a number of source files in turn.
+
+        Issues are sorted within each file and the files are reported in the
+        order they were presented.
+
+        :param source_filenames: Files to be checked.
+        """
+        issues: List[Issue] = []
+        for file_issues in self.check_each(source_filenames):
+            issues.extend(file_issues)
+        return issues
+
+    def summarise(self, source_filenames: Iterable[Path]) -> IssueSummary:
+        """
+        Checks each of a number of source files, keeping only a count of the
+        issues found by each rule in each file.
+
+        :param source_filenames: Files to be checked.
+        """
+        summary = IssueSummary()
+        for source_filename in source_filenames:
+            summary.add(source_filename,
+                        IssueSummary.count(self.check(source_filename)))
+        self._report()
+        return summary
+
+    def _report(self) -> None:
+        message = f"Parses avoided: {self._parses_avoided}"
+        logging.getLogger(__name__).info(message)
+        if self._baseline is not None:
+            message = f"Issues in baseline: {self._suppressed}"
+            logging.getLogger(__name__).info(message)
+
+
+# Engine used by a worker process of the parallel engine.
+#
+_worker_engine: Optional[CheckEngine] = None
+
+
+def _start_worker(styles: Sequence[Style],
+                  cache_dir: Optional[Path],
+                  baseline: Optional[Baseline],
+                  capture_content: bool,
+                  pipes: Dict[str, FilePipe]) -> None:
+    """
+    Prepares a worker process to check source files.
+
+    Extension mappings added at run time are not necessarily present in a
+    freshly started worker so they are replayed here.
+    """
+    global _worker_engine
+    known_extensions = set(SourceFactory.get_extensions())
+    for extension, pipe in pipes.items():
+        if extension not in known_extensions:
+            SourceFactory.add_extension(extension, pipe)
+    _worker_engine = CheckEngine(styles, cache_dir, baseline,
+                                 capture_content)
+
+
+def _in_worker(source_filename: Path,
+               outcome: Callable[[Sequence[Issue]], _Result]) \
+        -> Tuple[_Result, int, int]:
+    """
+    Checks a single source file using the worker process's engine.
+
+    :param source_filename: File to be checked.
+    :param outcome: Turns the issues found into what is sent back.
+    :return: Outcome of the check, the number of parses this avoided and the
+             number of issues left out as they are in the baseline.
+    """
+    if _worker_engine is None:
+        raise Exception("Worker process used before being started")
+    parses_avoided = _worker_engine.parses_avoided
+    suppressed = _worker_engine.suppressed
+    issues = _worker_engine.check(source_filename)
+    return outcome(issues), \
+        _worker_engine.parses_avoided - parses_avoided, \
+        _worker_engine.suppressed - suppressed
+
+
+def _batch_in_worker(task: Callable[[Path], Tuple[_Result, int, int]],
+                     source_filenames: List[Path]) \
+        -> List[Tuple[_Result, int, int]]:
+    """
+    Checks a batch of source files in a worker process.
+    """
+    return [task(source_filename) for source_filename in source_filenames]
+
+
+def _check_in_worker(source_filename: Path) \
+        -> Tuple[Sequence[Issue], int, int]:
+    """
+    Checks a single source file, sending back the issues found.
+    """
+    return _in_worker(source_filename, lambda issues: issues)
+
+
+def _count_in_worker(source_filename: Path) \
+        -> Tuple[Counter[str], int, int]:
+    """
+    Checks a single source file, sending back only the number of issues
+    found by each rule.
+    """
+    return _in_worker(source_filename, IssueSummary.count)
+
+
+class ParallelCheckEngine(CheckEngine):
+    """
+    Spreads the checking of source files across a pool of processes.
+
+    The issues reported are identical to, and in the same order as, those of
+    the serial engine.
+    """
+    # Number of files handed to a worker at a time and the number of such
+    # batches which may be waiting for each worker.
+    #
+    _BATCH_SIZE = 16
+    _BATCHES_PER_JOB = 2
+
+    def __init__(self,
+                 styles: Sequence[Style],
+                 jobs: int,
+                 cache_dir: Optional[Path] = None,
+                 baseline: Optional[Baseline] = None,
+                 capture_content: bool = False) -> None:
+        """
+        :param styles: Styles to use when checking source.
+        :param jobs: Number of worker processes to use.
+        :param cache_dir: Directory holding results from previous runs.
+        :param baseline: Known issues which are not to be reported.
+        :param capture_content: Give each issue the content of its line.
+        """
+        super().__init__(styles, cache_dir, baseline, capture_content)
+        if jobs < 1:
+            message = "At least one job is needed to check source"
+            raise StylistException(message)
+        self._jobs = jobs
+
+    def check_each(self, source_filenames: Iterable[Path]) \
+            -> Iterator[Sequence[Issue]]:
+        filenames, parallel = self._prepare(source_filenames)
+        if not parallel:
+            yield from super().check_each(filenames)
+            return
+        for _, file_issues in self._in_workers(_check_in_worker, filenames):
+            yield file_issues
+        self._report()
+
+    def summarise(self, source_filenames: Iterable[Path]) -> IssueSummary:
+        filenames, parallel = self._prepare(source_filenames)
+        if not parallel:
+            return super().summarise(filenames)
+        # Workers send back counts rather than issues, which are much
+        # cheaper to pass between processes.
+        #
+        summary = IssueSummary()
+        for filename, counts in self._in_workers(_count_in_worker,
+                                                 filenames):
+            summary.add(filename, counts)
+        self._report()
+        return summary
+
+    def _prepare(self, source_filenames: Iterable[Path]) \
+            -> Tuple[Iterator[Path], bool]:
+        """
+        Decides whether it is worth starting workers, looking no further
+        ahead than needed to do so.
+
+        :return: Files to be checked and whether to use the workers.
+        """
+        filenames = iter(source_filenames)
+        if self._jobs == 1:
+            return filenames, False
+        first = list(islice(filenames, 2))
+        return chain(first, filenames), len(first) > 1
+
+    def _in_workers(self,
+                    task: Callable[[Path], Tuple[_Result, int, int]],
+                    filenames: Iterator[Path]) \
+            -> Iterator[Tuple[Path, _Result]]:
+        """
+        Checks files across the pool of worker processes.
+
+        Files are taken from the iterator only as workers become ready for
+        them so checking may start before all the files are known.
+
+        :param task: Checks a single file in a worker.
+        :param filenames: Files to be checked.
+        :return: Each file along with the outcome of checking it, in the
+                 order the files were presented.
+        """
+        # Styles may hold rules defined in a configuration file. These cannot
+        # be pickled so where possible workers are forked, inheriting the
+        # styles rather than receiving them.
+        #
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        pipes = {extension: SourceFactory.get_pipe(extension)
+                 for extension in SourceFactory.get_extensions()}
+
+        # Work is handed out in batches to cut down on inter-process chatter.
+        # Only a few batches per worker are outstanding at any time so files
+        # are not read ahead of need, and results come back in order each as
+        # soon as it and those before it are done.
+        #
+        batches = iter(lambda: list(islice(filenames, self._BATCH_SIZE)), [])
+        pending: Deque[Tuple[List[Path], Future]] = deque()
+        with ProcessPoolExecutor(max_workers=self._jobs,
+                                 mp_context=context,
+                                 initializer=_start_worker,
+                                 initargs=(self._styles,
+                                           self._cache_dir,
+                                           self._baseline,
+                                           self._capture_content,
+                                           pipes)) as executor:
+            for batch in batches:
+                pending.append((batch,
+                                executor.submit(_batch_in_worker,
+                                                task,
+                                                batch)))
+                if len(pending) >= self._jobs * self._BATCHES_PER_JOB:
+                    yield from self._collect(*pending.popleft())
+            while pending:
+                yield from self._collect(*pending.popleft())
+
+    def _collect(self,
+                 batch: List[Path],
+                 future: 'Future[List[Tuple[_Result, int, int]]]') \
+            -> Iterator[Tuple[Path, _Result]]:
+        """
+        Waits for a batch to be done, accounting for its results.
+        """
+        for filename, (outcome, parses_avoided, suppressed) \
+                in zip(batch, future.result()):
+            self._parses_avoided += parses_avoided
+            self._suppressed += suppressed
+            yield filename, outcome
@@ -8,20 +8,22 @@ Rules relating to Fortran source.
 """
 import re
 from abc import ABC, abstractmethod
-from typing import (Container, Dict, List, Optional, Pattern, Sequence, Type,
-                    Union, Any, cast)
+from typing import (Container, Dict, List, Mapping, Optional, Pattern,
+                    Sequence, Tuple, Type, Union, Any, cast)
 
 import fparser.two.Fortran2003 as Fortran2003  # type: ignore
-import fparser.two.Fortran2008 as Fortran2008  # type: ignore
-from fparser.two.utils import (get_child as fp_get_child,  # type: ignore
-                               walk as fp_walk)
+from fparser.two.utils import get_child as fp_get_child  # type: ignore
 
+from stylist import StylistException
 from stylist.issue import Issue
 from stylist.rule import Rule
-from stylist.source import FortranSource
+from stylist.source import (FortranDeclaration, FortranEntity,
+                            FortranLexicalMask, FortranNodeIndex,
+                            FortranScope, FortranSource)
 
 
-def _line(node: Fortran2003.Base) -> int:
+def _line(node: Fortran2003.Base,
+          index: Optional[FortranNodeIndex] = None) -> int:
     """
     Determines the source line on which a given node appears.
 
@@ -29,7 +31,13 @@ def _line(node: Fortran2003.Base) -> int:
     it doesn't seem to be possible to determine exactly which one a particular
     subsidiary part appears on. Therefore it is always the first line of the
     continuation block.
+
+    :param node: Node of interest.
+    :param index: Index of the tree holding the node, if available. Lines
+                  are then looked up rather than searched for.
     """
+    if index is not None:
+        return index.line(node)
     target = node
     while target.item is None:
         target = target.parent
@@ -62,6 +70,18 @@ class FortranRule(Rule, ABC):
         issues.extend(self.examine_fortran(subject))
         return issues
 
+    def text_prefilter(self) -> Optional[Tuple[str, ...]]:
+        """
+        Gets words, one of which must appear in the source text for this
+        rule to find anything. They are matched without regard to case.
+
+        This allows the rule to be passed over, and possibly the parsing of
+        the source avoided, with no more than a scan of the text.
+
+        :return: Lower case words or None if the rule must always be applied.
+        """
+        return None
+
     @abstractmethod
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         """
@@ -85,49 +105,29 @@ class FortranCharacterset(Rule):
     _FORTRAN_SPECIALS = ' =+-*/\\()[]{},.:;!"%&~<>?\'`^|$#@'
     _FORTRAN_CHARACTERSET = _FORTRAN_ALPHANUMERIC + _FORTRAN_SPECIALS
 
-    _APOSTROPHY = "'"
-    _EXCLAMATION = '!'
-    _NEWLINE = '\n'
-    _QUOTE = '"'
+    _FOREIGN_PATTERN = re.compile('[^' + re.escape(_FORTRAN_CHARACTERSET)
+                                  + r'\n]')
 
     def examine(self, subject: FortranSource) -> List[Issue]:
         issues = []
 
         text = subject.get_text()
-        index = 0
         line = 1
-        state = 'code'
-        while index < len(text):
-            character = text[index]
-            if state == 'code':
-                if character == self._NEWLINE:
-                    line += 1
-                elif character == self._EXCLAMATION:
-                    state = 'comment'
-                elif character == self._APOSTROPHY:
-                    state = 'apostraphystring'
-                elif character == self._QUOTE:
-                    state = 'quotestring'
-                elif character in self._FORTRAN_CHARACTERSET:
-                    pass
-                else:
+        counted = 0
+        for start, end, kind in subject.get_lexical_mask().spans():
+            if kind == FortranLexicalMask.STRING:
+                # Newlines inside strings are not counted.
+                line += text.count('\n', counted, start)
+                counted = end
+            elif kind == FortranLexicalMask.CODE:
+                for match in self._FOREIGN_PATTERN.finditer(text, start, end):
+                    position = match.start()
+                    line += text.count('\n', counted, position)
+                    counted = position
                     description = "Found character {char} " \
                                   + "not in Fortran character set"
-                    description = description.format(char=repr(character))
+                    description = description.format(char=repr(match.group()))
                     issues.append(Issue(description, line=line))
-            elif state == 'comment':
-                if character == self._NEWLINE:
-                    line += 1
-                    state = 'code'
-            elif state == 'apostraphystring':
-                if character == self._APOSTROPHY:
-                    state = 'code'
-            elif state == 'quotestring':
-                if character == self._QUOTE:
-                    state = 'code'
-            else:
-                raise Exception('Parser in unknown state: ' + state)
-            index += 1
 
         return issues
 
@@ -181,7 +181,9 @@ class MissingImplicit(FortranRule):
                 description = "{thing} '{name}' is missing " \
                               + "an implicit statement"
                 description = description.format(thing=nature, name=name)
-                issues.append(Issue(description, line=_line(scope_statement)))
+                issues.append(Issue(description,
+                                    line=_line(scope_statement,
+                                               subject.get_node_index())))
         return issues
 
 
@@ -191,96 +193,64 @@ class MissingIntent(FortranRule):
     have specified intent.
     """
 
+    # Scopes holding subprograms whose arguments are checked. They are
+    # reported in this order.
+    #
+    _HOSTS = (Fortran2003.Main_Program, Fortran2003.Module)
+
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         issues: List[Issue] = []
-        scope_units: List[Fortran2003.Base] = []
-
-        # get all subprograms (functions and subroutines) within programs
-        scope_units.extend(subject.path(['Main_Program',
-                                         'Internal_Subprogram_Part',
-                                         'Internal_Subprogram']))
-
-        # get all subprograms within modules
-        scope_units.extend(subject.path(['Module',
-                                         'Module_Subprogram_Part',
-                                         'Module_Subprogram']))
-
-        # get all naked subprograms
-        scope_units.extend(subject.path(['Function_Subprogram']))
-        scope_units.extend(subject.path(['Subroutine_Subprogram']))
-
-        for scope in scope_units:
-            # get initialisation statement and piece containing all type
-            # declarations
-
-            specs = None
-            for part in scope.children:
-                if type(part) in (Fortran2003.Function_Stmt,
-                                  Fortran2003.Subroutine_Stmt):
-                    stmt = part
-                if type(part) is Fortran2003.Specification_Part:
-                    specs = part
-                    # we don't need to check the rest of the children
-                    break
-
-            # covert tree node into a python list
-            dummy_arg_list = stmt.children[2]
-
-            # initialise set in case empty
-            dummy_args: List[str] = []
-            if dummy_arg_list is not None:
-                dummy_args = [arg.string.lower() for arg in
-                              dummy_arg_list.children]
-
-            if specs is not None:
-                for spec in specs.children:
-                    if spec.__class__ == Fortran2008.Type_Declaration_Stmt:
-
-                        # check if type declaration has an intent
-                        attributes = spec.children[1]
-                        if attributes is not None:
-                            for attribute in attributes.children:
-                                if attribute.__class__ \
-                                        == Fortran2003.Intent_Attr_Spec:
-
-                                    # if so, remove argument names from
-                                    # dummy_args
-                                    for arg in spec.children[2].children:
-                                        arg_name = arg.children[
-                                            0].string.lower()
-                                        if arg_name in dummy_args:
-                                            dummy_args.remove(arg_name)
-
-                    elif spec.__class__ \
-                            == Fortran2003.Procedure_Declaration_Stmt:
-                        print(repr(spec))
-                        attributes = spec.children[1]
-                        if attributes is not None:
-                            for attribute in attributes.children:
-                                if attribute.__class__ \
-                                        == Fortran2003.Proc_Attr_Spec:
-                                    # if so, remove argument names from
-                                    # dummy_args
-                                    for arg in spec.children[2].children:
-                                        arg_name = arg.string.lower()
-                                        if arg_name in dummy_args:
-                                            dummy_args.remove(arg_name)
-
-            # get the type of block
-            if type(scope) is Fortran2003.Subroutine_Subprogram:
+        table = subject.get_symbol_table()
+        if table is None:
+            return issues
+
+        scopes: List[Tuple[int, FortranScope]] = []
+        for scope in table.scopes():
+            if type(scope.node) not in (Fortran2003.Subroutine_Subprogram,
+                                        Fortran2003.Function_Subprogram):
+                continue
+            if scope.parent is None or scope.parent.parent is None:
+                # Naked subprograms follow those in programs and modules,
+                # functions before subroutines.
+                #
+                if type(scope.node) is Fortran2003.Function_Subprogram:
+                    scopes.append((len(self._HOSTS), scope))
+                else:
+                    scopes.append((len(self._HOSTS) + 1, scope))
+            elif type(scope.parent.node) in self._HOSTS:
+                scopes.append((self._HOSTS.index(type(scope.parent.node)),
+                               scope))
+        scopes.sort(key=lambda pair: pair[0])
+
+        for _, scope in scopes:
+            if type(scope.node) is Fortran2003.Subroutine_Subprogram:
                 unit_type = 'subroutine'
-            elif type(scope) is Fortran2003.Function_Subprogram:
+            else:
                 unit_type = 'function'
 
-            # any remaining dummy arguments lack intent
-            for arg in dummy_args:
-                description = f'Dummy argument "{arg}" of {unit_type} "' \
-                              f'{stmt.children[1].string}" is missing an ' \
+            for arg in scope.dummy_args:
+                entity = scope.lookup(arg)
+                if entity is not None and self._has_intent(entity):
+                    continue
+                description = f'Dummy argument "{arg.lower()}" of ' \
+                              f'{unit_type} "{scope.name}" is missing an ' \
                               f'"intent" statement'
-                issues.append(Issue(description, line=_line(stmt)))
+                issues.append(Issue(description,
+                                    line=_line(scope.statement,
+                                               subject.get_node_index())))
 
         return issues
 
+    @staticmethod
+    def _has_intent(entity: FortranEntity) -> bool:
+        """
+        Dummy procedures given any attribute other than accessibility or
+        binding are taken to be satisfactory.
+        """
+        if entity.declaration.is_procedure:
+            return bool(entity.attributes - {'PUBLIC', 'PRIVATE', 'BIND'})
+        return entity.intent is not None
+
 
 class MissingOnly(FortranRule):
     """
@@ -298,16 +268,13 @@ class MissingOnly(FortranRule):
             self._ignore = ignore
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
-        issues = []
+        issues: List[Issue] = []
 
-        for statement in subject.find_all(Fortran2003.Use_Stmt):
-            module = statement.items[2]
-            onlies = statement.items[4]
-            if str(module).lower() not in self._ignore:
-                if onlies is None:
-                    description = 'Usage of "{module}" without "only" clause.'
-                    issues.append(Issue(description.format(module=module),
-                                        line=_line(statement)))
+        for use in subject.get_use_statements() or []:
+            if use.module not in self._ignore and not use.has_only:
+                description = 'Usage of "{module}" without "only" clause.'
+                issues.append(Issue(description.format(module=use.name),
+                                    line=use.line))
 
         return issues
 
@@ -321,17 +288,17 @@ class IntrinsicModule(FortranRule):
                    "ieee_exceptions", "ieee_arithmetic",
                    "ieee_features"]
 
+    def text_prefilter(self) -> Optional[Tuple[str, ...]]:
+        return 'iso_', 'ieee_'
+
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
-        issues = []
-        for statement in subject.find_all(Fortran2003.Use_Stmt):
-            module = statement.items[2]
-            if str(module).lower() in self._INTRINSICS:
-                nature = statement.items[0]
-                if nature is None or nature.string.lower() != 'intrinsic':
-                    description = 'Usage of intrinsic module "{module}" ' \
-                                  'without "intrinsic" clause.'
-                    issues.append(Issue(description.format(module=module),
-                                        line=_line(statement)))
+        issues: List[Issue] = []
+        for use in subject.get_use_statements() or []:
+            if use.module in self._INTRINSICS and use.nature != 'intrinsic':
+                description = 'Usage of intrinsic module "{module}" ' \
+                              'without "intrinsic" clause.'
+                issues.append(Issue(description.format(module=use.name),
+                                    line=use.line))
 
         return issues
 
@@ -340,27 +307,26 @@ class LabelledDoExit(FortranRule):
     """
     Catches cases where a "do" construct is exited but not explicitly named.
     """
+    def text_prefilter(self) -> Optional[Tuple[str, ...]]:
+        return 'exit',
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
-        issues = []
+        issues: List[Issue] = []
+        index = subject.get_node_index()
+        if index is None:
+            return issues
 
-        for exit in subject.find_all(Fortran2003.Exit_Stmt):
+        # This includes exits in inline if statements.
+        #
+        classes = [cls for cls in index.get_classes()
+                   if issubclass(cls, Fortran2003.Exit_Stmt)]
+        for position in index.of_classes(classes):
+            exit = index.node(position)
             if exit.items[1] is None:
-                issues.append(Issue('Usage of "exit" without label indicating '
-                                    'which "do" construct is being exited '
-                                    'from.',
+                issues.append(Issue('Usage of "exit" without label '
+                                    'indicating which "do" construct is '
+                                    'being exited from.',
                                     line=_line(exit)))
-
-        # Above doesn't catch exits in inline if statements
-        for statement in subject.find_all(Fortran2003.If_Stmt):
-            action = statement.items[1]
-            if type(action) is Fortran2003.Exit_Stmt and action.items[
-                    1] is None:
-                issues.append(Issue('Usage of "exit" without label indicating '
-                                    'which "do" construct is being exited '
-                                    'from.',
-                                    line=_line(statement)))
-
         return issues
 
 
@@ -370,161 +336,69 @@ class MissingPointerInit(FortranRule):
     """
     problem = 'Declaration of pointer "{name}" without initialisation.'
 
-    @staticmethod
-    def _is_pointer(root: Fortran2003.Base,
-                    attr_node: Type[Fortran2003.Base]) -> bool:
-        attribute_names: List[str] = []
-        for attribute in fp_walk(root, attr_node):
-            attribute_names.append(str(attribute).strip())
-        return 'POINTER' in attribute_names
-
-    @staticmethod
-    def _data(root: Fortran2003.Base,
-              declaration_statement: Type[Fortran2003.Base],
-              attribute_specification: Type[Fortran2003.Base],
-              entity_declaration: Type[Fortran2003.Base],
-              initialiser: Type[Fortran2003.Base],
-              ignore_names: Sequence[str] = ()) -> List[Issue]:
-        issues: List[Issue] = []
-
-        for data_declaration in fp_walk(root, declaration_statement):
-            if not MissingPointerInit._is_pointer(data_declaration,
-                                                  attribute_specification):
-                continue
-
-            # @todo This is quite ugly
-            #
-            potential_interface_block = data_declaration.parent.parent.parent
-            if isinstance(potential_interface_block,
-                          Fortran2003.Interface_Block):
-                continue
-
-            for entity in fp_walk(data_declaration, entity_declaration):
-                if str(fp_get_child(entity, Fortran2003.Name)) in ignore_names:
-                    continue
-
-                if fp_get_child(entity, initialiser) is None:
-                    name = str(fp_get_child(entity, Fortran2003.Name))
-                    message = MissingPointerInit.problem.format(name=name)
-                    issue = Issue(message, line=data_declaration.item.span[0])
-                    issues.append(issue)
-
-        return issues
-
-    @staticmethod
-    def _proc(root: Fortran2003.Base,
-              declaration_statement: Type[Fortran2003.Base],
-              attribute_specification: Type[Fortran2003.Base],
-              declaration_list: Type[Fortran2003.Base],
-              ignore_names: Container[str] = ()) -> List[Issue]:
-        issues: List[Issue] = []
-
-        for proc_declaration in fp_walk(root, declaration_statement):
-            if not MissingPointerInit._is_pointer(proc_declaration,
-                                                  attribute_specification):
-                continue
-
-            for declaration in fp_get_child(proc_declaration,
-                                            declaration_list).children:
-                if (isinstance(declaration, Fortran2003.Name)
-                        and str(declaration) not in ignore_names):
-                    name = str(declaration)
-                    message = MissingPointerInit.problem.format(name=name)
-                    issue = Issue(message, line=proc_declaration.item.span[0])
-                    issues.append(issue)
-
-        return issues
-
-    @staticmethod
-    def _program_unit(unit: Union[Fortran2003.Main_Program,
-                                  Fortran2003.Module]) -> List[Issue]:
-        issues: List[Issue] = []
-
-        specification = fp_get_child(unit, Fortran2003.Specification_Part)
-
-        issues.extend(MissingPointerInit._data(
-            specification,
-            Fortran2003.Type_Declaration_Stmt,
-            Fortran2003.Attr_Spec,
-            Fortran2003.Entity_Decl,
-            Fortran2003.Initialization)
-        )
-        issues.extend(MissingPointerInit._proc(
-            specification,
-            Fortran2003.Procedure_Declaration_Stmt,
-            Fortran2003.Proc_Attr_Spec,
-            Fortran2003.Proc_Decl_List)
-        )
-
-        return issues
+    _PROGRAM_UNITS = (Fortran2003.Main_Program, Fortran2003.Module)
+    _INTERFACE_BODIES = (Fortran2003.Subroutine_Body,
+                         Fortran2003.Function_Body)
+    _SUBPROGRAMS = (Fortran2003.Subroutine_Subprogram,
+                    Fortran2003.Function_Subprogram)
 
-    @staticmethod
-    def _derived_type_definition(derived_type: Fortran2003.Derived_Type_Def)\
-            -> List[Issue]:
-        issues: List[Issue] = []
-
-        issues.extend(MissingPointerInit._data(
-            derived_type,
-            Fortran2003.Data_Component_Def_Stmt,
-            Fortran2003.Component_Attr_Spec,
-            Fortran2003.Component_Decl,
-            Fortran2003.Component_Initialization)
-        )
-        issues.extend(MissingPointerInit._proc(
-            derived_type,
-            Fortran2003.Proc_Component_Def_Stmt,
-            Fortran2003.Proc_Component_Attr_Spec,
-            Fortran2003.Proc_Decl_List)
-        )
-
-        return issues
-
-    @staticmethod
-    def _subroutine_definition(subroutine: Fortran2003.Subroutine_Subprogram)\
-            -> List[Issue]:
-        issues: List[Issue] = []
+    @classmethod
+    def _ignored_names(cls, declaration: FortranDeclaration) \
+            -> Optional[Container[str]]:
+        """
+        Decides whether a declaration is of interest and, if it is, which
+        names it may declare without initialisation.
 
-        subroutine_statement = fp_get_child(subroutine,
-                                            Fortran2003.Subroutine_Stmt)
-        arguments = fp_get_child(subroutine_statement,
-                                 Fortran2003.Dummy_Arg_List)
-        argument_names = [str(name) for name in fp_walk(arguments,
-                                                        Fortran2003.Name)]
-
-        issues.extend(MissingPointerInit._data(
-            subroutine,
-            Fortran2003.Type_Declaration_Stmt,
-            Fortran2003.Attr_Spec,
-            Fortran2003.Entity_Decl,
-            Fortran2003.Initialization,
-            argument_names)
-        )
-        issues.extend(MissingPointerInit._proc(
-            subroutine,
-            Fortran2003.Procedure_Declaration_Stmt,
-            Fortran2003.Proc_Attr_Spec,
-            Fortran2003.Proc_Decl_List,
-            argument_names)
-        )
+        Components are always of interest. Otherwise declarations within
+        subroutines, outside interface bodies, are of interest except for
+        the arguments of the subprogram they are in. Finally declarations
+        in programs and modules are of interest, as are procedures declared
+        in interface bodies there.
 
-        return issues
+        :return: Names to ignore or None if the declaration is of no
+                 interest.
+        """
+        if declaration.is_component:
+            return ()
+
+        scopes = list(declaration.scope.ancestry())
+        if not declaration.is_procedure \
+                and isinstance(scopes[0].node, cls._INTERFACE_BODIES):
+            return None
+
+        if any(isinstance(scope.node, Fortran2003.Subroutine_Subprogram)
+               for scope in scopes):
+            for scope in scopes:
+                if isinstance(scope.node, cls._SUBPROGRAMS):
+                    return scope.dummy_args
+
+        for scope in scopes:
+            if isinstance(scope.node, cls._PROGRAM_UNITS):
+                return ()
+            if not isinstance(scope.node, cls._INTERFACE_BODIES):
+                break
+        return None
+
+    def text_prefilter(self) -> Optional[Tuple[str, ...]]:
+        return 'pointer',
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         issues: List[Issue] = []
+        table = subject.get_symbol_table()
+        if table is None:
+            return issues
 
-        unit: Union[Fortran2003.Main_Program, Fortran2003.Module]
-        for unit in fp_walk(subject.get_tree(),
-                            (Fortran2003.Main_Program,
-                             Fortran2003.Module)):
-            issues.extend(self._program_unit(unit))
-
-        subroutine: Fortran2003.Subroutine_Subprogram
-        for subroutine in subject.find_all(Fortran2003.Subroutine_Subprogram):
-            issues.extend(self._subroutine_definition(subroutine))
-
-        derived_type: Fortran2003.Derived_Type_Def
-        for derived_type in subject.find_all(Fortran2003.Derived_Type_Def):
-            issues.extend(self._derived_type_definition(derived_type))
+        for declaration in table.declarations():
+            if 'POINTER' not in declaration.attributes:
+                continue
+            ignore_names = self._ignored_names(declaration)
+            if ignore_names is None:
+                continue
+            for entity in declaration.entities:
+                if entity.initialised or entity.name in ignore_names:
+                    continue
+                message = self.problem.format(name=entity.name)
+                issues.append(Issue(message, line=declaration.line))
 
         issues.sort(key=lambda x: (x.filename, x.line, x.description))
         return issues
@@ -564,56 +438,26 @@ class KindPattern(FortranRule):
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         issues: List[Issue] = []
+        table = subject.get_symbol_table()
+        if table is None:
+            return issues
 
-        candidates: List[Fortran2003.Base] = []
-        # Component variables
-        candidates.extend(
-            subject.find_all(Fortran2003.Data_Component_Def_Stmt))
-        # Component Procedure
-        candidates.extend(
-            subject.find_all(Fortran2003.Proc_Component_Def_Stmt))
-        # Procedure declaration
-        candidates.extend(
-            subject.find_all(Fortran2003.Procedure_Declaration_Stmt))
-        # Variable declaration
-        candidates.extend(
-            subject.find_all(Fortran2003.Type_Declaration_Stmt))
-
-        for candidate in candidates:
-            if isinstance(candidate,  # Is variable
-                          (Fortran2003.Data_Component_Def_Stmt,
-                           Fortran2003.Type_Declaration_Stmt)):
-                type_spec: Fortran2003.Intrinsic_Type_Spec = candidate.items[0]
-                data_type: str = type_spec.items[0].lower()
-
-                if self._patterns.get(data_type) is None:
-                    continue
-                pattern = cast(Pattern[Any], self._patterns[data_type])
-
-                kind_selector: Fortran2003.Kind_Selector = type_spec.items[1]
-                if kind_selector is None:
-                    entity_declaration = candidate.items[2]
-                    message = self._ISSUE_TEMPLATE.format(
-                        type=data_type,
-                        kind='',
-                        name=entity_declaration,
-                        pattern=pattern.pattern)
-                    issues.append(Issue(message,
-                                        line=_line(candidate)))
-                    continue
+        for declaration in table.declarations():
+            if declaration.type is None \
+                    or self._patterns.get(declaration.type) is None:
+                continue
+            pattern = cast(Pattern[Any], self._patterns[declaration.type])
+            if declaration.kind is not None \
+                    and pattern.match(declaration.kind) is not None:
+                continue
 
-                if isinstance(kind_selector, Fortran2003.Kind_Selector):
-                    kind: str = str(kind_selector.children[1])
-                    match = pattern.match(kind)
-                    if match is None:
-                        entity_declaration = candidate.items[2]
-                        message = self._ISSUE_TEMPLATE.format(
-                            type=data_type,
-                            kind=kind,
-                            name=entity_declaration,
-                            pattern=pattern.pattern)
-                        issues.append(Issue(message,
-                                            line=_line(candidate)))
+            message = self._ISSUE_TEMPLATE.format(
+                type=declaration.type,
+                kind=declaration.kind or '',
+                name=declaration.node.items[2],
+                pattern=pattern.pattern
+            )
+            issues.append(Issue(message, line=declaration.line))
 
         issues.sort(key=lambda x: (x.filename, x.line, x.description))
         return issues
@@ -632,61 +476,26 @@ class AutoCharArrayIntent(FortranRule):
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         issues: List[Issue] = []
+        table = subject.get_symbol_table()
+        if table is None:
+            return issues
 
-        # Collect all variable declarations
-        declarations: List[Fortran2003.Type_Declaration_Stmt] = list(
-            subject.find_all(Fortran2003.Type_Declaration_Stmt)
-        )
-
-        # keep only the ones in subroutines
-        declarations = [
-            declaration
-            for declaration
-            in declarations
-            if isinstance(
-                declaration.parent.parent,
-                Fortran2003.Subroutine_Subprogram
-            )
-        ]
-
-        for declaration in declarations:
-            type_spec = declaration.items[0]
-            # If not a character, no concern
-            if not type_spec.items[0] == "CHARACTER":
-                continue
-            param_value = type_spec.items[1]
-            # If no length is specified we don't care
-            if param_value is None:
-                continue
-            # This might be a length selector, if so get the param value
-            if isinstance(param_value, Fortran2003.Length_Selector):
-                param_value = param_value.items[1]
-            # If not an auto length, no concern
-            if not param_value.string == "*":
+        for declaration in table.declarations():
+            # Only variables declared directly in subroutines are of concern.
+            if declaration.is_component or declaration.is_procedure \
+                    or not isinstance(declaration.scope.node,
+                                      Fortran2003.Subroutine_Subprogram):
                 continue
-            attr_spec_list = declaration.items[1]
-            # If no attributes specified, no concern
-            if attr_spec_list is None:
+            # Only automatic length characters are of concern.
+            if declaration.type != 'character' or declaration.length != '*':
                 continue
-            # Get intent attr and not other attributes
-            intent_attr = None
-            for item in attr_spec_list.items:
-                if isinstance(item, Fortran2003.Intent_Attr_Spec):
-                    intent_attr = item
-                    break
-            # If no intent, no concern
             # Ensuring arguments specify intent should be enforced elsewhere
-            if intent_attr is None:
-                continue
-            # Intent in, no concern
-            if intent_attr.items[1].string == "IN":
+            if declaration.intent is None or declaration.intent == 'IN':
                 continue
             issues.append(Issue(
-                self.__message(
-                    declaration.items[2].string,
-                    intent_attr.items[1]
-                ),
-                line=_line(declaration)
+                self.__message(declaration.node.items[2].string,
+                               declaration.intent),
+                line=declaration.line
             ))
 
         return issues
@@ -699,87 +508,138 @@ class NakedLiteral(FortranRule):
     Checking of integers and reals are controlled separately so you can have
     one and not the other.
     """
+    # Constructs which give a literal the name it is reported against.
+    #
+    _CONTEXTS = (Fortran2003.Part_Ref,
+                 Fortran2003.Assignment_Stmt,
+                 Fortran2003.Entity_Decl,
+                 Fortran2003.Component_Decl)
+
     def __init__(self, integers: bool = True, reals: bool = True):
         self._integers = integers
         self._reals = reals
 
-    def examine_fortran(self, subject: FortranSource) -> List[Issue]:
-        issues: List[Issue] = []
-
-        candidates: List[Fortran2003.Base] = []
+    def _literal_classes(self) -> Tuple[Type[Fortran2003.Base], ...]:
+        literal_classes: Tuple[Type[Fortran2003.Base], ...] = ()
         if self._integers:
-            candidates.extend(fp_walk(subject.get_tree(),
-                                      Fortran2003.Int_Literal_Constant))
+            literal_classes += (Fortran2003.Int_Literal_Constant,)
         if self._reals:
-            candidates.extend(fp_walk(subject.get_tree(),
-                                      Fortran2003.Real_Literal_Constant))
-
-        for literal in candidates:
-            if literal.items[1] is not None:  # Skip when kind is present
-                continue
+            literal_classes += (Fortran2003.Real_Literal_Constant,)
+        return literal_classes
 
-            name: Optional[str] = None
-            parent = literal.parent
-            while parent is not None:
-                if isinstance(parent, Fortran2003.Part_Ref):
-                    name = str(fp_get_child(parent,
-                                            Fortran2003.Name))
-                    message = f'Literal value index used with "{name}"' \
-                              ' without kind'
-                    break
-                elif isinstance(parent, (Fortran2003.Assignment_Stmt,
-                                         Fortran2003.Entity_Decl,
-                                         Fortran2003.Component_Decl)):
-                    array_slice = fp_get_child(parent, Fortran2003.Part_Ref)
-                    if array_slice is None:
-                        name = str(fp_get_child(parent, Fortran2003.Name))
-                    else:
-                        name = str(fp_get_child(array_slice, Fortran2003.Name))
-                    message = f'Literal value assigned to "{name}"' \
-                              ' without kind'
-                    break
-                else:
-                    parent = parent.parent
-            if name is None:
-                message = 'Literal value without "kind"'
-            issues.append(Issue(message, line=_line(literal)))
+    def examine_fortran(self, subject: FortranSource) -> List[Issue]:
+        issues: List[Issue] = []
+        index = subject.get_node_index()
+        literal_classes = self._literal_classes()
+        if index is None or not literal_classes:
+            return issues
 
+        # Both kinds of literal are gathered together, each along with the
+        # nearest construct around it. Literals often share a construct so
+        # its message is worked out only once.
+        #
+        messages: Dict[int, str] = {}
+        for node, context in index.nearest_ancestors(literal_classes,
+                                                     self._CONTEXTS):
+            if node.items[1] is not None:  # Skip when kind is present
+                continue
+            message = messages.get(id(context))
+            if message is None:
+                message = self._message(context)
+                messages[id(context)] = message
+            issues.append(Issue(message, line=index.line(node)))
         return issues
 
+    @staticmethod
+    def _message(context: Optional[Fortran2003.Base]) -> str:
+        if context is None:
+            return 'Literal value without "kind"'
+        if isinstance(context, Fortran2003.Part_Ref):
+            name = str(fp_get_child(context, Fortran2003.Name))
+            return f'Literal value index used with "{name}" without kind'
+        array_slice = fp_get_child(context, Fortran2003.Part_Ref)
+        if array_slice is None:
+            name = str(fp_get_child(context, Fortran2003.Name))
+        else:
+            name = str(fp_get_child(array_slice, Fortran2003.Name))
+        return f'Literal value assigned to "{name}" without kind'
+
 
 class ForbidUsage(FortranRule):
     """
     Checks that no attempt is made to use the specific module unless it is in
     one of the excepted modules.
+
+    A number of modules may be forbidden at once, each with its own
+    exceptions, by passing a mapping from module name to exceptions. This
+    examines the source once rather than once per module.
     """
     def __init__(self,
-                 name: str,
+                 name: Union[str, Mapping[str, Sequence[Union[str, Pattern]]]],
                  exceptions: Sequence[Union[str, Pattern]] = ()):
         """
-        :param name: Name of module to forbid.
+        :param name: Name of module to forbid or a mapping from the names of
+                     modules to forbid to their exceptions.
         :param exceptions: names (or name patterns) in which module may be
-                           used.
+                           used. Only given with a single module name.
+        """
+        forbidden: Mapping[str, Sequence[Union[str, Pattern]]]
+        if isinstance(name, str):
+            forbidden = {name: exceptions}
+        elif exceptions:
+            message = "Exceptions are given with each module when " \
+                      "forbidding several"
+            raise StylistException(message)
+        else:
+            forbidden = name
+
+        self._forbidden: Dict[str, List[Pattern]] = {
+            module.lower(): self._combine(module_exceptions)
+            for module, module_exceptions in forbidden.items()
+        }
+
+    @staticmethod
+    def _combine(exceptions: Sequence[Union[str, Pattern]]) -> List[Pattern]:
         """
-        self._forbidden_module = name
-        self._exceptions: List[Pattern] = []
+        Combines exception patterns into as few alternations as possible.
+
+        Patterns are only combined with others sharing their flags. Those
+        which set flags inline or hold groups are kept apart as combining
+        them would change their meaning or fail to compile.
+        """
+        plain_flags = re.compile('').flags
+        by_flags: Dict[int, List[str]] = {}
+        separate: List[Pattern] = []
         for exception in exceptions:
-            if isinstance(exception, Pattern):
-                self._exceptions.append(exception)
+            if not isinstance(exception, Pattern):
+                exception = re.compile(exception)
+            if exception.groups \
+                    or re.compile(exception.pattern).flags != plain_flags:
+                separate.append(exception)
             else:
-                self._exceptions.append(re.compile(exception))
+                by_flags.setdefault(exception.flags,
+                                    []).append(exception.pattern)
+        combined = [re.compile('|'.join(f'(?:{pattern})'
+                                        for pattern in patterns),
+                               flags)
+                    for flags, patterns in by_flags.items()]
+        return combined + separate
+
+    def text_prefilter(self) -> Optional[Tuple[str, ...]]:
+        return tuple(self._forbidden)
 
     def examine_fortran(self, subject: FortranSource) -> List[Issue]:
         issues: List[Issue] = []
-        for module_statement in subject.find_all(Fortran2003.Module_Stmt):
-            in_module = str(module_statement.items[1])
-            for use in subject.find_all(Fortran2003.Use_Stmt,
-                                        module_statement.parent):
-                use_module = str(use.items[2])
-                forbidden = (use_module == self._forbidden_module)
-                for exception_pattern in self._exceptions:
-                    forbidden = (forbidden
-                                 and not exception_pattern.match(in_module))
-                if forbidden:
-                    message = f"Attempt to use forbidden module '{use_module}'"
-                    issues.append(Issue(message, line=use.item.span[0]))
+        for use in subject.get_use_statements() or []:
+            # Only use within modules is policed.
+            if not isinstance(use.unit, Fortran2003.Module):
+                continue
+            exceptions = self._forbidden.get(use.module)
+            if exceptions is None:
+                continue
+            in_module = cast(str, use.unit_name)
+            if any(exception.match(in_module) for exception in exceptions):
+                continue
+            message = f"Attempt to use forbidden module '{use.name}'"
+            issues.append(Issue(message, line=use.line))
         return issues
@@ -7,26 +7,77 @@
 """
 Issues found in the source.
 """
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Optional
+import sys
+from typing import Any, Callable, Optional, Tuple
+
+_SortKey = Tuple[str, int, str]
+
+
+@lru_cache(maxsize=1024)
+def _path_key(filename: Optional[Path]) -> str:
+    """
+    Gets a string which orders filenames as paths are ordered, part by part.
+    Parts are joined by a character which sorts before any that may appear
+    in them. Issues without a file come first.
+
+    The issues of a file usually arrive together so they share the string.
+    """
+    if filename is None:
+        filename = Path('/')
+    return sys.intern('\0'.join(filename.parts))
 
 
 class Issue:
     """
     Holds details pertaining to an issue with the source.
+
+    Issues are ordered by filename, then line number, then description. The
+    key to this ordering is worked out when the issue is created so sorting
+    many issues is cheap. Sort using ``Issue.sort_key`` as the key function
+    rather than by comparing issues pairwise.
     """
+    __slots__ = ('_filename',
+                 '_line',
+                 '_description',
+                 '_rule',
+                 '_content',
+                 '_key')
+
+    sort_key: Callable[['Issue'], _SortKey] = attrgetter('_key')
+
     def __init__(self,
                  description: str,
                  line: Optional[int] = None,
-                 filename: Optional[Path] = None) -> None:
+                 filename: Optional[Path] = None,
+                 rule: Optional[str] = None,
+                 content: Optional[str] = None) -> None:
         """
         :param description: Free-format string describing the issue.
         :param line: Line number where issue found.
         :param filename: File in which issue found.
+        :param rule: Name of the rule which found the issue.
+        :param content: Text of the line on which the issue was found.
         """
         self._filename = filename
         self._line = line
-        self._description = description
+        self._description = sys.intern(description)
+        self._rule = None if rule is None else sys.intern(rule)
+        self._content = content
+        self._key: _SortKey = (_path_key(filename),
+                               line or 0,
+                               self._description)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Only what is needed to build the issue afresh is sent between
+        # processes.
+        return Issue, (self._description,
+                       self._line,
+                       self._filename,
+                       self._rule,
+                       self._content)
 
     def __lt__(self, other: Any):
         """
@@ -37,13 +88,7 @@ class Issue:
         if not isinstance(other, Issue):
             raise ValueError(f"Can't compare Issue with {other._class__}")
 
-        self_key = (self.filename or Path('/'),
-                    self.line or 0,
-                    self.description)
-        other_key = (other.filename or Path('/'),
-                     other.line or 0,
-                     other.description)
-        return self_key < other_key
+        return self._key < other._key
 
     def __str__(self) -> str:
         string = ''
@@ -77,8 +122,36 @@ class Issue:
         """
         return self._description
 
+    @property
+    def rule(self) -> Optional[str]:
+        """
+        Name of the rule which found this issue, if known.
+        """
+        return self._rule
+
+    @property
+    def content(self) -> Optional[str]:
+        """
+        Text of the line on which this issue was found, if known.
+        """
+        return self._content
+
+    def set_content(self, content: str) -> None:
+        """
+        Associates the text of the line on which it was found with this
+        issue.
+        """
+        self._content = content
+
+    def set_rule(self, rule: str) -> None:
+        """
+        Associates the rule which found it with this issue.
+        """
+        self._rule = sys.intern(rule)
+
     def set_filename(self, filename: Path) -> None:
         """
         Associates a filename with this issue.
         """
         self._filename = filename
+        self._key = (_path_key(filename), self._key[1], self._key[2])
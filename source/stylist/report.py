@@ -0,0 +1,176 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Writes out the issues found.
+
+Reporters write issues as they arrive, a file's worth at a time, so the whole
+report is never held in memory.
+"""
+from abc import ABC, abstractmethod
+import json
+from typing import Any, Dict, List, Sequence, TextIO, Type
+from urllib.parse import quote
+
+from stylist import StylistException, __version__
+from stylist.issue import Issue
+
+
+class Reporter(ABC):
+    """
+    Parent for all ways of writing out issues.
+    """
+    def __init__(self, stream: TextIO) -> None:
+        """
+        :param stream: Where the report is written.
+        """
+        self._stream = stream
+
+    def start(self) -> None:
+        """
+        Begins the report, before any issues are known.
+        """
+        pass
+
+    def report(self, issues: Sequence[Issue]) -> None:
+        """
+        Writes out a batch of issues, usually those of a single file.
+
+        Each batch is written at once, to save a trip to the operating system
+        for every issue, and then flushed so it may be seen straight away.
+
+        :param issues: Issues to write.
+        """
+        if not issues:
+            return
+        self._stream.write(''.join(self.format(issue) for issue in issues))
+        self._stream.flush()
+
+    @abstractmethod
+    def format(self, issue: Issue) -> str:
+        """
+        Gets the text of a single issue as it appears in the report.
+        """
+        raise NotImplementedError()
+
+    def finish(self) -> None:
+        """
+        Ends the report, once all issues have been written.
+        """
+        pass
+
+
+class TextReporter(Reporter):
+    """
+    Writes issues as lines of plain text.
+    """
+    def format(self, issue: Issue) -> str:
+        return f'{issue}\n'
+
+
+class JsonLinesReporter(Reporter):
+    """
+    Writes each issue as a JSON object on a line of its own.
+    """
+    def format(self, issue: Issue) -> str:
+        record = {'filename': None if issue.filename is None
+                  else str(issue.filename),
+                  'line': issue.line,
+                  'rule': issue.rule,
+                  'description': issue.description}
+        return json.dumps(record) + '\n'
+
+
+class SarifReporter(Reporter):
+    """
+    Writes issues as a Static Analysis Results Interchange Format (SARIF)
+    log.
+
+    The log is a single JSON document. Its opening is written before any
+    issues and its closing after them all, leaving the results in between to
+    be written as they arrive.
+    """
+    _SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._separator = ''
+
+    def start(self) -> None:
+        driver = {'name': 'Stylist',
+                  'version': __version__,
+                  'informationUri': 'https://github.com/MetOffice/stylist'}
+        opening = json.dumps({'version': '2.1.0',
+                              '$schema': self._SCHEMA,
+                              'runs': [{'tool': {'driver': driver},
+                                        'results': []}]})
+        # Everything after the empty results array is held back until the
+        # end.
+        #
+        self._stream.write(opening[:-len(']}]}')] + '\n')
+        self._stream.flush()
+
+    def format(self, issue: Issue) -> str:
+        result: Dict[str, Any] = {'level': 'error',
+                                  'message': {'text': issue.description}}
+        if issue.rule is not None:
+            result['ruleId'] = issue.rule
+        if issue.filename is not None:
+            if issue.filename.is_absolute():
+                uri = issue.filename.as_uri()
+            else:
+                uri = quote(issue.filename.as_posix())
+            location: Dict[str, Any] = {'artifactLocation': {'uri': uri}}
+            if issue.line:
+                location['region'] = {'startLine': issue.line}
+            result['locations'] = [{'physicalLocation': location}]
+        text = self._separator + json.dumps(result)
+        self._separator = ',\n'
+        return text
+
+    def finish(self) -> None:
+        self._stream.write('\n]}]}\n')
+        self._stream.flush()
+
+
+class ReporterFactory:
+    """
+    Looks up the reporter for a report format.
+    """
+    _reporters: Dict[str, Type[Reporter]] = {
+        'text': TextReporter,
+        'jsonl': JsonLinesReporter,
+        'sarif': SarifReporter
+    }
+
+    @classmethod
+    def add_format(cls, name: str, reporter: Type[Reporter]) -> None:
+        """
+        Adds a report format, or replaces an existing one.
+
+        :param name: Name by which the format is requested.
+        :param reporter: Class which writes reports in the format.
+        """
+        cls._reporters[name] = reporter
+
+    @classmethod
+    def get_formats(cls) -> List[str]:
+        """
+        Gets the names of all known report formats.
+        """
+        return list(cls._reporters.keys())
+
+    @classmethod
+    def create(cls, name: str, stream: TextIO) -> Reporter:
+        """
+        Gets a reporter which writes in a format.
+
+        :param name: Name of the format.
+        :param stream: Where the report is written.
+        """
+        if name not in cls._reporters:
+            message = f"Unrecognised report format \"{name}\""
+            raise StylistException(message)
+        return cls._reporters[name](stream)
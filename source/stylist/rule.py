@@ -8,10 +8,10 @@ None language specific rules.
 """
 from abc import ABC, abstractmethod
 import re
-from typing import List
+from typing import List, Optional, Union
 
 from stylist.issue import Issue
-from stylist.source import SourceText
+from stylist.source import LineTable, SourceText, SourceTree
 
 
 class Rule(ABC):
@@ -29,28 +29,70 @@ class Rule(ABC):
         raise NotImplementedError()
 
 
-class TrailingWhitespace(Rule):
+class LineRule(Rule, ABC):
+    """
+    Abstract parent of rules which consider each line of text in isolation.
+
+    When a style holds several such rules they share a single pass over the
+    lines of a source file. Rules which can work from the statistics held in
+    a line table need not look at the lines at all.
+    """
+    def examine(self, subject: Union[SourceText, SourceTree]) -> List[Issue]:
+        tabulated = self.examine_table(subject.get_line_table())
+        if tabulated is not None:
+            return tabulated
+
+        issues: List[Issue] = []
+        for line_number, line in enumerate(subject.get_lines(), start=1):
+            issue = self.examine_line(line_number, line)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    @abstractmethod
+    def examine_line(self, line_number: int, line: str) -> Optional[Issue]:
+        """
+        Examines a single line of the source text for an issue.
+
+        :param line_number: Position of the line in the source, counting
+                            from one.
+        :param line: Text of the line without its ending.
+        :return: Issue found with the line, if any.
+        """
+        raise NotImplementedError()
+
+    def examine_table(self, table: LineTable) -> Optional[List[Issue]]:
+        """
+        Examines every line of the source text at once using statistics
+        about them.
+
+        Issues must be the same as ``examine_line()`` would find.
+
+        :param table: Statistics about each line.
+        :return: All issues found or None if the rule must look at the text
+                 of each line.
+        """
+        return None
+
+
+class TrailingWhitespace(LineRule):
     """
     Examines the text for white space at the end of lines.
     This includes lines which consist entirely of white space.
     """
     _TRAILING_SPACE_PATTERN = re.compile(r'\s+$')
 
-    def examine(self, subject: SourceText) -> List[Issue]:
-        issues = []
-        text = subject.get_text()
-        line_tally = 0
-        for line in text.splitlines():
-            line_tally += 1
-            match = self._TRAILING_SPACE_PATTERN.search(line)
-            if match:
-                description = 'Found trailing white space'
-                issues.append(Issue(description, line=line_tally))
+    def examine_line(self, line_number: int, line: str) -> Optional[Issue]:
+        if self._TRAILING_SPACE_PATTERN.search(line):
+            return Issue('Found trailing white space', line=line_number)
+        return None
 
-        return issues
+    def examine_table(self, table: LineTable) -> Optional[List[Issue]]:
+        return [Issue('Found trailing white space', line=line_number)
+                for line_number in table.ending_in_whitespace()]
 
 
-class LimitLineLength(Rule):
+class LimitLineLength(LineRule):
     """
     Report instances of lines being too long.
     """
@@ -60,19 +102,22 @@ class LimitLineLength(Rule):
         self._length = length
         self._ignore_leading_whitespace = ignore_leading_whitespace
 
-    def examine(self, subject: SourceText) -> List[Issue]:
-        issues: List[Issue] = []
+    def _description(self) -> str:
+        description = f"Line exceeds {self._length} characters"
+        if self._ignore_leading_whitespace:
+            description += " after leading whitespace"
+        return description
 
-        line_tally = 0
-        line: str
-        for line in subject.get_text().splitlines():
-            line_tally += 1
-            if self._ignore_leading_whitespace:
-                line = line.lstrip()
-            if len(line) > self._length:
-                description = f"Line exceeds {self._length} characters"
-                if self._ignore_leading_whitespace:
-                    description += " after leading whitespace"
-                issues.append(Issue(description, line=line_tally))
+    def examine_line(self, line_number: int, line: str) -> Optional[Issue]:
+        if self._ignore_leading_whitespace:
+            line = line.lstrip()
+        if len(line) > self._length:
+            return Issue(self._description(), line=line_number)
+        return None
 
-        return issues
+    def examine_table(self, table: LineTable) -> Optional[List[Issue]]:
+        description = self._description()
+        return [Issue(description, line=line_number)
+                for line_number
+                in table.longer_than(self._length,
+                                     self._ignore_leading_whitespace)]
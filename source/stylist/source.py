@@ -8,29 +8,59 @@
 Manages source code in various flavours.
 """
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+import itertools
+import operator
 from pathlib import Path
 import re
-from typing import (Generator,
+from types import ModuleType
+from typing import (Any,
+                    Dict,
+                    FrozenSet,
+                    Generator,
                     Iterable,
+                    Iterator,
                     List,
                     Optional,
+                    Sequence,
+                    Set,
                     TextIO,
+                    Tuple,
                     Type,
                     Union)
 
 import fparser.common.readfortran as readfortran  # type: ignore
+from fparser.common.sourceinfo import get_source_info_str  # type: ignore
 import fparser.two.Fortran2003 as Fortran2003  # type: ignore
+import fparser.two.Fortran2008 as Fortran2008  # type: ignore
 from fparser.two.parser import ParserFactory  # type:ignore
+from fparser.two.symbol_table import SYMBOL_TABLES  # type: ignore
 from fparser.two.utils import FparserException  # type: ignore
 
 from stylist import StylistException
 
+# NumPy speeds up some operations but is not required.
+#
+try:
+    import numpy  # type: ignore
+    _numpy: Optional[ModuleType] = numpy
+except ImportError:
+    _numpy = None
+
 
 class SourceText(ABC):
     """
     Handles source code at the text level. Makes use of the decorator pattern
     to perform text level preprocessing.
     """
+    # Lines of the text and statistics about them, worked out on first
+    # request. Held at class level so that implementations need not
+    # initialise them.
+    _lines: Optional[List[str]] = None
+    _line_table: Optional['LineTable'] = None
+
     @abstractmethod
     def get_text(self) -> str:
         """
@@ -38,6 +68,139 @@ class SourceText(ABC):
         """
         raise NotImplementedError()
 
+    def get_lines(self) -> List[str]:
+        """
+        Gets the source file split into lines, without line endings.
+
+        The list is shared so must not be modified.
+        """
+        if self._lines is None:
+            self._lines = self.get_text().splitlines()
+        return self._lines
+
+    def get_line_table(self) -> 'LineTable':
+        """
+        Gets statistics about each line of the source file.
+        """
+        if self._line_table is None:
+            self._line_table = LineTable(self.get_text(), self.get_lines())
+        return self._line_table
+
+    def get_stage_tallies(self) -> List[Tuple[str, int]]:
+        """
+        Gets the number of times each processing stage has actually run.
+
+        :return: Stage names and tallies, the stage nearest the file first.
+        """
+        return []
+
+
+class LineTable:
+    """
+    Holds statistics about each line of a source text in columns.
+
+    Columns are NumPy arrays if NumPy is available, otherwise standard
+    arrays. Either way queries are answered with comparisons over whole
+    columns.
+
+    Lines are numbered from one, as they are in issues.
+    """
+    def __init__(self, text: str, lines: List[str]) -> None:
+        """
+        :param text: Source text.
+        :param lines: The text split into lines, without line endings.
+        """
+        starts = [0]
+        for line in text.splitlines(keepends=True):
+            starts.append(starts[-1] + len(line))
+        del starts[-1]
+        lengths = [len(line) for line in lines]
+        indents = [length - len(line.lstrip())
+                   for line, length in zip(lines, lengths)]
+        trailing = [line[-1:].isspace() for line in lines]
+
+        self._starts = self._column(starts, 'q')
+        self._lengths = self._column(lengths, 'q')
+        self._indents = self._column(indents, 'q')
+        self._trailing = self._column(trailing, 'B')
+
+    @staticmethod
+    def _column(values: List, code: str) -> Any:
+        if _numpy is None:
+            return array(code, values)
+        return _numpy.array(values,
+                            dtype=bool if code == 'B' else _numpy.int64)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def starts(self) -> Sequence[int]:
+        """
+        Offset into the text at which each line starts.
+        """
+        return self._starts
+
+    @property
+    def lengths(self) -> Sequence[int]:
+        """
+        Number of characters in each line, excluding the line ending.
+        """
+        return self._lengths
+
+    @property
+    def indents(self) -> Sequence[int]:
+        """
+        Number of white space characters leading each line.
+        """
+        return self._indents
+
+    @property
+    def trailing_whitespace(self) -> Sequence[bool]:
+        """
+        Whether each line ends with white space. Lines consisting entirely of
+        white space do.
+        """
+        return self._trailing
+
+    @staticmethod
+    def _line_numbers(selection: Any) -> List[int]:
+        if _numpy is None:
+            return [index + 1 for index, chosen in enumerate(selection)
+                    if chosen]
+        return (_numpy.flatnonzero(selection) + 1).tolist()
+
+    def longer_than(self,
+                    length: int,
+                    ignore_leading_whitespace: bool = False) -> List[int]:
+        """
+        Finds lines with more than a given number of characters.
+
+        :param length: Longest acceptable line.
+        :param ignore_leading_whitespace: Leading white space is not counted.
+        :return: Numbers of the lines found.
+        """
+        if _numpy is None:
+            if ignore_leading_whitespace:
+                widths: Iterable[int] = map(operator.sub,
+                                            self._lengths,
+                                            self._indents)
+            else:
+                widths = self._lengths
+            return self._line_numbers(width > length for width in widths)
+
+        if ignore_leading_whitespace:
+            return self._line_numbers(self._lengths - self._indents > length)
+        return self._line_numbers(self._lengths > length)
+
+    def ending_in_whitespace(self) -> List[int]:
+        """
+        Finds lines which end with white space.
+
+        :return: Numbers of the lines found.
+        """
+        return self._line_numbers(self._trailing)
+
 
 class SourceFileReader(SourceText):
     """
@@ -74,12 +237,19 @@ class TextProcessor(SourceText, ABC):
     """
     Preprocessor decorators inherit from this. This is part of the decorator
     pattern.
+
+    Processing is performed the first time the text is requested and the
+    result is kept for subsequent requests. New stages should implement
+    ``process()``. Stages which override ``get_text()`` instead still work
+    but do their own processing on every request.
     """
     def __init__(self, source: SourceText) -> None:
         """
         :param source: The source to be preprocessed.
         """
         self._source = source
+        self._processed: Optional[str] = None
+        self._tally = 0
 
     @staticmethod
     @abstractmethod
@@ -89,6 +259,26 @@ class TextProcessor(SourceText, ABC):
         """
         raise NotImplementedError()
 
+    def process(self, text: str) -> str:
+        """
+        Applies this processing stage to some text. By default the text is
+        passed through unchanged.
+
+        :param text: Output of the previous stage.
+        :return: Processed text.
+        """
+        return text
+
+    def get_text(self) -> str:
+        if self._processed is None:
+            self._processed = self.process(self._source.get_text())
+            self._tally += 1
+        return self._processed
+
+    def get_stage_tallies(self) -> List[Tuple[str, int]]:
+        return self._source.get_stage_tallies() \
+            + [(self.get_name(), self._tally)]
+
 
 class CPreProcessor(TextProcessor):
     """
@@ -105,11 +295,10 @@ class CPreProcessor(TextProcessor):
     def get_name() -> str:
         return "C preprocessor"
 
-    def get_text(self) -> str:
+    def process(self, text: str) -> str:
         """
         :return: Source as text with preprocessor directives removed.
         """
-        text = self._source.get_text()
         text = self._CONDITIONAL_DIRECTIVE_PATTERN.sub(r'\1// \2', text)
         text = self._OTHER_DIRECTIVE_PATTERN.sub(r'\1// \2', text)
         return text
@@ -130,11 +319,10 @@ class FortranPreProcessor(TextProcessor):
     def get_name() -> str:
         return "Fortran preprocessor"
 
-    def get_text(self) -> str:
+    def process(self, text: str) -> str:
         """
         :return: Source as text with preprocessor directives removed.
         """
-        text = self._source.get_text()
         text = self._CONDITIONAL_DIRECTIVE_PATTERN.sub(r'\1! \2', text)
         text = self._OTHER_DIRECTIVE_PATTERN.sub(r'\1! \2', text)
         return text
@@ -150,11 +338,10 @@ class PFUnitProcessor(TextProcessor):
     def get_name() -> str:
         return "pFUnit preprocessor"
 
-    def get_text(self) -> str:
+    def process(self, text: str) -> str:
         """
         :return: Source as text with preprocessor directives removed.
         """
-        text = self._source.get_text()
         text = self._DIRECTIVE_PATTERN.sub(r'\1! \2', text)
         return text
 
@@ -202,29 +389,669 @@ class SourceTree(ABC):
         """
         return self._text.get_text()
 
+    def get_lines(self) -> List[str]:
+        """
+        :return: Source text split into lines.
+        """
+        return self._text.get_lines()
+
+    def get_line_table(self) -> 'LineTable':
+        """
+        :return: Statistics about each line of the source text.
+        """
+        return self._text.get_line_table()
+
+    def get_stage_tallies(self) -> List[Tuple[str, int]]:
+        """
+        Gets the number of times each text processing stage has run.
+        """
+        return self._text.get_stage_tallies()
+
+
+class FortranParserRegistry:
+    """
+    Holds the fparser parser for each Fortran standard.
+
+    Creating a parser sets up fparser's class hierarchy, which is expensive
+    compared to parsing a small file. Parsers are therefore created once and
+    shared by every source file.
+
+    The class hierarchy is global to fparser so only one standard can be in
+    force at a time. Asking for a different standard to the last one causes
+    the hierarchy to be rebuilt.
+    """
+    _parsers: Dict[str, Type[Fortran2003.Program]] = {}
+    _current_standard: Optional[str] = None
+
+    @classmethod
+    def get_parser(cls, std: str = 'f2008') -> Type[Fortran2003.Program]:
+        """
+        Gets the parser for a Fortran standard.
+
+        :param std: Fortran standard as understood by fparser.
+        """
+        if std != cls._current_standard:
+            cls._parsers[std] = ParserFactory().create(std=std)
+            cls._current_standard = std
+        return cls._parsers[std]
+
+
+class FortranNodeIndex:
+    """
+    Records every node of a parse tree, in document order, along with its
+    relationships to the other nodes.
+
+    Once built, questions about the tree may be answered without walking it
+    again. Each node is identified by its position in document order, the
+    root being at position zero.
+    """
+    _CLOSE = object()
+
+    def __init__(self, root: Fortran2003.Base) -> None:
+        """
+        :param root: Top of the tree to index.
+        """
+        self._nodes: List[Fortran2003.Base] = []
+        self._parents: List[int] = []
+        self._depths: List[int] = []
+        # Position one past the last node of each node's subtree.
+        self._ends: List[int] = []
+        # Whether a node is held directly by its parent rather than within
+        # some tuple the parent holds.
+        self._direct: List[bool] = []
+        # Position of the highest ancestor from which the node may be
+        # reached by descending only through blocks and sequences. This is
+        # the descent performed by ``FortranSource.find_all()``.
+        self._reach: List[int] = []
+        # First source line of each node, that of the nearest statement
+        # holding it where the node itself has no position.
+        self._lines: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._by_class: Dict[Type[Fortran2003.Base], List[int]] = {}
+
+        candidates: List[Tuple[object, int, bool]] = [(root, -1, True)]
+        while candidates:
+            candidate, parent, direct = candidates.pop()
+            if isinstance(candidate, Fortran2003.Base):
+                position = len(self._nodes)
+                self._nodes.append(candidate)
+                self._parents.append(parent)
+                self._direct.append(direct)
+                self._ends.append(0)
+                self._positions[id(candidate)] = position
+                self._by_class.setdefault(candidate.__class__,
+                                          []).append(position)
+                item = getattr(candidate, 'item', None)
+                if item is not None:
+                    self._lines.append(item.span[0])
+                elif parent < 0:
+                    self._lines.append(0)
+                else:
+                    self._lines.append(self._lines[parent])
+                if parent < 0:
+                    self._depths.append(0)
+                    self._reach.append(position)
+                else:
+                    self._depths.append(self._depths[parent] + 1)
+                    if direct and isinstance(self._nodes[parent],
+                                             (Fortran2003.BlockBase,
+                                              Fortran2003.SequenceBase)):
+                        self._reach.append(self._reach[parent])
+                    else:
+                        self._reach.append(position)
+                # A marker closes the subtree once all its nodes are seen.
+                candidates.append((self._CLOSE, position, False))
+                candidates.extend((child, position, True)
+                                  for child in reversed(candidate.children))
+            elif isinstance(candidate, (tuple, list)):
+                candidates.extend((child, parent, False)
+                                  for child in reversed(candidate))
+            elif candidate is self._CLOSE:
+                self._ends[parent] = len(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return id(node) in self._positions
+
+    def position(self, node: Fortran2003.Base) -> int:
+        """
+        Gets where a node lies in document order.
+
+        :param node: Node in the indexed tree.
+        """
+        return self._positions[id(node)]
+
+    def node(self, position: int) -> Fortran2003.Base:
+        """
+        Gets the node at a position in document order.
+        """
+        return self._nodes[position]
+
+    def parent(self, node: Fortran2003.Base) -> Optional[Fortran2003.Base]:
+        """
+        Gets the node which holds the given one or None for the root.
+        """
+        parent = self._parents[self.position(node)]
+        return None if parent < 0 else self._nodes[parent]
+
+    def depth(self, node: Fortran2003.Base) -> int:
+        """
+        Gets the number of steps from the root to the given node.
+        """
+        return self._depths[self.position(node)]
+
+    def line(self, node: Fortran2003.Base) -> int:
+        """
+        Gets the first source line of the statement holding a node.
+        """
+        return self._lines[self.position(node)]
+
+    def get_classes(self) -> Iterable[Type[Fortran2003.Base]]:
+        """
+        Gets every class of node present in the tree.
+        """
+        return self._by_class.keys()
+
+    def subtree(self, node: Fortran2003.Base) -> List[Fortran2003.Base]:
+        """
+        Gets a node and all those below it in document order.
+        """
+        start = self.position(node)
+        return self._nodes[start:self._ends[start]]
+
+    def of_classes(self,
+                   classes: Iterable[Type[Fortran2003.Base]]) -> List[int]:
+        """
+        Gets the positions of all nodes of the given classes, in document
+        order.
+
+        Subclasses are not included, only exact matches.
+        """
+        lists = [self._by_class[cls] for cls in classes
+                 if cls in self._by_class]
+        if len(lists) == 1:
+            return lists[0]
+        return list(merge(*lists))
+
+    def find_all(self,
+                 classes: Iterable[Type[Fortran2003.Base]],
+                 root: int) -> Generator[Fortran2003.Base, None, None]:
+        """
+        Gets nodes of the given classes reachable from a root by descending
+        through blocks and sequences. Descent stops at a match.
+
+        :param classes: Exact classes to seek.
+        :param root: Position of the node to start from, included in the
+                     search.
+        """
+        candidates = self.of_classes(classes)
+        end = self._ends[root]
+        skip_until = root
+        for position in candidates[bisect_left(candidates, root):]:
+            if position >= end:
+                break
+            if position < skip_until or self._reach[position] > root:
+                continue
+            yield self._nodes[position]
+            skip_until = self._ends[position]
+
+    def nearest_ancestors(self,
+                          classes: Tuple[Type[Fortran2003.Base], ...],
+                          ancestor_classes: Tuple[Type[Fortran2003.Base],
+                                                  ...]) \
+            -> Generator[Tuple[Fortran2003.Base, Optional[Fortran2003.Base]],
+                         None, None]:
+        """
+        Pairs each node of the given classes with its closest ancestor of
+        the ancestor classes, in document order. Derived classes are
+        included.
+
+        Rather than climbing from each node, the candidate ancestors are
+        merged in document order with the nodes sought. Those whose subtree
+        is still open are held on a stack, so the closest is always on top.
+
+        :param classes: Classes of node sought.
+        :param ancestor_classes: Classes of ancestor to pair them with.
+        :return: Each node with its ancestor or None if it has none.
+        """
+        targets = self.of_classes([cls for cls in self._by_class
+                                   if issubclass(cls, classes)])
+        ancestors = iter(self.of_classes([cls for cls in self._by_class
+                                          if issubclass(cls,
+                                                        ancestor_classes)]))
+        no_more = len(self._nodes)
+        upcoming = next(ancestors, no_more)
+        open_ancestors: List[int] = []
+        for position in targets:
+            while upcoming < position:
+                while open_ancestors \
+                        and self._ends[open_ancestors[-1]] <= upcoming:
+                    open_ancestors.pop()
+                open_ancestors.append(upcoming)
+                upcoming = next(ancestors, no_more)
+            while open_ancestors \
+                    and self._ends[open_ancestors[-1]] <= position:
+                open_ancestors.pop()
+            if open_ancestors:
+                yield self._nodes[position], self._nodes[open_ancestors[-1]]
+            else:
+                yield self._nodes[position], None
+
+    def block_children(self, position: int) -> List[int]:
+        """
+        Gets the positions of the contents of a block or items of a sequence.
+        Other nodes have no such children.
+        """
+        if not isinstance(self._nodes[position], (Fortran2003.BlockBase,
+                                                  Fortran2003.SequenceBase)):
+            return []
+        children: List[int] = []
+        child = position + 1
+        end = self._ends[position]
+        while child < end:
+            if self._direct[child]:
+                children.append(child)
+            child = self._ends[child]
+        return children
+
+
+class FortranLexicalMask:
+    """
+    Classifies every character of Fortran source text as being part of the
+    code, a comment or a string literal.
+
+    The text is held as a series of spans, each recorded by its starting
+    offset and kind. A span runs up to the start of the next.
+    """
+    CODE = 0
+    COMMENT = 1
+    STRING = 2
+
+    # Comments run to the end of the line. Strings run to the matching
+    # delimiter, or the end of the text if there is none, spanning lines if
+    # need be.
+    #
+    _PATTERN = re.compile(r'''!.*|'[^']*'?|"[^"]*"?''')
+
+    def __init__(self, text: str) -> None:
+        """
+        :param text: Source text to classify.
+        """
+        self._length = len(text)
+        self._starts = array('L')
+        self._kinds = array('B')
+        code_start = 0
+        for match in self._PATTERN.finditer(text):
+            start, end = match.span()
+            if start > code_start:
+                self._starts.append(code_start)
+                self._kinds.append(self.CODE)
+            self._starts.append(start)
+            self._kinds.append(self.COMMENT if text[start] == '!'
+                               else self.STRING)
+            code_start = end
+        if code_start < self._length:
+            self._starts.append(code_start)
+            self._kinds.append(self.CODE)
+
+    def kind_at(self, offset: int) -> int:
+        """
+        Gets the kind of text found at an offset.
+
+        :param offset: Position in the text.
+        :return: One of CODE, COMMENT or STRING.
+        """
+        if not 0 <= offset < self._length:
+            raise IndexError(f"Offset {offset} is outside the text")
+        return self._kinds[bisect_right(self._starts, offset) - 1]
+
+    def spans(self, kind: Optional[int] = None) \
+            -> Iterator[Tuple[int, int, int]]:
+        """
+        Gets the spans making up the text, in order.
+
+        :param kind: Only spans of this kind are returned. If unspecified
+                     all spans are.
+        :return: Start offset, end offset and kind of each span.
+        """
+        ends = itertools.chain(itertools.islice(self._starts, 1, None),
+                               (self._length,))
+        for start, end, span_kind in zip(self._starts, ends, self._kinds):
+            if kind is None or span_kind == kind:
+                yield start, end, span_kind
+
+
+class FortranEntity:
+    """
+    Something declared by name in a Fortran declaration statement.
+
+    Everything but the name and initialiser is shared by all the entities
+    of a statement so is held by the declaration.
+    """
+    def __init__(self,
+                 name: str,
+                 initialised: bool,
+                 declaration: 'FortranDeclaration') -> None:
+        """
+        :param name: Name as written in the source.
+        :param initialised: Whether an initial value is given.
+        :param declaration: Statement declaring the entity.
+        """
+        self.name = name
+        self.initialised = initialised
+        self.declaration = declaration
+
+    @property
+    def type(self) -> Optional[str]:
+        return self.declaration.type
+
+    @property
+    def kind(self) -> Optional[str]:
+        return self.declaration.kind
+
+    @property
+    def length(self) -> Optional[str]:
+        return self.declaration.length
+
+    @property
+    def attributes(self) -> FrozenSet[str]:
+        return self.declaration.attributes
+
+    @property
+    def intent(self) -> Optional[str]:
+        return self.declaration.intent
+
+    @property
+    def line(self) -> int:
+        return self.declaration.line
+
+
+class FortranDeclaration:
+    """
+    Describes a statement declaring variables, components or procedures.
+    """
+    _DATA_STATEMENTS = (Fortran2003.Type_Declaration_Stmt,
+                        Fortran2003.Data_Component_Def_Stmt)
+    _COMPONENT_STATEMENTS = (Fortran2003.Data_Component_Def_Stmt,
+                             Fortran2003.Proc_Component_Def_Stmt)
+
+    def __init__(self,
+                 node: Fortran2003.StmtBase,
+                 scope: 'FortranScope',
+                 line: int) -> None:
+        """
+        :param node: Declaration statement from the parse tree.
+        :param scope: Scoping unit in which the declaration appears.
+        :param line: Source line on which the statement starts.
+        """
+        self.node = node
+        self.scope = scope
+        self.line = line
+        self.is_component = isinstance(node, self._COMPONENT_STATEMENTS)
+        self.is_procedure = not isinstance(node, self._DATA_STATEMENTS)
+
+        # Lower case name of the type, "type" or "class" for derived types.
+        # Procedures have no type, instead they may name an interface.
+        #
+        self.type: Optional[str] = None
+        self.interface: Optional[str] = None
+        self.kind: Optional[str] = None
+        self.length: Optional[str] = None
+        type_spec = node.items[0]
+        if self.is_procedure:
+            if type_spec is not None:
+                self.interface = str(type_spec)
+        else:
+            self.type = type_spec.items[0].lower()
+            self._decode_selector(type_spec.items[1])
+
+        # Attributes are recorded by their keyword, in upper case.
+        #
+        attributes: Set[str] = set()
+        self.intent: Optional[str] = None
+        for attribute in self._listed(node.items[1]):
+            keyword = str(attribute).split('(', 1)[0].strip().upper()
+            attributes.add(keyword)
+            if keyword == 'INTENT':
+                self.intent = str(attribute.items[1])
+        self.attributes: FrozenSet[str] = frozenset(attributes)
+
+        self.entities: List[FortranEntity] = []
+        for entity in self._listed(node.items[2]):
+            if isinstance(entity, Fortran2003.Name):
+                self.entities.append(FortranEntity(str(entity), False, self))
+            else:
+                # Entities and components hold their initialiser last, where
+                # procedures hold only a name and initialiser.
+                #
+                self.entities.append(FortranEntity(str(entity.items[0]),
+                                                   entity.items[-1]
+                                                   is not None,
+                                                   self))
+
+    @staticmethod
+    def _listed(node: Optional[Fortran2003.Base]) -> List[Fortran2003.Base]:
+        if node is None:
+            return []
+        if isinstance(node, Fortran2003.SequenceBase):
+            return list(node.items)
+        return [node]
+
+    def _decode_selector(self, selector: Optional[Fortran2003.Base]) -> None:
+        if isinstance(selector, Fortran2003.Kind_Selector):
+            self.kind = str(selector.items[1])
+        elif isinstance(selector, Fortran2003.Length_Selector):
+            length = selector.items[1]
+            if isinstance(length, Fortran2003.Char_Length):
+                length = length.items[1]
+            self.length = str(length)
+        elif isinstance(selector, Fortran2003.Char_Selector):
+            if selector.items[0] is not None:
+                self.length = str(selector.items[0])
+            if selector.items[1] is not None:
+                self.kind = str(selector.items[1])
+
+
+class FortranScope:
+    """
+    Holds the declarations made within a scoping unit.
+    """
+    def __init__(self,
+                 node: Fortran2003.Base,
+                 parent: Optional['FortranScope']) -> None:
+        """
+        :param node: Scoping unit from the parse tree.
+        :param parent: Scope in which this one is found, if any.
+        """
+        self.node = node
+        self.parent = parent
+        self.declarations: List[FortranDeclaration] = []
+        # Entities keyed on their lower case name.
+        self.entities: Dict[str, FortranEntity] = {}
+
+        # Subprograms have a name and may have arguments.
+        #
+        self.statement: Optional[Fortran2003.StmtBase] = None
+        self.name: Optional[str] = None
+        self.dummy_args: List[str] = []
+        for child in getattr(node, 'content', []):
+            if isinstance(child, (Fortran2003.Subroutine_Stmt,
+                                  Fortran2003.Function_Stmt)):
+                self.statement = child
+                self.name = str(child.items[1])
+                if child.items[2] is not None:
+                    self.dummy_args = [str(argument) for argument
+                                       in child.items[2].items]
+                break
+
+    def add(self, declaration: FortranDeclaration) -> None:
+        """
+        Records a declaration made in this scope.
+        """
+        self.declarations.append(declaration)
+        for entity in declaration.entities:
+            self.entities.setdefault(entity.name.lower(), entity)
+
+    def lookup(self, name: str) -> Optional[FortranEntity]:
+        """
+        Gets the entity declared with a name in this scope, ignoring case.
+        """
+        return self.entities.get(name.lower())
+
+    def ancestry(self) -> Iterator['FortranScope']:
+        """
+        Gets this scope followed by each of those enclosing it.
+        """
+        scope: Optional[FortranScope] = self
+        while scope is not None:
+            yield scope
+            scope = scope.parent
+
+
+class FortranSymbolTable:
+    """
+    Gathers the declarations of a source file by the scope they are made in.
+    """
+    _SCOPE_CLASS_NAMES = ('Main_Program', 'Module', 'Submodule',
+                          'Subroutine_Subprogram', 'Function_Subprogram',
+                          'Separate_Module_Subprogram',
+                          'Subroutine_Body', 'Function_Body', 'Block_Data',
+                          'Block_Construct', 'Derived_Type_Def')
+    _DECLARATION_CLASSES = (Fortran2003.Type_Declaration_Stmt,
+                            Fortran2003.Procedure_Declaration_Stmt,
+                            Fortran2003.Data_Component_Def_Stmt,
+                            Fortran2003.Proc_Component_Def_Stmt)
+
+    def __init__(self, index: FortranNodeIndex) -> None:
+        """
+        :param index: Index of the parse tree to gather from.
+        """
+        scope_classes = tuple(getattr(module, name)
+                              for name in self._SCOPE_CLASS_NAMES
+                              for module in (Fortran2003, Fortran2008)
+                              if hasattr(module, name))
+        root = FortranScope(index.node(0), None)
+        self._root = root
+        self._scopes: Dict[int, FortranScope] = {}
+        self._declarations: List[FortranDeclaration] = []
+
+        def enclosing(node: Fortran2003.Base) -> FortranScope:
+            parent = index.parent(node)
+            while parent is not None:
+                if id(parent) in self._scopes:
+                    return self._scopes[id(parent)]
+                parent = index.parent(parent)
+            return root
+
+        classes = [cls for cls in index.get_classes()
+                   if issubclass(cls, scope_classes)
+                   or issubclass(cls, self._DECLARATION_CLASSES)]
+        # Positions are in document order so every scope is seen before
+        # anything within it.
+        #
+        for position in index.of_classes(classes):
+            node = index.node(position)
+            if isinstance(node, scope_classes):
+                self._scopes[id(node)] = FortranScope(node, enclosing(node))
+            else:
+                scope = enclosing(node)
+                declaration = FortranDeclaration(node, scope,
+                                                 index.line(node))
+                scope.add(declaration)
+                self._declarations.append(declaration)
+
+    def get_scope(self, node: Fortran2003.Base) -> Optional[FortranScope]:
+        """
+        Gets the scope of a scoping unit.
+        """
+        return self._scopes.get(id(node))
+
+    def scopes(self) -> List[FortranScope]:
+        """
+        Gets every scoping unit in document order.
+        """
+        return list(self._scopes.values())
+
+    def declarations(self) -> List[FortranDeclaration]:
+        """
+        Gets every declaration in document order.
+        """
+        return self._declarations
+
+
+class FortranUseStatement:
+    """
+    Describes a "use" statement.
+    """
+    def __init__(self,
+                 node: Fortran2003.Use_Stmt,
+                 unit: Fortran2003.Base,
+                 line: int) -> None:
+        """
+        :param node: Use statement from the parse tree.
+        :param unit: Program unit in which the statement appears.
+        :param line: Source line on which the statement starts.
+        """
+        self.node = node
+        self.unit = unit
+        self.line = line
+        self.unit_name: Optional[str] = None
+        opening = getattr(unit, 'content', [None])[0]
+        if isinstance(opening, Fortran2003.StmtBase) \
+                and len(opening.items) > 1 \
+                and isinstance(opening.items[1], Fortran2003.Name):
+            self.unit_name = str(opening.items[1])
+
+        # The module name as written is kept for reporting.
+        #
+        self.name = str(node.items[2])
+        self.module = self.name.lower()
+        self.nature: Optional[str] = None
+        if node.items[0] is not None:
+            self.nature = str(node.items[0]).lower()
+        self.has_only = node.items[4] is not None
+
 
 class FortranSource(SourceTree):
     """
     Holds a Fortran source file as both a text block and parse tree.
     """
+    _STANDARD = 'f2008'
+
+    def __init__(self, text: SourceText) -> None:
+        super().__init__(text)
+        self._parse_attempted = False
+        self._search_text: Optional[str] = None
+        self._search_fixed = False
+        self._lexical_mask: Optional[FortranLexicalMask] = None
+        self._symbol_table: Optional[FortranSymbolTable] = None
+        self._use_statements: Optional[List[FortranUseStatement]] = None
+        self._node_index: Optional[FortranNodeIndex] = None
+
     @staticmethod
     def get_name() -> str:
         return 'Fortran source'
 
     def get_tree(self) -> Optional[Fortran2003.Program]:
         """
-        :return: Program unit object.
+        Parses the source on first request. Failure is remembered as well as
+        success so parsing is only ever attempted once.
+
+        :return: Program unit object or None if the source did not parse.
         """
-        if not self._tree:
+        if not self._parse_attempted:
+            self._parse_attempted = True
             # We don't use the tree directly. Instead we let all the decorators
             # have a go first.
             reader = readfortran.FortranStringReader(self._text.get_text(),
                                                      ignore_comments=False)
-            # Pycharm complains about a type mismatch at this point but MyPy
-            # doesn't.
+            fortran_parser = FortranParserRegistry.get_parser(self._STANDARD)
+            # Scoping information from any previously parsed file must not
+            # leak into this one.
             #
-            fortran_parser: Type[Fortran2003.Program] \
-                = ParserFactory().create(std='f2008')
+            SYMBOL_TABLES.clear()
             try:
                 self._tree: Fortran2003.Program = fortran_parser(reader)
                 self._tree_error = None
@@ -233,9 +1060,98 @@ class FortranSource(SourceTree):
                 self._tree_error = str(ex)
         return self._tree
 
+    def is_unparsable(self) -> bool:
+        """
+        Determines whether the source failed to parse, attempting to parse
+        it if that has not yet been done.
+        """
+        return self.get_tree() is None
+
     def get_tree_error(self) -> Optional[str]:
         return self._tree_error
 
+    def is_parse_attempted(self) -> bool:
+        """
+        Determines whether anything has yet needed the parse tree.
+        """
+        return self._parse_attempted
+
+    # Free form continuation may split a word across lines.
+    _CONTINUATION_PATTERN = re.compile(r'&[ \t]*\n[ \t]*&')
+    # As may fixed form continuation, marked in the sixth column.
+    _FIXED_CONTINUATION_PATTERN = re.compile(r'\n(?: {5}[^ 0\n]|\t[1-9])')
+
+    def mentions(self, words: Iterable[str]) -> bool:
+        """
+        Determines whether any of a number of words appear in the source
+        text. Case is ignored so the words should be given in lower case.
+
+        This is a cheap scan of the text, it does not need the parse tree.
+        Words are found wherever they appear, including in comments and as
+        part of longer words. Blanks are not significant in fixed form source
+        so they are ignored there, both in the text and in the words.
+        """
+        if self._search_text is None:
+            text = self._text.get_text()
+            # The form is decided as the parser would decide it.
+            #
+            self._search_fixed = get_source_info_str(text).is_fixed
+            text = text.lower()
+            if self._search_fixed:
+                text = self._FIXED_CONTINUATION_PATTERN.sub('', text)
+                text = text.replace(' ', '').replace('\t', '')
+            else:
+                text = self._CONTINUATION_PATTERN.sub('', text)
+            self._search_text = text
+        if self._search_fixed:
+            words = [word.replace(' ', '') for word in words]
+        return any(word in self._search_text for word in words)
+
+    def get_symbol_table(self) -> Optional[FortranSymbolTable]:
+        """
+        Gets the declarations made in the source, gathering them on first
+        request.
+
+        :return: Symbol table or None if the source could not be parsed.
+        """
+        if self._symbol_table is None:
+            index = self.get_node_index()
+            if index is None:
+                return None
+            self._symbol_table = FortranSymbolTable(index)
+        return self._symbol_table
+
+    def get_use_statements(self) -> Optional[List[FortranUseStatement]]:
+        """
+        Gets the "use" statements of the source in the order they appear,
+        finding them on first request.
+
+        :return: Use statements or None if the source could not be parsed.
+        """
+        if self._use_statements is None:
+            index = self.get_node_index()
+            if index is None:
+                return None
+            root = index.node(0)
+            statements: List[FortranUseStatement] = []
+            for statement in self.find_all(Fortran2003.Use_Stmt):
+                unit = statement
+                while index.parent(unit) is not root:
+                    unit = index.parent(unit)
+                statements.append(FortranUseStatement(statement, unit,
+                                                      index.line(statement)))
+            self._use_statements = statements
+        return self._use_statements
+
+    def get_lexical_mask(self) -> FortranLexicalMask:
+        """
+        Gets the classification of the source text into code, comments and
+        strings, working it out on first request.
+        """
+        if self._lexical_mask is None:
+            self._lexical_mask = FortranLexicalMask(self._text.get_text())
+        return self._lexical_mask
+
     def get_first_statement(self,
                             root: Optional[Fortran2003.Block] = None) \
             -> Fortran2003.StmtBase:
@@ -267,9 +1183,44 @@ class FortranSource(SourceTree):
         message = f"Block without any statements: {root.tofortran()}"
         raise StylistException(message)
 
+    def get_node_index(self) -> Optional[FortranNodeIndex]:
+        """
+        Gets an index of the parse tree, building it on first request.
+
+        :return: Index or None if the source could not be parsed.
+        """
+        if self._node_index is None:
+            tree = self.get_tree()
+            if tree is None:
+                return None
+            self._node_index = FortranNodeIndex(tree)
+        return self._node_index
+
+    def _index_for(self, root: Fortran2003.Base) -> FortranNodeIndex:
+        """
+        Gets an index which holds the given node.
+
+        Nodes from outside this source's tree are indexed on the spot.
+        """
+        index = self.get_node_index()
+        if index is None or root not in index:
+            index = FortranNodeIndex(root)
+        return index
+
+    def _matching_classes(self,
+                          index: FortranNodeIndex,
+                          sought_class: Type[Fortran2003.Base]) \
+            -> List[Type[Fortran2003.Base]]:
+        """
+        Gets those classes present in the index which match a sought class.
+        """
+        matches = self._matching_class_set(sought_class)
+        return [candidate for candidate in index.get_classes()
+                if candidate in matches]
+
     def path(self,
              path: Union[Iterable, str],
-             root: Optional[Fortran2003.Block] = None) \
+             root: Optional[Iterable[Fortran2003.Base]] = None) \
             -> List[Fortran2003.Base]:
         """
         Gets the tree nodes at the given path.
@@ -278,8 +1229,8 @@ class FortranSource(SourceTree):
 
         :param path: a series of a node names either as a Python list object or
                      a '/' separated string.
-        :param root: Starting point in the parse tree. If unspecified implies
-                     the whole tree.
+        :param root: Nodes from which to start. If unspecified implies the
+                     whole tree.
         :return: Tree nodes found.
 
         .. todo::
@@ -290,51 +1241,42 @@ class FortranSource(SourceTree):
         else:
             path = list(path)
 
-        found: List[Fortran2003.Base] = []
-        if root:
-            next_candidates = root
+        if root is None:
+            index = self.get_node_index()
+            if index is None:
+                return []
+            candidates = index.block_children(0)
         else:
-            tree = self.get_tree()
-            if tree is None:
+            roots = list(root)
+            if not roots:
                 return []
-            else:
-                next_candidates = list(tree.content)
+            index = self._index_for(roots[0])
+            candidates = [index.position(node) for node in roots]
 
-        while path:
-            node_name = path.pop(0)
+        found: List[Fortran2003.Base] = []
+        for step, node_name in enumerate(path):
             node_class = eval('Fortran2003.' + node_name)
-
+            matching = set(self._matching_classes(index, node_class))
+            bottom = step == len(path) - 1
+
+            next_candidates: List[int] = []
+            for position in candidates:
+                candidate = index.node(position)
+                if candidate.__class__ not in matching:
+                    continue
+                if bottom:
+                    found.append(candidate)
+
+                if isinstance(candidate, (Fortran2003.BlockBase,
+                                          Fortran2003.SequenceBase)):
+                    next_candidates.extend(index.block_children(position))
+                elif not isinstance(candidate, (Fortran2003.StmtBase,
+                                                Fortran2003.Comment)):
+                    message = 'Unexpected candidate type: {0}'
+                    raise Exception(
+                        message.format(candidate.__class__.__name__)
+                    )
             candidates = next_candidates
-            next_candidates = []
-            while candidates:
-                candidate = candidates.pop(0)
-                candidate_name = candidate.__class__.__name__
-                node_subclasses = node_class.subclass_names
-                # Only allow comments to be considered if we are looking for
-                # a comment.
-                if not isinstance(node_class, Fortran2003.Comment):
-                    if 'Comment' in node_subclasses:
-                        node_subclasses.remove('Comment')
-
-                if self._ast_match(candidate, node_class):
-                    if not path:  # Bottom of the path
-                        found.append(candidate)
-
-                    if isinstance(candidate,
-                                  Fortran2003.BlockBase):
-                        next_candidates.extend(candidate.content)
-                    elif isinstance(candidate,
-                                    Fortran2003.SequenceBase):
-                        next_candidates.extend(candidate.items)
-                    elif isinstance(candidate,
-                                    Fortran2003.StmtBase):
-                        pass
-                    elif isinstance(candidate,
-                                    Fortran2003.Comment):
-                        pass
-                    else:
-                        message = 'Unexpected candidate type: {0}'
-                        raise Exception(message.format(candidate_name))
         return found
 
     def find_all(self,
@@ -345,6 +1287,7 @@ class FortranSource(SourceTree):
         Gets all instances of the specified parse element below the root.
 
         The search descends the tree but that descent is terminated by a match.
+        Nodes are returned in document order.
 
         :param find_node: Parse tree node class to seek.
         :param root: Point in parse tree to start. If unspecified implies the
@@ -355,45 +1298,97 @@ class FortranSource(SourceTree):
            This functionality might be provided by fparser at some point.
         """
         if root:
-            candidates = [root]
+            index = self._index_for(root)
+            classes = self._matching_classes(index, find_node)
+            yield from index.find_all(classes, index.position(root))
         else:
-            tree = self.get_tree()
-            if tree is None:
+            whole = self.get_node_index()
+            if whole is None:
                 return None
-            else:
-                candidates = list(tree.content)
+            classes = self._matching_classes(whole, find_node)
+            # The whole tree is the content of the program node, not the
+            # program node itself.
+            for node in whole.find_all(classes, 0):
+                if node is not whole.node(0):
+                    yield node
+
+    def walk(self, root: Optional[Fortran2003.Base] = None) \
+            -> Generator[Fortran2003.Base, None, None]:
+        """
+        Visits every node of the parse tree in document order.
 
-        while candidates:
-            candidate = candidates.pop(0)
-            if self._ast_match(candidate, find_node):
-                yield candidate
-            else:  # If we found a thing we don't descend into it
-                if isinstance(candidate, Fortran2003.BlockBase):
-                    candidates.extend(candidate.content)
-                elif isinstance(candidate,
-                                Fortran2003.SequenceBase):
-                    candidates.extend(candidate.items)
-                else:
-                    pass
+        Unlike ``find_all()`` the descent is not stopped by anything, so
+        nodes within statements are visited as well as the statements.
 
-    @staticmethod
-    def _ast_match(candidate: Type[Fortran2003.Base],
-                   sought_class: Type[Fortran2003.Base]) \
-            -> bool:
+        :param root: Point in parse tree to start, included in the result. If
+                     unspecified implies the whole tree.
         """
-        Determines whether a node is a given type or a child thereof.
+        if root is None:
+            whole = self.get_node_index()
+            if whole is None:
+                return
+            yield from whole.subtree(whole.node(0))
+        else:
+            yield from self._index_for(root).subtree(root)
+
+    # Classes which match each sought class, filled in as they are sought.
+    _MATCH_TABLE: Dict[Type[Fortran2003.Base],
+                       FrozenSet[Type[Fortran2003.Base]]] = {}
+    # Every parse tree node class keyed on its name.
+    _CLASSES_BY_NAME: Dict[str, List[Type[Fortran2003.Base]]] = {}
+
+    @classmethod
+    def _matching_class_set(cls, sought_class: Type[Fortran2003.Base]) \
+            -> FrozenSet[Type[Fortran2003.Base]]:
         """
-        if candidate.__class__.__name__ == sought_class.__name__:
-            return True
+        Gets all node classes which are a given class or a child thereof.
+
+        fparser describes its grammar through the names of the classes which
+        may stand in for a class. These names are resolved once and the
+        result kept for subsequent searches.
 
+        Classes are matched by name so a class from one Fortran standard
+        matches its namesakes from the others.
+        """
+        matches = cls._MATCH_TABLE.get(sought_class)
+        if matches is not None:
+            return matches
+
+        if not cls._CLASSES_BY_NAME:
+            descendants = [Fortran2003.Base]
+            for descendant in descendants:
+                cls._CLASSES_BY_NAME.setdefault(descendant.__name__,
+                                                []).append(descendant)
+                descendants.extend(descendant.__subclasses__())
+
+        names = {sought_class.__name__}
         considering = [sought_class]
         for consideration in considering:
-            if candidate.__class__.__name__ == consideration.__name__:
-                return True
-            considering.extend([eval('Fortran2003.' + name)
-                                for name in consideration.subclass_names])
+            for name in getattr(consideration, 'subclass_names', []):
+                if name in names:
+                    continue
+                names.add(name)
+                resolved = getattr(Fortran2003, name, None)
+                if resolved is None:
+                    resolved = getattr(Fortran2008, name, None)
+                if resolved is not None:
+                    considering.append(resolved)
+
+        matches = frozenset(match
+                            for name in names
+                            for match in cls._CLASSES_BY_NAME.get(name, []))
+        cls._MATCH_TABLE[sought_class] = matches
+        return matches
 
-        return False
+    @classmethod
+    def _ast_match(cls,
+                   candidate: Fortran2003.Base,
+                   sought_class: Type[Fortran2003.Base]) \
+            -> bool:
+        """
+        Determines whether a node is a given type or a child thereof.
+        """
+        return candidate.__class__ in cls._matching_class_set(sought_class)
 
     @staticmethod
     def print_tree(root: Fortran2003.Base,
@@ -536,6 +1531,18 @@ class SourceFactory:
         """
         return cls._extension_map.keys()
 
+    @classmethod
+    def get_pipe(cls, extension: str) -> FilePipe:
+        """
+        Gets the chain of source handling classes mapped to an extension.
+
+        :param extension: File extension of interest.
+        """
+        if extension not in cls._extension_map:
+            message = f"Source file extension '{extension}' not in handler map"
+            raise Exception(message)
+        return cls._extension_map[extension]
+
     @classmethod
     def read_file(cls, source_file: Union[TextIO, Path]) -> SourceTree:
         """
@@ -548,14 +1555,24 @@ class SourceFactory:
             filename = source_file
         else:
             filename = Path(source_file.name)
+        chain = cls.get_pipe(filename.suffix[1:])
+        return cls._build(chain, SourceFileReader(source_file))
 
-        extension = filename.suffix[1:]
-        if extension not in cls._extension_map:
-            message = f"Source file extension '{extension}' not in handler map"
-            raise Exception(message)
+    @classmethod
+    def read_text(cls, filename: Path, text: str) -> SourceTree:
+        """
+        Creates a Source object from the text of a file which has already
+        been read.
+
+        :param filename: File the text was read from, used to determine the
+                         source type.
+        :param text: Content of the file.
+        """
+        chain = cls.get_pipe(filename.suffix[1:])
+        return cls._build(chain, SourceStringReader(text))
 
-        chain = cls._extension_map[extension]
-        reader: SourceText = SourceFileReader(source_file)
+    @staticmethod
+    def _build(chain: FilePipe, reader: SourceText) -> SourceTree:
         # Decorate reader
         for handler_class in chain.preprocessors:
             reader = handler_class(reader)
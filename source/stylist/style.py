@@ -8,11 +8,11 @@ Classes relating to styles made up of rules.
 """
 from abc import ABC
 import logging
-from typing import List
+from typing import Dict, List, Tuple
 
 import stylist.fortran
 import stylist.issue
-from stylist.rule import Rule
+from stylist.rule import LineRule, Rule
 import stylist.source
 
 
@@ -22,6 +22,11 @@ class Style(ABC):
     """
     __unnamed_tally = 1
 
+    # Rule to which the issue raised for source which does not parse is
+    # attributed.
+    #
+    UNPARSABLE_RULE = 'Unparsable'
+
     def __init__(self, *rules: Rule) -> None:
         """
         :param rules: Rules which make up this style.
@@ -54,10 +59,105 @@ class Style(ABC):
         """
         logging.getLogger(__name__).info(f"Style: {self.name}")
         issues: List[stylist.issue.Issue] = []
-        for rule in self.__rules:
-            additional_issues = rule.examine(source)
+        rules = self.__rules
+        if isinstance(source, stylist.source.FortranSource):
+            rules = self._prefilter(source)
+            tree_rules = [rule for rule in rules
+                          if isinstance(rule, stylist.fortran.FortranRule)]
+            if tree_rules and source.is_unparsable():
+                issues.extend(self._report_unparsable(source, tree_rules))
+                rules = [rule for rule in rules if rule not in tree_rules]
+        scanned = self._scan_lines(source, rules)
+
+        for index, rule in enumerate(rules):
+            if index in scanned:
+                additional_issues = scanned[index]
+            else:
+                additional_issues = rule.examine(source)
+            rule_name = rule.__class__.__name__
+            for issue in additional_issues:
+                issue.set_rule(rule_name)
             issues.extend(additional_issues)
             result = "Failed" if additional_issues else "Passed"
-            message = f"Rule: {rule.__class__.__name__} - {result}"
+            message = f"Rule: {rule_name} - {result}"
             logging.getLogger(__name__).info(message)
         return issues
+
+    def _prefilter(self, source: stylist.source.FortranSource) -> List[Rule]:
+        """
+        Passes over those Fortran rules which cannot find anything in the
+        source text.
+
+        :param source: Source code to inspect.
+        :return: Rules which must be applied.
+        """
+        rules: List[Rule] = []
+        for rule in self.__rules:
+            if isinstance(rule, stylist.fortran.FortranRule):
+                words = rule.text_prefilter()
+                if words is not None and not source.mentions(words):
+                    message = f"Rule: {rule.__class__.__name__} - Passed " \
+                              f"without parsing"
+                    logging.getLogger(__name__).info(message)
+                    continue
+            rules.append(rule)
+        return rules
+
+    def _report_unparsable(self,
+                           source: stylist.source.FortranSource,
+                           rules: List[stylist.fortran.FortranRule]) \
+            -> List[stylist.issue.Issue]:
+        """
+        Describes the rules which cannot be applied to source which did not
+        parse.
+
+        A single issue covers all such rules.
+
+        :param source: Source code which did not parse.
+        :param rules: Rules which need the parse tree.
+        :return: Issue naming the rules skipped.
+        """
+        skipped = [rule.__class__.__name__ for rule in rules]
+        for name in skipped:
+            message = f"Rule: {name} - Skipped"
+            logging.getLogger(__name__).info(message)
+        description = f"Unable to perform {', '.join(skipped)} " \
+                      f"as source didn't parse: {source.get_tree_error()}"
+        return [stylist.issue.Issue(description, rule=self.UNPARSABLE_RULE)]
+
+    def _scan_lines(self,
+                    source: stylist.source.SourceTree,
+                    rules: List[Rule]) -> Dict[int, List[stylist.issue.Issue]]:
+        """
+        Offers each line of the source to all the line rules in a single
+        pass. Rules which can work from line statistics are given those
+        instead.
+
+        :param source: Source code to inspect.
+        :param rules: Rules being applied.
+        :return: Issues found by each line rule, keyed by its position in the
+                 rules.
+        """
+        line_rules = [(index, rule) for index, rule in enumerate(rules)
+                      if isinstance(rule, LineRule)]
+        if not line_rules:
+            return {}
+
+        issues: Dict[int, List[stylist.issue.Issue]] = {}
+        remaining: List[Tuple[int, LineRule]] = []
+        for index, rule in line_rules:
+            tabulated = rule.examine_table(source.get_line_table())
+            if tabulated is None:
+                issues[index] = []
+                remaining.append((index, rule))
+            else:
+                issues[index] = tabulated
+        if not remaining:
+            return issues
+
+        for line_number, line in enumerate(source.get_lines(), start=1):
+            for index, rule in remaining:
+                issue = rule.examine_line(line_number, line)
+                if issue is not None:
+                    issues[index].append(issue)
+        return issues
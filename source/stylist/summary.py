@@ -0,0 +1,100 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Counts of issues, for when the issues themselves are not wanted.
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Counter as CounterType, Dict, Mapping, Sequence, TextIO
+
+from stylist.issue import Issue
+
+
+class IssueSummary:
+    """
+    Running counts of issues found by each rule in each file.
+
+    Totals by rule, by file and by the directory holding the file are worked
+    out from these once checking is done.
+    """
+    UNKNOWN_RULE = 'Unknown'
+
+    def __init__(self) -> None:
+        self._files: Dict[Path, CounterType[str]] = {}
+
+    @classmethod
+    def count(cls, issues: Sequence[Issue]) -> CounterType[str]:
+        """
+        Counts the issues found by each rule.
+
+        :param issues: Issues of interest.
+        """
+        return Counter(issue.rule or cls.UNKNOWN_RULE for issue in issues)
+
+    def add(self, filename: Path, counts: Mapping[str, int]) -> None:
+        """
+        Adds the counts for a file.
+
+        Files without issues are not held.
+
+        :param filename: File in which the issues were found.
+        :param counts: Number of issues found by each rule.
+        """
+        if not counts:
+            return
+        self._files.setdefault(filename, Counter()).update(counts)
+
+    @property
+    def total(self) -> int:
+        """
+        Number of issues found altogether.
+        """
+        return sum(sum(counts.values()) for counts in self._files.values())
+
+    def by_rule(self) -> Dict[str, int]:
+        """
+        Gets the number of issues found by each rule.
+        """
+        result: CounterType[str] = Counter()
+        for counts in self._files.values():
+            result.update(counts)
+        return dict(result)
+
+    def by_file(self) -> Dict[Path, int]:
+        """
+        Gets the number of issues found in each file.
+        """
+        return {filename: sum(counts.values())
+                for filename, counts in self._files.items()}
+
+    def by_directory(self) -> Dict[Path, int]:
+        """
+        Gets the number of issues found in the files directly within each
+        directory.
+        """
+        result: CounterType[Path] = Counter()
+        for filename, counts in self._files.items():
+            result[filename.parent] += sum(counts.values())
+        return dict(result)
+
+    def write(self, stream: TextIO) -> None:
+        """
+        Writes out the totals, each group in name order.
+
+        :param stream: Where the totals are written.
+        """
+        lines = ['Issues by rule:']
+        lines.extend(f'  {rule}: {count}'
+                     for rule, count in sorted(self.by_rule().items()))
+        lines.append('Issues by directory:')
+        lines.extend(f'  {directory}: {count}'
+                     for directory, count
+                     in sorted(self.by_directory().items()))
+        lines.append('Issues by file:')
+        lines.extend(f'  {filename}: {count}'
+                     for filename, count in sorted(self.by_file().items()))
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
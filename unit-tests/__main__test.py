@@ -8,13 +8,20 @@
 Tests the reporting of error conditions.
 """
 
+from argparse import ArgumentTypeError
+import json
+from os import cpu_count
 from pathlib import Path
-from pytest import raises, fixture
+from typing import Any, Callable, List
+
+from pytest import MonkeyPatch, raises, fixture
 
 from stylist import StylistException
-from stylist.__main__ import perform, __configure
+from stylist.__main__ import perform, __configure, __jobs
 import stylist.__main__ as maintest
 from stylist.configuration import Configuration
+from stylist.rule import TrailingWhitespace
+from stylist.source import FilePipe, PlainText, SourceFactory
 from stylist.style import Style
 
 
@@ -43,6 +50,154 @@ def test_missing_style(tmp_path: Path):
            == 'Style "missing" is not defined by the configuration.'
 
 
+def test_jobs():
+    """
+    Checks the interpretation of the number of jobs requested.
+    """
+    assert __jobs('3') == 3
+    assert __jobs('auto') == (cpu_count() or 1)
+    for bad in ('0', '-2', 'many'):
+        with raises(ArgumentTypeError):
+            _ = __jobs(bad)
+
+
+@fixture
+def check_trailing(monkeypatch: MonkeyPatch) -> Callable[..., int]:
+    """
+    Gets a function which runs stylist over files with the extension 'txt',
+    looking for trailing white space.
+
+    Each run starts from the default extension mappings and any it adds are
+    forgotten once the test is over.
+    """
+    default_map = dict(SourceFactory._extension_map)
+
+    def check(source: List[Path], **kwargs: Any) -> int:
+        monkeypatch.setattr(SourceFactory, '_extension_map',
+                            dict(default_map))
+        configuration = Configuration()
+        configuration.add_style('trailing', Style(TrailingWhitespace()))
+        configuration.add_pipe('txt', FilePipe(PlainText))
+        return perform(configuration, source, [], [], verbose=False,
+                       **kwargs)
+
+    return check
+
+
+def test_parallel_perform(tmp_path: Path, capsys, check_trailing):
+    """
+    Checks that spreading the work across processes reports the same issues.
+    """
+    for index in range(4):
+        (tmp_path / f'foo{index}.txt').write_text(f"foo{index} \n")
+    serial = check_trailing([tmp_path])
+    serial_output = capsys.readouterr()
+    assert serial == 4
+    assert len(serial_output.err.splitlines()) == 4
+
+    parallel = check_trailing([tmp_path], jobs=2)
+    assert parallel == serial
+    assert capsys.readouterr() == serial_output
+
+
+def test_report_format(tmp_path: Path, capsys, check_trailing):
+    """
+    Checks that issues are written in the format requested, machine readable
+    formats going to standard output with commentary on standard error.
+    """
+    (tmp_path / 'foo.txt').write_text("foo \n")
+    expected = [{'filename': str(tmp_path / 'foo.txt'),
+                 'line': 1,
+                 'rule': 'TrailingWhitespace',
+                 'description': 'Found trailing white space'}]
+    tally = check_trailing([tmp_path], report_format='jsonl')
+    assert tally == 1
+    captured = capsys.readouterr()
+    assert [json.loads(line) for line in captured.out.splitlines()] \
+        == expected
+    assert captured.err == "Found 1 issue\n"
+
+    with raises(StylistException):
+        _ = check_trailing([tmp_path], report_format='teapot')
+
+
+def test_output(tmp_path: Path, capsys, check_trailing):
+    """
+    Checks that issues may be written to a file.
+    """
+    (tmp_path / 'foo.txt').write_text("foo \n")
+    report = tmp_path / 'report.jsonl'
+    tally = check_trailing([tmp_path / 'foo.txt'], report_format='jsonl',
+                           output=report)
+    assert tally == 1
+    assert [json.loads(line) for line in report.read_text().splitlines()] \
+        == [{'filename': str(tmp_path / 'foo.txt'),
+             'line': 1,
+             'rule': 'TrailingWhitespace',
+             'description': 'Found trailing white space'}]
+    assert capsys.readouterr() == ('Found 1 issue\n', '')
+
+    tally = check_trailing([tmp_path / 'foo.txt'], output=report)
+    assert report.read_text() \
+        == f"{tmp_path / 'foo.txt'}: 1: Found trailing white space\n"
+
+
+def test_baseline(tmp_path: Path, capsys, monkeypatch, check_trailing):
+    """
+    Checks that a baseline may be written and then used to quieten known
+    issues.
+    """
+    source = tmp_path / 'foo.txt'
+    source.write_text("foo \n")
+    baseline = tmp_path / 'known'
+
+    with raises(StylistException):
+        _ = check_trailing([source], write_baseline=True)
+
+    tally = check_trailing([source], baseline=baseline, write_baseline=True)
+    assert tally == 0
+    assert capsys.readouterr().out \
+        == f"Wrote 1 issue to baseline {baseline}\n"
+
+    tally = check_trailing([source], baseline=baseline)
+    assert tally == 0
+    assert capsys.readouterr().err == ''
+
+    # Files are recognised however they are named.
+    #
+    monkeypatch.chdir(tmp_path)
+    tally = check_trailing([Path('./foo.txt')], baseline=Path('known'))
+    assert tally == 0
+
+    source.write_text("bar \nfoo \n")
+    tally = check_trailing([source], baseline=baseline)
+    assert tally == 1
+    assert capsys.readouterr().err \
+        == f"{source}: 1: Found trailing white space\n"
+
+
+def test_summary(tmp_path: Path, capsys, check_trailing):
+    """
+    Checks that a summary reports counts rather than issues.
+    """
+    source = tmp_path / 'foo.txt'
+    source.write_text("foo \nbar \n")
+
+    with raises(StylistException):
+        _ = check_trailing([source], report_format='jsonl', summary=True)
+
+    tally = check_trailing([source], summary=True)
+    assert tally == 2
+    captured = capsys.readouterr()
+    assert captured.err.splitlines() == ['Issues by rule:',
+                                         '  TrailingWhitespace: 2',
+                                         'Issues by directory:',
+                                         f'  {tmp_path}: 2',
+                                         'Issues by file:',
+                                         f'  {source}: 2']
+    assert captured.out == "Found 2 issues\n"
+
+
 @fixture(scope="session")
 def site_config(tmp_path_factory):
     site = tmp_path_factory.mktemp("data") / "site.py"
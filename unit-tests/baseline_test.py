@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Ensures the 'baseline' module functions as expected.
+"""
+from pathlib import Path
+from typing import List
+
+from pytest import MonkeyPatch, raises
+
+from stylist import StylistException
+from stylist.baseline import Baseline
+from stylist.issue import Issue
+
+
+def _issues(filename: Path) -> List[Issue]:
+    return [Issue('Found trailing white space', line=2, filename=filename,
+                  rule='TrailingWhitespace', content='  x = 1 '),
+            Issue('Line exceeds 80 characters', line=3, filename=filename,
+                  rule='LimitLineLength', content='  y = 2')]
+
+
+class TestBaseline:
+    """
+    Checks the recording and recognition of known issues.
+    """
+    def test_fingerprint(self, tmp_path: Path) -> None:
+        """
+        Checks that moving a line leaves its fingerprint alone while
+        changing it, or what was found, does not.
+        """
+        unit_under_test = Baseline(tmp_path)
+        filename = tmp_path / 'teapot.f90'
+        fingerprint = unit_under_test.fingerprint(
+            Issue('Beef', line=1, filename=filename, rule='Cheese',
+                  content='  x  =  1')
+        )
+        assert unit_under_test.fingerprint(
+            Issue('Beef', line=3, filename=filename, rule='Cheese',
+                  content='x = 1 ')
+        ) == fingerprint
+        assert unit_under_test.fingerprint(
+            Issue('Beef', line=1, filename=filename, rule='Cheese',
+                  content='x = 2')
+        ) != fingerprint
+        assert unit_under_test.fingerprint(
+            Issue('Beef', line=1, filename=filename, rule='Pie',
+                  content='x = 1')
+        ) != fingerprint
+        assert unit_under_test.fingerprint(
+            Issue('Beef', line=1, filename=tmp_path / 'kettle.f90',
+                  rule='Cheese', content='x = 1')
+        ) != fingerprint
+
+    def test_canonical_path(self, tmp_path: Path,
+                            monkeypatch: MonkeyPatch) -> None:
+        """
+        Checks that a file has the same fingerprint however it is named.
+        """
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'src').mkdir()
+
+        def fingerprint(baseline: Baseline, filename: Path) -> int:
+            return baseline.fingerprint(Issue('Beef', line=1,
+                                              filename=filename,
+                                              rule='Cheese',
+                                              content='x = 1'))
+
+        expected = fingerprint(Baseline(tmp_path), Path('src/teapot.f90'))
+        for filename in [Path('./src/teapot.f90'),
+                         Path('src/../src/teapot.f90'),
+                         tmp_path / 'src' / 'teapot.f90']:
+            assert fingerprint(Baseline(tmp_path), filename) == expected
+
+        monkeypatch.chdir(tmp_path / 'src')
+        assert fingerprint(Baseline(Path('..')), Path('teapot.f90')) \
+            == expected
+
+    def test_filter(self, tmp_path: Path) -> None:
+        """
+        Checks that known issues are left out, even once lines have been
+        added above them.
+        """
+        filename = tmp_path / 'teapot.f90'
+        unit_under_test = Baseline(tmp_path)
+        unit_under_test.add(_issues(filename)[:1])
+        assert len(unit_under_test) == 1
+
+        moved = [Issue(issue.description, line=(issue.line or 0) + 1,
+                       filename=filename, rule=issue.rule,
+                       content=issue.content)
+                 for issue in _issues(filename)]
+        assert unit_under_test.filter(moved) == moved[1:]
+        assert Baseline(tmp_path).filter(moved) == moved
+
+    def test_repeated(self, tmp_path: Path) -> None:
+        """
+        Checks that only as many identical issues are left out as are known.
+        """
+        filename = tmp_path / 'teapot.f90'
+
+        def blank(line: int) -> Issue:
+            return Issue('Found trailing white space', line=line,
+                         filename=filename, rule='TrailingWhitespace',
+                         content='   ')
+
+        unit_under_test = Baseline(tmp_path)
+        unit_under_test.add([blank(2), blank(5)])
+        assert len(unit_under_test) == 2
+
+        issues = [blank(2), blank(4), blank(7)]
+        assert unit_under_test.filter(issues) == issues[2:]
+        assert unit_under_test.filter(issues[:2]) == []
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """
+        Checks that a saved baseline loads unchanged, taking paths relative
+        to where it is kept.
+        """
+        filename = tmp_path / 'teapot.f90'
+        baseline = Baseline(tmp_path)
+        baseline.add(_issues(filename) + _issues(filename)[:1])
+        baseline.save(tmp_path / 'baseline')
+
+        unit_under_test = Baseline.load(tmp_path / 'baseline')
+        assert len(unit_under_test) == 3
+        for issue in _issues(filename):
+            assert baseline.fingerprint(issue) in unit_under_test
+        issues = _issues(filename) * 2
+        assert unit_under_test.filter(issues) == issues[3:]
+
+    def test_bad_file(self, tmp_path: Path) -> None:
+        """
+        Checks that anything other than a baseline is rejected.
+        """
+        with raises(StylistException):
+            _ = Baseline.load(tmp_path / 'missing')
+
+        (tmp_path / 'teapot').write_text('Not a baseline')
+        with raises(StylistException):
+            _ = Baseline.load(tmp_path / 'teapot')
+
+        (tmp_path / 'short').write_bytes(b'stylist baseline 2\n1234')
+        with raises(StylistException):
+            _ = Baseline.load(tmp_path / 'short')
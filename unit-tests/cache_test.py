@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Ensures the result cache functions as expected.
+"""
+from pathlib import Path
+from re import IGNORECASE, compile as re_compile
+from typing import List
+
+import fparser  # type: ignore
+from pytest import MonkeyPatch
+
+import stylist
+from stylist.cache import ResultCache
+from stylist.engine import CheckEngine
+from stylist.fortran import ForbidUsage
+from stylist.issue import Issue
+from stylist.rule import LimitLineLength
+from stylist.source import (FilePipe,
+                            FortranPreProcessor,
+                            FortranSource,
+                            SourceTree)
+from stylist.style import Style
+
+
+class TestResultCache:
+    """
+    Checks the storage and keying of results.
+    """
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """
+        Checks that stored issues are returned unchanged.
+        """
+        unit_under_test = ResultCache(tmp_path, [Style(LimitLineLength())])
+        key = unit_under_test.key(b'content', FilePipe(FortranSource))
+        assert unit_under_test.get(key) is None
+
+        unit_under_test.put(key, [Issue('Beef', line=3), Issue('Cheese')])
+        assert [str(issue) for issue in unit_under_test.get(key) or []] \
+            == ['3: Beef', 'Cheese']
+
+        unit_under_test.put(key, [Issue('Beef', line=3, rule='Pie')])
+        assert [issue.rule for issue in unit_under_test.get(key) or []] \
+            == ['Pie']
+
+    def test_corrupt_entry(self, tmp_path: Path) -> None:
+        """
+        Checks that a damaged entry is treated as missing.
+        """
+        unit_under_test = ResultCache(tmp_path, [])
+        key = unit_under_test.key(b'content', FilePipe(FortranSource))
+        unit_under_test.put(key, [])
+        (tmp_path / key[:2] / key).write_text('{"issues": [')
+        assert unit_under_test.get(key) is None
+
+    def test_key(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Checks that anything which could change the result changes the key.
+        """
+        def key(styles: List[Style],
+                content: bytes = b'content',
+                pipe: FilePipe = FilePipe(FortranSource)) -> str:
+            return ResultCache(Path(), styles).key(content, pipe)
+
+        baseline = key([Style(LimitLineLength(80))])
+        assert key([Style(LimitLineLength(80))]) == baseline
+        assert key([Style(LimitLineLength(80))], b'other') != baseline
+        assert key([Style(LimitLineLength(80))],
+                   pipe=FilePipe(FortranSource, FortranPreProcessor)) \
+            != baseline
+        assert key([Style(LimitLineLength(81))]) != baseline
+        assert key([Style(LimitLineLength(80),
+                          LimitLineLength(80))]) != baseline
+        assert key([Style(ForbidUsage('mpi', ['beef']))]) \
+            != key([Style(ForbidUsage('mpi', ['cheese']))])
+        assert key([Style(ForbidUsage('mpi', [re_compile('beef')]))]) \
+            != key([Style(ForbidUsage('mpi',
+                                      [re_compile('beef', IGNORECASE)]))])
+
+        monkeypatch.setattr(fparser, '__version__', 'different')
+        assert key([Style(LimitLineLength(80))]) != baseline
+        monkeypatch.undo()
+        assert key([Style(LimitLineLength(80))]) == baseline
+
+        monkeypatch.setattr(stylist, '__version__', 'different')
+        assert key([Style(LimitLineLength(80))]) != baseline
+
+
+class _StyleHarness(Style):
+    def __init__(self) -> None:
+        super().__init__(LimitLineLength(10))
+        self.seen = 0
+
+    def check(self, program: SourceTree) -> List[Issue]:
+        self.seen += 1
+        return super().check(program)
+
+
+def test_engine_cache(tmp_path: Path) -> None:
+    """
+    Checks that an unchanged file is not examined a second time.
+    """
+    source_file = tmp_path / 'source.f90'
+    source_file.write_text('module teapot\nend module teapot\n')
+    cache_dir = tmp_path / 'cache'
+
+    style = _StyleHarness()
+    first = CheckEngine([style], cache_dir).check(source_file)
+    assert style.seen == 1
+    second = CheckEngine([style], cache_dir).check(source_file)
+    assert style.seen == 1
+    assert [str(issue) for issue in second] \
+        == [str(issue) for issue in first] \
+        == [f'{source_file}: 1: Line exceeds 10 characters',
+            f'{source_file}: 2: Line exceeds 10 characters']
+
+    source_file.write_text('module pot\nend module pot\n')
+    third = CheckEngine([style], cache_dir).check(source_file)
+    assert style.seen == 2
+    assert [str(issue) for issue in third] \
+        == [f'{source_file}: 2: Line exceeds 10 characters']
@@ -0,0 +1,93 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Ensures the 'discovery' module functions as expected.
+"""
+import os
+from pathlib import Path
+from typing import List
+
+import pytest  # type: ignore
+
+from stylist.discovery import SourceDiscovery
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """
+    Creates a small directory tree holding source and other files.
+    """
+    for name in ['zeta.f90', 'alpha.f90', 'notes.txt',
+                 'lib/one.f90', 'lib/one.o', 'lib/deep/two.F90',
+                 'build/generated.f90', '.git/hooks/hook.f90',
+                 'test/test_thing.f90', 'test/helper.f90']:
+        filename = tmp_path / name
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text('')
+    return tmp_path
+
+
+def _relative(paths: List[Path], root: Path) -> List[str]:
+    return [os.path.relpath(path, root) for path in paths]
+
+
+class TestSourceDiscovery:
+    """
+    Checks the search for source files.
+    """
+    def test_discover(self, tree: Path) -> None:
+        """
+        Checks that every source file is found, breadth first in name order.
+        """
+        unit_under_test = SourceDiscovery(['f90', 'F90'])
+        result = list(unit_under_test.discover([tree]))
+        assert _relative(result, tree) \
+            == ['alpha.f90', 'zeta.f90',
+                'build/generated.f90', 'lib/one.f90',
+                'test/helper.f90', 'test/test_thing.f90',
+                '.git/hooks/hook.f90', 'lib/deep/two.F90']
+
+    def test_explicit_files(self, tree: Path) -> None:
+        """
+        Checks that files named explicitly are examined whatever they are
+        called, ahead of those found in directories.
+        """
+        unit_under_test = SourceDiscovery(['f90'], exclude=['*.txt'])
+        result = list(unit_under_test.discover([tree / 'lib',
+                                                tree / 'notes.txt']))
+        assert _relative(result, tree) == ['notes.txt', 'lib/one.f90']
+
+    def test_exclude(self, tree: Path) -> None:
+        """
+        Checks that excluded directories are not descended and excluded
+        files are ignored.
+        """
+        unit_under_test = SourceDiscovery(['f90', 'F90'],
+                                          exclude=['.git', 'build',
+                                                   'lib/deep', 'zeta.*'])
+        result = list(unit_under_test.discover([tree]))
+        assert _relative(result, tree) \
+            == ['alpha.f90', 'lib/one.f90',
+                'test/helper.f90', 'test/test_thing.f90']
+
+    def test_include(self, tree: Path) -> None:
+        """
+        Checks that only included files are examined.
+        """
+        unit_under_test = SourceDiscovery(['f90', 'F90'],
+                                          include=['test_*', 'lib/*'])
+        result = list(unit_under_test.discover([tree]))
+        assert _relative(result, tree) \
+            == ['lib/one.f90', 'test/test_thing.f90', 'lib/deep/two.F90']
+
+    def test_parallel(self, tree: Path) -> None:
+        """
+        Checks that searching directories concurrently finds the same files
+        in the same order.
+        """
+        expected = list(SourceDiscovery(['f90', 'F90']).discover([tree]))
+        unit_under_test = SourceDiscovery(['f90', 'F90'], jobs=4)
+        assert list(unit_under_test.discover([tree])) == expected
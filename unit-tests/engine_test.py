@@ -9,17 +9,23 @@ Ensures the 'engine' module functions as expected.
 """
 from pathlib import Path
 import tempfile
-from typing import List
+from typing import Callable, Iterator, List
 
-from stylist.engine import CheckEngine
+from pytest import MonkeyPatch, raises
+
+from stylist import StylistException
+from stylist.baseline import Baseline
+from stylist.engine import CheckEngine, ParallelCheckEngine
+from stylist.fortran import LabelledDoExit
 from stylist.issue import Issue
+from stylist.rule import Rule, TrailingWhitespace
 from stylist.source import SourceTree
 from stylist.style import Style
 
 
 class _StyleHarness(Style):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, *rules: Rule) -> None:
+        super().__init__(*rules)
         self.seen: List[SourceTree] = []
 
     def check(self, program: SourceTree) -> List[Issue]:
@@ -27,6 +33,62 @@ class _StyleHarness(Style):
         return super(_StyleHarness, self).check(program)
 
 
+def _module(index: int) -> str:
+    """
+    Gets a module with trailing white space on its first line.
+    """
+    return f'module teapot_{index} \nend module teapot_{index}\n'
+
+
+def _program(index: int) -> str:
+    """
+    Gets a program holding an unlabelled exit on its fourth line.
+    """
+    return f'program teapot_{index}\n  do\n    exit\n  end do\n' \
+           f'end program teapot_{index}\n'
+
+
+def _clean(index: int) -> str:
+    """
+    Gets a program with nothing wrong with it.
+    """
+    return f'program teapot_{index}\nend program teapot_{index}\n'
+
+
+def _sources(directory: Path,
+             count: int,
+             text: Callable[[int], str] = _module) -> List[Path]:
+    """
+    Writes a number of source files.
+
+    :param directory: Where the files are written.
+    :param count: Number of files.
+    :param text: Gets the content of a file from its number.
+    :return: Files written, in number order.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    filenames: List[Path] = []
+    for index in range(count):
+        filename = directory / f'source_{index}.f90'
+        filename.write_text(text(index))
+        filenames.append(filename)
+    return filenames
+
+
+class _Presenter:
+    """
+    Hands out files one at a time, noting which have been handed out.
+    """
+    def __init__(self, filenames: List[Path]) -> None:
+        self._filenames = filenames
+        self.presented: List[Path] = []
+
+    def __iter__(self) -> Iterator[Path]:
+        for filename in self._filenames:
+            self.presented.append(filename)
+            yield filename
+
+
 def test_all_styles() -> None:
     """
     Checks the rules for each registered style see the checked program.
@@ -43,3 +105,159 @@ def test_all_styles() -> None:
             == ['module teapot\nend module teapot\n\n']
         assert [program.get_text() for program in styles[1].seen] \
             == ['module teapot\nend module teapot\n\n']
+
+
+def test_parallel_matches_serial(tmp_path: Path) -> None:
+    """
+    Checks the parallel engine reports exactly what the serial one does.
+    """
+    filenames = _sources(tmp_path, 6,
+                         lambda index: _module(index).rstrip('\n')
+                         + ' ' * index + '\n')
+    styles = [Style(TrailingWhitespace())]
+
+    expected = [str(issue)
+                for issue in CheckEngine(styles).check_all(filenames)]
+    assert len(expected) == 11
+
+    unit_under_test = ParallelCheckEngine(styles, 3)
+    assert [str(issue) for issue in unit_under_test.check_all(filenames)] \
+        == expected
+
+
+def test_parallel_jobs() -> None:
+    """
+    Checks a parallel engine needs at least one job.
+    """
+    with raises(StylistException):
+        _ = ParallelCheckEngine([], 0)
+
+
+def test_parses_avoided(tmp_path: Path) -> None:
+    """
+    Checks that files which no rule can find fault with are not parsed.
+    """
+    filenames = _sources(tmp_path, 4,
+                         lambda index: _program(index) if index % 2
+                         else _clean(index))
+    styles = [Style(LabelledDoExit())]
+
+    serial = CheckEngine(styles)
+    expected = [str(issue) for issue in serial.check_all(filenames)]
+    assert len(expected) == 2
+    assert serial.parses_avoided == 2
+
+    parallel = ParallelCheckEngine(styles, 2)
+    assert [str(issue) for issue in parallel.check_all(filenames)] \
+        == expected
+    assert parallel.parses_avoided == 2
+
+
+def test_check_each(tmp_path: Path) -> None:
+    """
+    Checks that each file's issues are handed back as soon as the file is
+    done, before later files are looked at.
+    """
+    filenames = _sources(tmp_path, 3)
+    presenter = _Presenter(filenames)
+
+    style = _StyleHarness(TrailingWhitespace())
+    unit_under_test = CheckEngine([style])
+    batches = unit_under_test.check_each(presenter)
+    first = next(batches)
+    assert [issue.filename for issue in first] == [filenames[0]]
+    assert presenter.presented == filenames[:1]
+    assert len(style.seen) == 1
+
+    assert [[str(issue) for issue in batch] for batch in batches] \
+        == [[f'{filename}: 1: Found trailing white space']
+            for filename in filenames[1:]]
+
+
+def test_baseline(tmp_path: Path) -> None:
+    """
+    Checks that issues in the baseline are not reported.
+    """
+    filenames = _sources(tmp_path, 3)
+    styles = [Style(TrailingWhitespace())]
+    found = CheckEngine(styles, capture_content=True) \
+        .check_all(filenames[:2])
+    assert [issue.content for issue in found] \
+        == ['module teapot_0 ', 'module teapot_1 ']
+    baseline = Baseline(tmp_path)
+    baseline.add(found)
+    filenames[1].write_text('module teapot_1 \nend module teapot_1 \n')
+
+    expected = [f'{filenames[1]}: 2: Found trailing white space',
+                f'{filenames[2]}: 1: Found trailing white space']
+    serial = CheckEngine(styles, baseline=baseline)
+    assert [str(issue) for issue in serial.check_all(filenames)] \
+        == expected
+    assert serial.suppressed == 2
+
+    parallel = ParallelCheckEngine(styles, 2, baseline=baseline)
+    assert [str(issue) for issue in parallel.check_all(filenames)] \
+        == expected
+    assert parallel.suppressed == 2
+
+
+def test_capture_content(tmp_path: Path) -> None:
+    """
+    Checks that issues are given the content of their line only when asked.
+    """
+    filenames = _sources(tmp_path, 2)
+    styles = [Style(TrailingWhitespace())]
+
+    assert [issue.content
+            for issue in CheckEngine(styles).check_all(filenames)] \
+        == [None, None]
+    parallel = ParallelCheckEngine(styles, 2, capture_content=True)
+    assert [issue.content for issue in parallel.check_all(filenames)] \
+        == ['module teapot_0 ', 'module teapot_1 ']
+
+
+def test_summarise(tmp_path: Path) -> None:
+    """
+    Checks that the issues a summary counts are those which would otherwise
+    have been reported.
+    """
+    modules = _sources(tmp_path / 'modules', 2)
+    programs = _sources(tmp_path / 'programs', 2, _program)
+    filenames = modules + programs
+    styles = [Style(LabelledDoExit(), TrailingWhitespace())]
+
+    serial = CheckEngine(styles).summarise(filenames)
+    assert serial.total == 4
+    assert serial.by_rule() == {'LabelledDoExit': 2,
+                                'TrailingWhitespace': 2}
+    assert serial.by_directory() == {tmp_path / 'modules': 2,
+                                     tmp_path / 'programs': 2}
+    assert serial.by_file() == {filename: 1 for filename in filenames}
+
+    parallel = ParallelCheckEngine(styles, 2).summarise(filenames)
+    assert parallel.by_file() == serial.by_file()
+    assert parallel.by_rule() == serial.by_rule()
+
+
+def test_parallel_streaming(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """
+    Checks that the parallel engine starts handing back issues before it
+    has been given every file, and hands back the same issues in the same
+    order as the serial engine.
+    """
+    monkeypatch.setattr(ParallelCheckEngine, '_BATCH_SIZE', 2)
+    filenames = _sources(tmp_path, 40)
+    presenter = _Presenter(filenames)
+
+    styles = [Style(TrailingWhitespace())]
+    unit_under_test = ParallelCheckEngine(styles, 2)
+    batches = unit_under_test.check_each(presenter)
+    first = next(batches)
+    assert [issue.filename for issue in first] == [filenames[0]]
+    assert len(presenter.presented) < len(filenames)
+
+    expected = [[str(issue) for issue in batch]
+                for batch in CheckEngine(styles).check_each(filenames)]
+    assert [[str(issue) for issue in first]] \
+        + [[str(issue) for issue in batch] for batch in batches] == expected
+    assert presenter.presented == filenames
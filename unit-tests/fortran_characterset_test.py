@@ -65,6 +65,15 @@ _SIMPLE_FORMAT = '''
                  end program exotic_format
                  '''
 
+_SIMPLE_MIXED = '''
+                program exotic_mixture
+                  implicit none
+                  ! Comment with a "quote
+                  write(6, '(A)') 'Don''t	panic' ! Comment	also
+                  write(6, '(A)')	"Two" //	'strings'
+                end program exotic_mixture
+                '''
+
 
 @pytest.fixture(scope='module',
                 params=[(_SIMPLE_NO_PROBLEMS, []),
@@ -73,7 +82,12 @@ _SIMPLE_FORMAT = '''
                           + "Fortran character set"]),
                         (_SIMPLE_COMMENT, []),
                         (_SIMPLE_STRINGS, []),
-                        (_SIMPLE_FORMAT, [])])
+                        (_SIMPLE_FORMAT, []),
+                        (_SIMPLE_MIXED,
+                         ["6: Found character '\\t' not in "
+                          + "Fortran character set",
+                          "6: Found character '\\t' not in "
+                          + "Fortran character set"])])
 def simple_source(request):
     """
     Parameter fixture giving a simple Fortran source with various
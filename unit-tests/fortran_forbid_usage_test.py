@@ -7,9 +7,12 @@
 """
 Test that the rule forbidding usage of certain modules does so.
 """
-from re import compile as re_compile
+from re import IGNORECASE, compile as re_compile
 from textwrap import dedent
 
+from pytest import raises
+
+from stylist import StylistException
 from stylist.fortran import ForbidUsage
 from stylist.source import FortranSource, SourceStringReader
 
@@ -154,3 +157,102 @@ class TestForbidUsage:
         assert issue_descriptions == [
             "5: Attempt to use forbidden module 'xios'"
         ]
+
+    def test_several_modules(self) -> None:
+        """
+        Checks that a number of modules may be forbidden, each with its own
+        exceptions.
+        """
+        source_text = dedent('''
+                             module teapot_mod
+                               use ceramic_mod
+                               use mpi
+                               use xios
+                             end module teapot_mod
+                             module lfric_xios_mod
+                               use mpi
+                               use xios
+                             contains
+                               subroutine stuff()
+                                 use ceramic_mod
+                               end subroutine stuff
+                             end module lfric_xios_mod
+                             ''').strip()
+        source = FortranSource(SourceStringReader(source_text))
+
+        test_unit = ForbidUsage({'ceramic_mod': ['teapot_mod'],
+                                 'mpi': [],
+                                 'xios': [r'lfric_xios.*',
+                                          re_compile('TEAPOT', IGNORECASE)]})
+        issues = test_unit.examine(source)
+
+        issue_descriptions = [str(issue) for issue in issues]
+        assert issue_descriptions == [
+            "3: Attempt to use forbidden module 'mpi'",
+            "7: Attempt to use forbidden module 'mpi'",
+            "11: Attempt to use forbidden module 'ceramic_mod'"
+        ]
+
+    def test_several_with_exceptions(self) -> None:
+        """
+        Checks that exceptions may not be given apart from their module.
+        """
+        with raises(StylistException):
+            ForbidUsage({'mpi': []}, ['mpi_mod'])
+
+    def test_case_insensitive(self) -> None:
+        """
+        Checks that module names are matched without regard to case.
+        """
+        source_text = dedent('''
+                             module some_mod
+                               use MPI, only : mpi_comm_world
+                             end module some_mod
+                             ''').strip()
+        source = FortranSource(SourceStringReader(source_text))
+
+        issues = ForbidUsage('mpi').examine(source)
+        assert [str(issue) for issue in issues] \
+            == ["2: Attempt to use forbidden module 'MPI'"]
+
+    def test_awkward_patterns(self) -> None:
+        """
+        Checks that exceptions which cannot be combined with others still
+        work, be they setting flags inline or reusing group names.
+        """
+        source_text = dedent('''
+                             module foo_mod
+                               use mpi
+                             end module foo_mod
+                             module ad_mod
+                               use mpi
+                             end module ad_mod
+                             module ab_mod
+                               use mpi
+                             end module ab_mod
+                             module cd_mod
+                               use mpi
+                             end module cd_mod
+                             ''').strip()
+        source = FortranSource(SourceStringReader(source_text))
+
+        issues = ForbidUsage('mpi', ['(?i)FOO.*', 'bar']).examine(source)
+        assert [str(issue) for issue in issues] \
+            == ["5: Attempt to use forbidden module 'mpi'",
+                "8: Attempt to use forbidden module 'mpi'",
+                "11: Attempt to use forbidden module 'mpi'"]
+
+        issues = ForbidUsage('mpi', [re_compile('(?i)FOO_mod')]) \
+            .examine(source)
+        assert len(issues) == 3
+
+        issues = ForbidUsage('mpi', ['(?P<x>a)b', '(?P<x>c)d', 'foo']) \
+            .examine(source)
+        assert [str(issue) for issue in issues] \
+            == ["5: Attempt to use forbidden module 'mpi'"]
+
+        issues = ForbidUsage('mpi', ['(a)\\1', 'a(d)']).examine(source)
+        assert [str(issue) for issue in issues] \
+            == ["2: Attempt to use forbidden module 'mpi'",
+                "8: Attempt to use forbidden module 'mpi'",
+                "11: Attempt to use forbidden module 'mpi'"]
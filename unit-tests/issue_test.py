@@ -8,6 +8,7 @@
 Ensures the Issue object functions as expected.
 """
 from pathlib import Path
+import pickle
 
 from stylist.issue import Issue
 
@@ -37,3 +38,38 @@ def test_sortability() -> None:
                'beef.txt: Without line number but with file',
                'cheese.txt: 12: With line number and file',
                'cheese.txt: 39: With everything again']
+
+
+def test_sort_key() -> None:
+    """
+    Checks that sorting by key orders issues as comparing them does, with
+    paths ordered by their parts.
+    """
+    test_list = [Issue("Second", 3, Path('/a/b')),
+                 Issue("Third", 1, Path('/a-b')),
+                 Issue("First", 3, Path('/a/b')),
+                 Issue("Zeroth")]
+    expected = sorted(test_list)
+    assert sorted(test_list, key=Issue.sort_key) == expected
+    assert [str(issue) for issue in expected] \
+        == ['Zeroth',
+            '/a/b: 3: First',
+            '/a/b: 3: Second',
+            '/a-b: 1: Third']
+
+    test_list[3].set_filename(Path('/b'))
+    assert sorted(test_list, key=Issue.sort_key)[3] is test_list[3]
+
+
+def test_compact() -> None:
+    """
+    Checks that issues carry no instance dictionary and survive being sent
+    between processes.
+    """
+    unit_under_test = Issue("Teapot cheese", 7, Path('beef.txt'))
+    assert not hasattr(unit_under_test, '__dict__')
+
+    copy = pickle.loads(pickle.dumps(unit_under_test))
+    assert str(copy) == 'beef.txt: 7: Teapot cheese'
+    assert Issue.sort_key(copy) == Issue.sort_key(unit_under_test)
+    assert copy.description is unit_under_test.description
@@ -0,0 +1,140 @@
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Ensures the 'report' module functions as expected.
+"""
+from io import StringIO
+import json
+from pathlib import Path
+from typing import List
+
+from pytest import raises
+
+from stylist import StylistException
+from stylist.issue import Issue
+from stylist.report import (JsonLinesReporter,
+                            Reporter,
+                            ReporterFactory,
+                            SarifReporter,
+                            TextReporter)
+
+
+def _batches() -> List[List[Issue]]:
+    return [[Issue('Beef', 3, Path('dir/one.f90'), 'Meat'),
+             Issue('Cheese', None, Path('dir/one.f90'), 'Dairy')],
+            [],
+            [Issue('Teapot', 1, Path('/abs/two.f90'))]]
+
+
+def _write(reporter: Reporter) -> None:
+    reporter.start()
+    for batch in _batches():
+        reporter.report(batch)
+    reporter.finish()
+
+
+class _StreamHarness(StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushes: List[str] = []
+
+    def flush(self) -> None:
+        self.flushes.append(self.getvalue())
+
+
+def test_text() -> None:
+    """
+    Checks issues are written as plain text, a batch at a time.
+    """
+    stream = _StreamHarness()
+    _write(TextReporter(stream))
+    assert stream.getvalue() == 'dir/one.f90: 3: Beef\n' \
+                                'dir/one.f90: Cheese\n' \
+                                '/abs/two.f90: 1: Teapot\n'
+    assert stream.flushes == ['dir/one.f90: 3: Beef\n'
+                              'dir/one.f90: Cheese\n',
+                              stream.getvalue()]
+
+
+def test_json_lines() -> None:
+    """
+    Checks each issue is written as a JSON object on its own line.
+    """
+    stream = StringIO()
+    _write(JsonLinesReporter(stream))
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] \
+        == [{'filename': 'dir/one.f90', 'line': 3, 'rule': 'Meat',
+             'description': 'Beef'},
+            {'filename': 'dir/one.f90', 'line': None, 'rule': 'Dairy',
+             'description': 'Cheese'},
+            {'filename': '/abs/two.f90', 'line': 1, 'rule': None,
+             'description': 'Teapot'}]
+
+
+def test_sarif() -> None:
+    """
+    Checks issues are written as a SARIF log, results being written as they
+    arrive.
+    """
+    stream = _StreamHarness()
+    _write(SarifReporter(stream))
+    log = json.loads(stream.getvalue())
+    assert log['version'] == '2.1.0'
+    assert len(log['runs']) == 1
+    assert log['runs'][0]['tool']['driver']['name'] == 'Stylist'
+    assert log['runs'][0]['results'] \
+        == [{'level': 'error',
+             'message': {'text': 'Beef'},
+             'ruleId': 'Meat',
+             'locations': [{'physicalLocation': {
+                 'artifactLocation': {'uri': 'dir/one.f90'},
+                 'region': {'startLine': 3}}}]},
+            {'level': 'error',
+             'message': {'text': 'Cheese'},
+             'ruleId': 'Dairy',
+             'locations': [{'physicalLocation': {
+                 'artifactLocation': {'uri': 'dir/one.f90'}}}]},
+            {'level': 'error',
+             'message': {'text': 'Teapot'},
+             'locations': [{'physicalLocation': {
+                 'artifactLocation': {'uri': 'file:///abs/two.f90'},
+                 'region': {'startLine': 1}}}]}]
+    assert len(stream.flushes) == 4
+    assert 'Beef' in stream.flushes[1] and 'Teapot' not in stream.flushes[1]
+
+
+def test_sarif_empty() -> None:
+    """
+    Checks a log without results is still a whole document.
+    """
+    stream = StringIO()
+    unit_under_test = SarifReporter(stream)
+    unit_under_test.start()
+    unit_under_test.finish()
+    assert json.loads(stream.getvalue())['runs'][0]['results'] == []
+
+
+def test_factory() -> None:
+    """
+    Checks reporters are found by format name and more may be added.
+    """
+    assert ReporterFactory.get_formats() == ['text', 'jsonl', 'sarif']
+    stream = StringIO()
+    assert isinstance(ReporterFactory.create('sarif', stream), SarifReporter)
+    with raises(StylistException):
+        _ = ReporterFactory.create('teapot', stream)
+
+    class _Descriptions(Reporter):
+        def format(self, issue: Issue) -> str:
+            return issue.description + '\n'
+
+    try:
+        ReporterFactory.add_format('descriptions', _Descriptions)
+        reporter = ReporterFactory.create('descriptions', stream)
+        reporter.report([Issue('Beef', 3)])
+        assert stream.getvalue() == 'Beef\n'
+    finally:
+        del ReporterFactory._reporters['descriptions']
@@ -94,6 +94,19 @@ class TestTrailingWhitespace:
                 for eln in example_source[1]]
         )
 
+    def test_line_by_line(self,
+                          example_source: Tuple[str, List[int]]) -> None:
+        """
+        Ensures lines examined one at a time give the same issues as all
+        lines examined at once.
+        """
+        unit_under_test = TrailingWhitespace()
+        reader = SourceStringReader(example_source[0])
+        issues = [unit_under_test.examine_line(number, line)
+                  for number, line in enumerate(reader.get_lines(), 1)]
+        assert [str(issue) for issue in issues if issue is not None] \
+            == [str(issue) for issue in unit_under_test.examine(reader)]
+
 
 class TestLineLength:
     """
@@ -157,3 +170,9 @@ end module test_mod
         issues = test_unit.examine(source)
         assert [str(issue) for issue in issues] \
                == case[2]
+
+        line_issues = [test_unit.examine_line(number, line)
+                       for number, line
+                       in enumerate(source.get_lines(), start=1)]
+        assert [str(issue) for issue in line_issues if issue is not None] \
+            == case[2]
@@ -8,13 +8,21 @@
 Checks source code management classes.
 """
 from pathlib import Path
+from textwrap import dedent
 from typing import List, Tuple, Type
 
 import fparser.two.Fortran2003  # type: ignore
+import fparser.two.Fortran2008  # type: ignore
+from fparser.two.symbol_table import SYMBOL_TABLES  # type: ignore
+from fparser.two.utils import walk as fp_walk  # type: ignore
 import pytest  # type: ignore
 
+import stylist.source
 from stylist.source import (CPreProcessor, CSource,
+                            FortranLexicalMask,
+                            FortranParserRegistry,
                             FortranPreProcessor, FortranSource,
+                            LineTable,
                             PFUnitProcessor,
                             SourceFactory,
                             SourceFileReader, SourceStringReader,
@@ -60,6 +68,57 @@ class TestSourceText:
             assert unit_under_test.get_text() == text
 
 
+class TestLineTable:
+    """
+    Checks the statistics gathered about lines of text.
+    """
+    _TEXT = "first\r\n  second \n\n\t \nlast"
+
+    @pytest.fixture(params=[True, False], ids=['default', 'array'])
+    def numpy_choice(self, request, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Runs tests both with whatever is available and with standard arrays.
+        """
+        if not request.param:
+            monkeypatch.setattr(stylist.source, '_numpy', None)
+
+    def test_columns(self, numpy_choice: None) -> None:
+        """
+        Checks that each column describes the lines.
+        """
+        reader = SourceStringReader(self._TEXT)
+        unit_under_test = reader.get_line_table()
+        assert reader.get_line_table() is unit_under_test
+        assert len(unit_under_test) == 5
+        assert list(unit_under_test.starts) == [0, 7, 17, 18, 21]
+        assert list(unit_under_test.lengths) == [5, 9, 0, 2, 4]
+        assert list(unit_under_test.indents) == [0, 2, 0, 2, 0]
+        assert [bool(flag) for flag in unit_under_test.trailing_whitespace] \
+            == [False, True, False, True, False]
+
+    def test_queries(self, numpy_choice: None) -> None:
+        """
+        Checks that lines are picked out by their statistics.
+        """
+        unit_under_test = LineTable(self._TEXT,
+                                    self._TEXT.splitlines())
+        assert unit_under_test.longer_than(4) == [1, 2]
+        assert unit_under_test.longer_than(6) == [2]
+        assert unit_under_test.longer_than(6, True) == [2]
+        assert unit_under_test.longer_than(4, True) == [1, 2]
+        assert unit_under_test.longer_than(5, True) == [2]
+        assert unit_under_test.ending_in_whitespace() == [2, 4]
+
+    def test_tree(self) -> None:
+        """
+        Checks that a source tree gives the table of its text.
+        """
+        reader = SourceStringReader(self._TEXT)
+        source = FortranSource(reader)
+        assert source.get_line_table() is reader.get_line_table()
+        assert source.get_lines() == self._TEXT.splitlines()
+
+
 class TestPPFortranSource:
     def test_name(self) -> None:
         assert FortranPreProcessor.get_name() == 'Fortran preprocessor'
@@ -99,6 +158,42 @@ end module test_mod
         unit_under_test = FortranPreProcessor(reader)
         assert unit_under_test.get_text() == expected
 
+    def test_processed_once(self) -> None:
+        """
+        Checks that each stage of a chain processes the text only once
+        however many times it is requested.
+        """
+        reader = SourceStringReader('@test\n#ifdef EXTRA\nmodule test\n')
+        chain = FortranPreProcessor(PFUnitProcessor(reader))
+        unit_under_test = FortranSource(chain)
+        assert unit_under_test.get_stage_tallies() \
+            == [('pFUnit preprocessor', 0), ('Fortran preprocessor', 0)]
+        for _ in range(3):
+            assert unit_under_test.get_text() \
+                == '! @test\n! #ifdef EXTRA\nmodule test\n'
+        _ = unit_under_test.get_tree()
+        assert unit_under_test.get_stage_tallies() \
+            == [('pFUnit preprocessor', 1), ('Fortran preprocessor', 1)]
+        assert reader.get_stage_tallies() == []
+
+    class _ShoutProcessor(TextProcessor):
+        @staticmethod
+        def get_name() -> str:
+            return 'Shout'
+
+        def get_text(self) -> str:
+            return self._source.get_text().upper()
+
+    def test_get_text_override(self) -> None:
+        """
+        Checks that a stage may still override get_text() rather than
+        process().
+        """
+        reader = SourceStringReader('module test\n')
+        unit_under_test = \
+            FortranPreProcessor(TestPPFortranSource._ShoutProcessor(reader))
+        assert unit_under_test.get_text() == 'MODULE TEST\n'
+
 
 class TestPPpFUnitSource:
     def test_name(self) -> None:
@@ -265,6 +360,435 @@ END PROGRAM test"""
         with pytest.raises(StopIteration):
             next(result)
 
+    def test_walk(self) -> None:
+        """
+        Checks that walking the tree visits every node in document order.
+        """
+        reader = SourceStringReader(self._MULTI_PROC_MODULE)
+        unit_under_test = FortranSource(reader)
+        expected = [node for node in fp_walk(unit_under_test.get_tree())
+                    if isinstance(node, fparser.two.Fortran2003.Base)]
+        result = list(unit_under_test.walk())
+        assert len(result) == len(expected)
+        assert all(mine is theirs for mine, theirs in zip(result, expected))
+
+        subroutine = fparser.two.Fortran2003.Subroutine_Subprogram
+        scope = next(node for node in expected
+                     if isinstance(node, subroutine))
+        assert [node.__class__.__name__
+                for node in unit_under_test.walk(scope)] \
+            == ['Subroutine_Subprogram', 'Subroutine_Stmt', 'Name',
+                'Specification_Part', 'Implicit_Part', 'Implicit_Stmt',
+                'End_Subroutine_Stmt', 'Name']
+
+    def test_node_index(self) -> None:
+        """
+        Checks that the index records the shape of the tree.
+        """
+        reader = SourceStringReader(self._MULTI_PROC_MODULE)
+        unit_under_test = FortranSource(reader)
+        index = unit_under_test.get_node_index()
+        assert index is not None
+        assert unit_under_test.get_node_index() is index
+
+        tree = unit_under_test.get_tree()
+        assert tree is not None
+        nodes = list(unit_under_test.walk())
+        assert len(index) == len(nodes)
+        assert [index.position(node) for node in nodes] \
+            == list(range(len(nodes)))
+        assert index.parent(tree) is None
+        assert index.depth(tree) == 0
+
+        module = tree.content[1]
+        assert module.__class__.__name__ == 'Module'
+        assert index.parent(module) is tree
+        assert index.depth(module) == 1
+        for node in index.subtree(module)[1:]:
+            assert index.depth(node) == index.depth(index.parent(node)) + 1
+
+    def test_find_all_scoped(self) -> None:
+        """
+        Checks that searching beneath a node stays within that node.
+        """
+        reader = SourceStringReader(self._MULTI_PROC_MODULE)
+        unit_under_test = FortranSource(reader)
+        implicit = fparser.two.Fortran2003.Implicit_Stmt
+        assert len(list(unit_under_test.find_all(implicit))) == 3
+
+        wanted = fparser.two.Fortran2003.Module_Subprogram
+        function = list(unit_under_test.find_all(wanted))[1]
+        result = list(unit_under_test.find_all(implicit, function))
+        assert len(result) == 1
+        assert result[0].parent.parent.parent is function
+
+        # Statements are not searched within.
+        assignment = fparser.two.Fortran2003.Assignment_Stmt
+        name = fparser.two.Fortran2003.Name
+        statement = next(unit_under_test.find_all(assignment))
+        assert list(unit_under_test.find_all(name, statement)) == []
+
+    def test_node_lines(self) -> None:
+        """
+        Checks that every node knows the line its statement starts on.
+        """
+        text = dedent('''
+                      program test
+                        integer :: thing
+                        thing = 1 + &
+                                2
+                      end program test
+                      ''')
+        source = FortranSource(SourceStringReader(text))
+        unit_under_test = source.get_node_index()
+        assert unit_under_test is not None
+        literal = fparser.two.Fortran2003.Int_Literal_Constant
+        assert [unit_under_test.line(node)
+                for node in source.walk()
+                if isinstance(node, literal)] == [4, 4]
+        declaration = fparser.two.Fortran2003.Type_Declaration_Stmt
+        statement = next(source.find_all(declaration))
+        assert unit_under_test.line(statement) == 3
+        assert unit_under_test.line(statement.items[2]) == 3
+
+    def test_nearest_ancestors(self) -> None:
+        """
+        Checks that nodes are paired with their closest ancestor of interest.
+        """
+        text = dedent('''
+                      program test
+                        integer :: a(3) = 1
+                        a(2) = a(3) + 4
+                        call thing(5)
+                      end program test
+                      ''')
+        source = FortranSource(SourceStringReader(text))
+        unit_under_test = source.get_node_index()
+        assert unit_under_test is not None
+        literals = (fparser.two.Fortran2003.Int_Literal_Constant,)
+        contexts = (fparser.two.Fortran2003.Part_Ref,
+                    fparser.two.Fortran2003.Assignment_Stmt,
+                    fparser.two.Fortran2003.Entity_Decl)
+        result = [(str(node), None if context is None
+                   else type(context).__name__ + ':' + str(context))
+                  for node, context
+                  in unit_under_test.nearest_ancestors(literals, contexts)]
+        assert result == [('3', 'Entity_Decl:a(3) = 1'),
+                          ('1', 'Entity_Decl:a(3) = 1'),
+                          ('2', 'Part_Ref:a(2)'),
+                          ('3', 'Part_Ref:a(3)'),
+                          ('4', 'Assignment_Stmt:a(2) = a(3) + 4'),
+                          ('5', None)]
+
+    def test_parse_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Checks that parsing is attempted only once whether or not it
+        succeeds.
+        """
+        requests: List[str] = []
+        real_get_parser = FortranParserRegistry.get_parser
+
+        def counting_get_parser(std: str = 'f2008'):
+            requests.append(std)
+            return real_get_parser(std)
+
+        monkeypatch.setattr(FortranParserRegistry, 'get_parser',
+                            counting_get_parser)
+
+        good = FortranSource(SourceStringReader(self._SIMPLE_PROGRAM))
+        assert good.get_tree() is not None
+        assert not good.is_unparsable()
+        assert good.get_tree() is not None
+        assert len(requests) == 1
+
+        bad = FortranSource(SourceStringReader('module broken\n'))
+        assert bad.get_tree() is None
+        assert bad.is_unparsable()
+        assert bad.get_tree() is None
+        assert bad.get_tree_error() is not None
+        assert len(requests) == 2
+
+    def test_match_table(self) -> None:
+        """
+        Checks that the classes matching a sought class are worked out once.
+        """
+        fortran2003 = fparser.two.Fortran2003
+        fortran2008 = fparser.two.Fortran2008
+        matches = FortranSource._matching_class_set(fortran2003.Program_Unit)
+        assert fortran2003.Program_Unit in matches
+        assert fortran2003.Main_Program in matches
+        assert fortran2003.Module in matches
+        assert fortran2003.Use_Stmt not in matches
+        assert FortranSource._matching_class_set(fortran2003.Program_Unit) \
+            is matches
+
+        # Namesakes from different standards match one another.
+        declaration = fortran2003.Type_Declaration_Stmt
+        assert fortran2008.Type_Declaration_Stmt \
+            in FortranSource._matching_class_set(declaration)
+
+    def test_mentions(self) -> None:
+        """
+        Checks that words are found in free form source even when split by
+        continuation, and in fixed form source whatever blanks they hold.
+        """
+        free = FortranSource(SourceStringReader(dedent('''
+            program test
+              call MPI_&
+                &Init()
+              call finish ()
+            end program test
+            ''').lstrip()))
+        assert free.mentions(['mpi_init'])
+        assert not free.mentions(['callfinish', 'teapot'])
+
+        fixed = FortranSource(SourceStringReader(
+            '      PROGRAM TEST\n'
+            '      CALL M PI_INIT\n'
+            '      CALL FIN\n'
+            '     &ISH ()\n'
+            '      END PROGRAM TEST\n'
+        ))
+        assert fixed.mentions(['mpi_init'])
+        assert fixed.mentions(['finish'])
+        assert fixed.mentions(['call mpi'])
+        assert not fixed.mentions(['teapot'])
+
+    def test_index_unparsable(self) -> None:
+        """
+        Checks that no index is built for source which does not parse.
+        """
+        reader = SourceStringReader('module broken\n')
+        unit_under_test = FortranSource(reader)
+        assert unit_under_test.get_node_index() is None
+        assert list(unit_under_test.walk()) == []
+
+    def test_use_statements(self) -> None:
+        """
+        Checks that use statements are found and described once.
+        """
+        text = dedent('''
+                      module first_mod
+                        use, intrinsic :: ISO_C_Binding, only : c_int
+                      contains
+                        subroutine thing()
+                          use Beef_Mod
+                        end subroutine thing
+                      end module first_mod
+                      program second
+                        use, non_intrinsic :: cheese_mod, only :
+                      end program second
+                      ''')
+        unit_under_test = FortranSource(SourceStringReader(text))
+        statements = unit_under_test.get_use_statements()
+        assert statements is not None
+        assert unit_under_test.get_use_statements() is statements
+        assert [(type(statement.unit).__name__, statement.unit_name,
+                 statement.name, statement.module, statement.nature,
+                 statement.has_only, statement.line)
+                for statement in statements] \
+            == [('Module', 'first_mod', 'ISO_C_Binding', 'iso_c_binding',
+                 'intrinsic', True, 3),
+                ('Module', 'first_mod', 'Beef_Mod', 'beef_mod',
+                 None, False, 6),
+                ('Main_Program', 'second', 'cheese_mod', 'cheese_mod',
+                 'non_intrinsic', False, 10)]
+
+        reader = SourceStringReader('module broken\n')
+        assert FortranSource(reader).get_use_statements() is None
+
+
+class TestFortranLexicalMask:
+    """
+    Checks the classification of Fortran text.
+    """
+    def test_spans(self) -> None:
+        """
+        Checks that text is split into code, comments and strings.
+        """
+        text = "x = 'a!b' // \"c'd\" ! note 'e'\ny = 'f\ng'\n"
+        unit_under_test = FortranLexicalMask(text)
+        code = FortranLexicalMask.CODE
+        comment = FortranLexicalMask.COMMENT
+        string = FortranLexicalMask.STRING
+        assert [(text[start:end], kind)
+                for start, end, kind in unit_under_test.spans()] \
+            == [('x = ', code), ("'a!b'", string), (' // ', code),
+                ('"c\'d"', string), (' ', code), ("! note 'e'", comment),
+                ('\ny = ', code), ("'f\ng'", string), ('\n', code)]
+        assert [text[start:end] for start, end, _
+                in unit_under_test.spans(comment)] == ["! note 'e'"]
+
+        assert unit_under_test.kind_at(0) == code
+        assert unit_under_test.kind_at(text.index('!')) == string
+        assert unit_under_test.kind_at(text.index('note')) == comment
+        assert unit_under_test.kind_at(len(text) - 1) == code
+        with pytest.raises(IndexError):
+            unit_under_test.kind_at(len(text))
+
+    def test_unterminated(self) -> None:
+        """
+        Checks that a string without an end runs to the end of the text.
+        """
+        unit_under_test = FortranLexicalMask("a = 'oops\n")
+        assert list(unit_under_test.spans()) \
+            == [(0, 4, FortranLexicalMask.CODE),
+                (4, 10, FortranLexicalMask.STRING)]
+
+    def test_shared(self) -> None:
+        """
+        Checks that a source file works out its mask only once.
+        """
+        source = FortranSource(SourceStringReader('x = 1 ! one\n'))
+        mask = source.get_lexical_mask()
+        assert source.get_lexical_mask() is mask
+        assert mask.kind_at(6) == FortranLexicalMask.COMMENT
+
+
+class TestFortranSymbolTable:
+    """
+    Checks the gathering of declarations by scope.
+    """
+    _TEXT = dedent('''
+        module stuff_mod
+          integer(i_def), parameter, public :: count = 3
+          type :: thing_type
+            real*8, pointer :: value => null()
+            procedure(thing_iface), pointer, nopass :: action
+          end type thing_type
+        contains
+          subroutine work(Name, label, callback)
+            type(thing_type), intent(inout) :: name
+            character(len=*), intent(in) :: label
+            procedure(thing_iface) :: callback
+            character(*, kind=c_char) :: buffer, other = 'x'
+            block
+              logical :: flag
+            end block
+          end subroutine work
+        end module stuff_mod
+        ''')
+
+    def test_scopes(self) -> None:
+        """
+        Checks that scopes nest and know their arguments.
+        """
+        source = FortranSource(SourceStringReader(self._TEXT))
+        unit_under_test = source.get_symbol_table()
+        assert unit_under_test is not None
+        assert source.get_symbol_table() is unit_under_test
+
+        scopes = unit_under_test.scopes()
+        assert [type(scope.node).__name__ for scope in scopes] \
+            == ['Module', 'Derived_Type_Def', 'Subroutine_Subprogram',
+                'Block_Construct']
+        module, derived, subroutine, block = scopes
+        assert module.parent is not None and module.parent.parent is None
+        assert derived.parent is module
+        assert subroutine.parent is module
+        assert block.parent is subroutine
+        assert [scope.node for scope in block.ancestry()] \
+            == [block.node, subroutine.node, module.node,
+                module.parent.node]
+        assert unit_under_test.get_scope(subroutine.node) is subroutine
+
+        assert subroutine.name == 'work'
+        assert subroutine.dummy_args == ['Name', 'label', 'callback']
+        assert module.dummy_args == []
+        assert list(block.entities) == ['flag']
+
+    def test_declarations(self) -> None:
+        """
+        Checks the description of each declaration and its entities.
+        """
+        source = FortranSource(SourceStringReader(self._TEXT))
+        unit_under_test = source.get_symbol_table()
+        assert unit_under_test is not None
+        assert [(declaration.line, declaration.type, declaration.kind,
+                 declaration.length, declaration.intent,
+                 sorted(declaration.attributes),
+                 declaration.is_component, declaration.is_procedure,
+                 [(entity.name, entity.initialised)
+                  for entity in declaration.entities])
+                for declaration in unit_under_test.declarations()] \
+            == [(3, 'integer', 'i_def', None, None, ['PARAMETER', 'PUBLIC'],
+                 False, False, [('count', True)]),
+                (5, 'real', '8', None, None, ['POINTER'],
+                 True, False, [('value', True)]),
+                (6, None, None, None, None, ['NOPASS', 'POINTER'],
+                 True, True, [('action', False)]),
+                (10, 'type', None, None, 'INOUT', ['INTENT'],
+                 False, False, [('name', False)]),
+                (11, 'character', None, '*', 'IN', ['INTENT'],
+                 False, False, [('label', False)]),
+                (12, None, None, None, None, [],
+                 False, True, [('callback', False)]),
+                (13, 'character', 'c_char', '*', None, [],
+                 False, False, [('buffer', False), ('other', True)]),
+                (15, 'logical', None, None, None, [],
+                 False, False, [('flag', False)])]
+
+        subroutine = unit_under_test.scopes()[2]
+        entity = subroutine.lookup('NAME')
+        assert entity is not None
+        assert entity.intent == 'INOUT'
+        assert entity.line == 10
+        assert entity.declaration.scope is subroutine
+        assert subroutine.lookup('flag') is None
+
+    def test_unparsable(self) -> None:
+        """
+        Checks that source which doesn't parse has no symbol table.
+        """
+        source = FortranSource(SourceStringReader('module\n'))
+        assert source.get_symbol_table() is None
+
+
+class TestFortranParserRegistry:
+    """
+    Checks that parsers are shared between source files.
+    """
+    def test_parser_reuse(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Checks that a parser is only created when the standard changes.
+        """
+        created: List[str] = []
+
+        class FactoryHarness(stylist.source.ParserFactory):
+            def create(self, std=None):
+                created.append(std)
+                return super().create(std)
+
+        monkeypatch.setattr(stylist.source, 'ParserFactory', FactoryHarness)
+        monkeypatch.setattr(FortranParserRegistry, '_parsers', {})
+        monkeypatch.setattr(FortranParserRegistry, '_current_standard', None)
+
+        first = FortranParserRegistry.get_parser('f2008')
+        assert FortranParserRegistry.get_parser('f2008') is first
+        for text in ('module one\nend module one\n',
+                     'module two\nend module two\n'):
+            assert FortranSource(SourceStringReader(text)).get_tree() \
+                is not None
+        assert created == ['f2008']
+
+        _ = FortranParserRegistry.get_parser('f2003')
+        _ = FortranParserRegistry.get_parser('f2008')
+        assert created == ['f2008', 'f2003', 'f2008']
+
+    def test_scope_isolation(self) -> None:
+        """
+        Checks that scopes seen in one file are forgotten before the next.
+        """
+        for name in ('first', 'second'):
+            text = f'module {name}\ncontains\nsubroutine thing()\n' \
+                   f'end subroutine thing\nend module {name}\n'
+            source = FortranSource(SourceStringReader(text))
+            assert source.get_tree() is not None
+            assert source.get_tree_error() is None
+        assert SYMBOL_TABLES.lookup('second') is not None
+        with pytest.raises(KeyError):
+            _ = SYMBOL_TABLES.lookup('first')
+
 
 class TestCSource:
     """
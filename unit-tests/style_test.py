@@ -8,8 +8,22 @@
 Ensures the 'style' module functions as expected.
 """
 
+import inspect
+import logging
+from textwrap import dedent
+from typing import Any, Dict, Generator, List, Type
+
+from fparser.two.Fortran2003 import Base  # type: ignore
+
 import pytest  # type: ignore
 
+from stylist.fortran import (KindPattern,
+                             LabelledDoExit,
+                             MissingImplicit,
+                             MissingPointerInit,
+                             NakedLiteral)
+import stylist.fortran
+import stylist.issue
 import stylist.rule
 from stylist.source import FortranSource, SourceStringReader
 import stylist.style
@@ -105,3 +119,204 @@ class TestStyle:
         unit_under_test.check(source)
         assert rule_one.examined == ['module foo\nend module foo\n']
         assert rule_two.examined == ['module foo\nend module foo\n']
+
+    class _WalkCounter(FortranSource):
+        def __init__(self, text: str) -> None:
+            super().__init__(SourceStringReader(text))
+            self.walks = 0
+
+        def walk(self, root=None) -> Generator[Base, None, None]:
+            self.walks += 1
+            return super().walk(root)
+
+    def test_shared_index(self) -> None:
+        """
+        Checks that rules gathered in a style find the nodes they want in
+        the node index rather than walking the parse tree, and find what they
+        would have found alone.
+        """
+        text = dedent('''
+                      program test
+                        implicit none
+                        integer :: thing = 1
+                        real :: other
+                        do
+                          other = 2.0
+                          if (other > 1.0) exit
+                        end do
+                      end program test
+                      ''')
+        rules = [NakedLiteral(),
+                 MissingImplicit(),
+                 LabelledDoExit(),
+                 KindPattern(integer=r'i_.*'),
+                 NakedLiteral(integers=False)]
+
+        expected: List[str] = []
+        for rule in rules:
+            alone = TestStyle._WalkCounter(text)
+            expected.extend(str(issue) for issue in rule.examine(alone))
+        assert len(expected) == 7
+
+        source = TestStyle._WalkCounter(text)
+        unit_under_test = TestStyle._StyleHarness(*rules)
+        issues = unit_under_test.check(source)
+        assert [str(issue) for issue in issues] == expected
+        assert source.walks == 0
+
+    def test_unparsable(self) -> None:
+        """
+        Checks that source which does not parse is reported once and that
+        only rules which do not need the parse tree are applied.
+        """
+        text = 'module broken \n'
+        rules = [MissingImplicit(),
+                 stylist.rule.TrailingWhitespace(),
+                 NakedLiteral()]
+        source = FortranSource(SourceStringReader(text))
+        unit_under_test = TestStyle._StyleHarness(*rules)
+        issues = unit_under_test.check(source)
+        assert len(issues) == 2
+        assert str(issues[0]).startswith(
+            "Unable to perform MissingImplicit, NakedLiteral "
+            "as source didn't parse: "
+        )
+        assert str(issues[1]) == "1: Found trailing white space"
+        assert [issue.rule for issue in issues] \
+            == [stylist.style.Style.UNPARSABLE_RULE, 'TrailingWhitespace']
+
+    def test_prefilter(self) -> None:
+        """
+        Checks that rules are passed over when their words are not present
+        and that the source is then not parsed.
+        """
+        text = dedent('''
+                      program test
+                        implicit none
+                        integer :: thing
+                        d&
+                        &o
+                          e&
+                          &xit
+                        end do
+                      end program test
+                      ''')
+        source = FortranSource(SourceStringReader(text))
+        unit_under_test = TestStyle._StyleHarness(MissingPointerInit())
+        assert unit_under_test.check(source) == []
+        assert not source.is_parse_attempted()
+
+        unit_under_test = TestStyle._StyleHarness(MissingPointerInit(),
+                                                  LabelledDoExit())
+        issues = unit_under_test.check(source)
+        assert source.is_parse_attempted()
+        assert [issue.line for issue in issues] == [7]
+
+        # Blanks within words are insignificant in fixed form source so the
+        # rule is not passed over.
+        #
+        fixed = FortranSource(SourceStringReader(
+            '      PROGRAM TEST\n'
+            '      DO\n'
+            '        EX IT\n'
+            '      END DO\n'
+            '      END PROGRAM TEST\n'
+        ))
+        unit_under_test = TestStyle._StyleHarness(LabelledDoExit())
+        _ = unit_under_test.check(fixed)
+        assert fixed.is_parse_attempted()
+
+    class _LineLengthHarness(stylist.rule.LimitLineLength):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.examined = 0
+
+        def examine(self, subject) -> List[stylist.issue.Issue]:
+            self.examined += 1
+            return super().examine(subject)
+
+    def test_shared_line_pass(self) -> None:
+        """
+        Checks that line rules share a single pass over the lines and find
+        what they would have found alone.
+        """
+        text = "program test  \n" \
+               "  implicit none\n" \
+               "  write(6, '(A)') 'A rather long line of text'\n" \
+               "end program test\n"
+        rules = [TestStyle._LineLengthHarness(20),
+                 stylist.rule.TrailingWhitespace(),
+                 MissingImplicit(),
+                 TestStyle._LineLengthHarness(40,
+                                              ignore_leading_whitespace=True)]
+
+        expected: List[str] = []
+        for rule in rules:
+            source = FortranSource(SourceStringReader(text))
+            expected.extend(str(issue) for issue in rule.examine(source))
+        assert len(expected) == 3
+
+        source = FortranSource(SourceStringReader(text))
+        unit_under_test = TestStyle._StyleHarness(*rules)
+        issues = unit_under_test.check(source)
+        assert [str(issue) for issue in issues] == expected
+        assert [rule.examined for rule in rules
+                if isinstance(rule, TestStyle._LineLengthHarness)] == [1, 1]
+
+    @pytest.fixture(params=[dedent('''
+                                   module test_mod
+                                     use iso_c_binding
+                                     implicit none
+                                     procedure(thing), pointer :: action
+                                   contains
+                                     subroutine thing(arg, callback)
+                                       character(*), intent(out) :: arg
+                                       procedure(thing), pointer :: callback
+                                       integer :: count = 3
+                                       arg = 'a'
+                                     end subroutine thing
+                                   end module test_mod
+                                   '''),
+                            'module broken \n'])
+    def quiet_text(self, request) -> str:
+        """
+        Parameter fixture giving source which does and does not parse.
+        """
+        return request.param
+
+    # Arguments for those rules which need them.
+    _RULE_CONSTRUCTION: Dict[Type[stylist.rule.Rule], Dict[str, Any]] = {
+        stylist.fortran.ForbidUsage: {'name': 'iso_c_binding'},
+        stylist.fortran.KindPattern: {'integer': 'i_.*', 'real': 'r_.*'}
+    }
+
+    def test_quiet(self,
+                   quiet_text: str,
+                   capsys: pytest.CaptureFixture,
+                   caplog: pytest.LogCaptureFixture) -> None:
+        """
+        Checks that rules report only through issues and logging, never by
+        writing to standard out or error.
+        """
+        caplog.set_level(logging.DEBUG, logger='stylist')
+        rules: List[stylist.rule.Rule] = []
+        for module in (stylist.fortran, stylist.rule):
+            for _, cls in inspect.getmembers(module, inspect.isclass):
+                if issubclass(cls, stylist.rule.Rule) \
+                        and not inspect.isabstract(cls) \
+                        and cls.__module__ == module.__name__:
+                    kwargs = TestStyle._RULE_CONSTRUCTION.get(cls, {})
+                    rules.append(cls(**kwargs))
+        source = FortranSource(SourceStringReader(quiet_text))
+        unit_under_test = TestStyle._StyleHarness(*rules)
+        assert unit_under_test.check(source) != []
+        assert caplog.records != []
+        assert capsys.readouterr() == ('', '')
+
+    def test_silent_library(self) -> None:
+        """
+        Checks that, used as a library, diagnostics are discarded unless the
+        application asks for them.
+        """
+        assert any(isinstance(handler, logging.NullHandler)
+                   for handler in logging.getLogger('stylist').handlers)
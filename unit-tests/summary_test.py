@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+##############################################################################
+# (c) Crown copyright 2024 Met Office. All rights reserved.
+# The file LICENCE, distributed with this code, contains details of the terms
+# under which the code may be used.
+##############################################################################
+"""
+Ensures the 'summary' module functions as expected.
+"""
+from io import StringIO
+from pathlib import Path
+
+from stylist.issue import Issue
+from stylist.summary import IssueSummary
+
+
+class TestIssueSummary:
+    """
+    Checks the counting of issues.
+    """
+    def test_count(self) -> None:
+        """
+        Checks that issues are counted by the rule which found them.
+        """
+        issues = [Issue('Beef', rule='Cheese'),
+                  Issue('Beef', line=2, rule='Cheese'),
+                  Issue('Teapot', rule='Kettle'),
+                  Issue('Mystery')]
+        assert IssueSummary.count(issues) \
+            == {'Cheese': 2, 'Kettle': 1, IssueSummary.UNKNOWN_RULE: 1}
+
+    def test_totals(self) -> None:
+        """
+        Checks that counts are totalled by rule, file and directory.
+        """
+        unit_under_test = IssueSummary()
+        unit_under_test.add(Path('lib/one.f90'), {'Cheese': 2, 'Kettle': 1})
+        unit_under_test.add(Path('lib/two.f90'), {'Cheese': 1})
+        unit_under_test.add(Path('main.f90'), {'Kettle': 4})
+        unit_under_test.add(Path('lib/one.f90'), {'Kettle': 1})
+        unit_under_test.add(Path('clean.f90'), {})
+
+        assert unit_under_test.total == 9
+        assert unit_under_test.by_rule() == {'Cheese': 3, 'Kettle': 6}
+        assert unit_under_test.by_file() == {Path('lib/one.f90'): 4,
+                                             Path('lib/two.f90'): 1,
+                                             Path('main.f90'): 4}
+        assert unit_under_test.by_directory() == {Path('lib'): 5,
+                                                  Path('.'): 4}
+
+        stream = StringIO()
+        unit_under_test.write(stream)
+        assert stream.getvalue().splitlines() \
+            == ['Issues by rule:',
+                '  Cheese: 3',
+                '  Kettle: 6',
+                'Issues by directory:',
+                '  .: 4',
+                '  lib: 5',
+                'Issues by file:',
+                '  lib/one.f90: 4',
+                '  lib/two.f90: 1',
+                '  main.f90: 4']
+
+    def test_empty(self) -> None:
+        """
+        Checks that a summary of nothing has nothing in it.
+        """
+        unit_under_test = IssueSummary()
+        assert unit_under_test.total == 0
+        stream = StringIO()
+        unit_under_test.write(stream)
+        assert stream.getvalue() \
+            == 'Issues by rule:\nIssues by directory:\nIssues by file:\n'